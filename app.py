@@ -5,12 +5,130 @@ Flask frontend for the CourtListener API citation checker
 """
 
 import os
-from flask import Flask, render_template, request, jsonify
-from citecheck import CitationChecker
+import hashlib
+import logging
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from flask import Flask, Response, render_template, request, jsonify
+from citecheck import CitationChecker, create_session
+from citecheck_cache import LocalAnswerStats, ResultCache, SingleFlight, SQLiteResultCache, TieredCache, cache_ttl
+from citecheck_index import CitationFilter, OfflineIndex
+from citecheck_metrics import CheckerMetrics
+from citecheck_transport import RateLimiter
 import requests
 
 app = Flask(__name__)
 
+# Leveled logs, quiet by default; CITECHECK_LOG_LEVEL=DEBUG shows upstream queries and results
+logging.basicConfig(level=os.environ.get('CITECHECK_LOG_LEVEL', 'WARNING').upper())
+
+# One pooled, keep-alive session shared by every request this worker handles
+http_session = create_session(pool_size=int(os.environ.get('CITECHECK_POOL_SIZE', 10)))
+
+# Check results are shared by every user's checker in this worker, and - when
+# CITECHECK_CACHE_DB is set - with every other worker and CLI run via SQLite
+result_cache = ResultCache(
+    max_size=int(os.environ.get('CITECHECK_CACHE_SIZE', 4096)),
+    ttl=cache_ttl()
+)
+# Citations CourtListener reports as not found are remembered for a shorter time
+negative_cache = ResultCache(
+    max_size=int(os.environ.get('CITECHECK_NEGATIVE_CACHE_SIZE', 4096)),
+    ttl=cache_ttl(negative=True)
+)
+if os.environ.get('CITECHECK_CACHE_DB'):
+    result_cache = TieredCache(result_cache, SQLiteResultCache(
+        os.environ['CITECHECK_CACHE_DB'],
+        ttl=cache_ttl()
+    ))
+    negative_cache = TieredCache(negative_cache, SQLiteResultCache(
+        os.environ['CITECHECK_CACHE_DB'],
+        ttl=cache_ttl(negative=True),
+        namespace='negative'
+    ))
+
+# A local exact-citation index (`citecheck index build`) answers known citations without HTTP
+offline_index = OfflineIndex(os.environ['CITECHECK_INDEX']) if os.environ.get('CITECHECK_INDEX') else None
+# ...and a citation filter (`citecheck index filter`) rules out fabricated citations without HTTP
+citation_filter = CitationFilter(os.environ['CITECHECK_FILTER']) if os.environ.get('CITECHECK_FILTER') else None
+# Checks answered locally (impossible citations, filter, index) and the upstream calls they saved
+local_stats = LocalAnswerStats()
+# Upstream latency and outcome metrics for every checker in this worker, served at /metrics
+metrics = CheckerMetrics()
+
+class CheckerRegistry:
+    """
+    Bounded, thread-safe map of API key -> long-lived CitationChecker.
+    
+    Keys are stored only as an HMAC-SHA256 digest under a per-process secret, so
+    the registry never holds a user's API key in clear. Entries are evicted in
+    least-recently-used order once max_size is reached, and dropped after
+    idle_seconds without use.
+    """
+    
+    def __init__(self, factory, max_size=256, idle_seconds=900):
+        self.factory = factory
+        self.max_size = max_size
+        self.idle_seconds = idle_seconds
+        self._secret = secrets.token_bytes(32)
+        self._checkers = OrderedDict()  # digest -> (checker, last_used)
+        self._lock = threading.Lock()
+    
+    def _digest(self, api_key):
+        return hmac.new(self._secret, api_key.encode('utf-8'), hashlib.sha256).hexdigest()
+    
+    def get(self, api_key):
+        """Return the cached checker for api_key, creating it on first use"""
+        digest = self._digest(api_key)
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._checkers.pop(digest, None)
+            checker = entry[0] if entry else self.factory(api_key)
+            self._checkers[digest] = (checker, now)
+            while len(self._checkers) > self.max_size:
+                _, (evicted, _) = self._checkers.popitem(last=False)
+                evicted.close()
+            return checker
+    
+    def _evict_idle(self, now):
+        # Entries are kept in recency order, so idle ones are always at the front
+        while self._checkers:
+            digest, (checker, last_used) = next(iter(self._checkers.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            del self._checkers[digest]
+            checker.close()
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._checkers)
+
+# Concurrent checks of the same citation (from any user) share one upstream lookup
+single_flight = SingleFlight()
+
+# Every upstream call waits its turn in its API key's token bucket
+rate_limiter = RateLimiter(
+    rate=float(os.environ.get('CITECHECK_RATE_PER_HOUR', 5000)) / 3600,
+    capacity=float(os.environ.get('CITECHECK_RATE_BURST', 60))
+)
+
+MAX_BATCH_SIZE = int(os.environ.get('CITECHECK_MAX_BATCH_SIZE', 1000))
+MAX_DOCUMENT_CHARS = int(os.environ.get('CITECHECK_MAX_DOCUMENT_CHARS', 500000))
+
+checkers = CheckerRegistry(
+    lambda api_key: CitationChecker(api_key, session=http_session, cache=result_cache,
+                                    negative_cache=negative_cache, single_flight=single_flight,
+                                    rate_limiter=rate_limiter, offline_index=offline_index,
+                                    citation_filter=citation_filter, local_stats=local_stats,
+                                    metrics=metrics),
+    max_size=int(os.environ.get('CITECHECK_MAX_CHECKERS', 256)),
+    idle_seconds=float(os.environ.get('CITECHECK_CHECKER_IDLE_SECONDS', 900))
+)
+
 @app.route('/')
 def index():
     """Main page with citation input form"""
@@ -45,16 +163,19 @@ def check_citation():
         # Get publication filter preference (default: published only)
         include_unpublished = data.get('includeUnpublished', False)
         
-        # Initialize the checker with user's API key
-        checker = CitationChecker(api_key)
+        # Optional total time budget in seconds; slower strategies are skipped once it runs out
+        deadline = data.get('deadline')
+        if deadline is not None and (isinstance(deadline, bool) or not isinstance(deadline, (int, float))
+                                     or deadline <= 0):
+            return jsonify({'error': 'deadline must be a positive number of seconds'}), 400
+        
+        # Reuse this user's long-lived checker (warm connections and state)
+        checker = checkers.get(api_key)
         
         # Check the citation with publication filter
-        result = checker.check_citation(citation, include_unpublished=include_unpublished)
+        result = checker.check_citation(citation, include_unpublished=include_unpublished, deadline=deadline)
         
-        # Debug logging
-        print(f"DEBUG: include_unpublished={include_unpublished}, result has {len(result.get('cases', []))} cases")
-        for i, case in enumerate(result.get('cases', [])[:3]):
-            print(f"  Case {i+1}: {case.get('name', 'Unknown')} - publication_status: {case.get('publication_status', 'unknown')}, is_published: {case.get('is_published', 'unknown')}")
+        app.logger.debug('include_unpublished=%s, result has %d cases', include_unpublished, len(result.get('cases', [])))
         
         return jsonify(result)
         
@@ -64,6 +185,75 @@ def check_citation():
         app.logger.error(f"Error checking citation: {str(e)}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/check-batch', methods=['POST'])
+def check_citation_batch():
+    """Check many citations at once, packing them into as few upstream calls as possible"""
+    try:
+        api_key = request.headers.get('X-API-Key')
+        if not api_key:
+            return jsonify({'error': 'API key is required in X-API-Key header'}), 401
+        
+        data = request.get_json()
+        if not data or not isinstance(data.get('citations'), list):
+            return jsonify({'error': 'A list of citations is required'}), 400
+        
+        citations = [c for c in data['citations'] if isinstance(c, str) and c.strip()]
+        if not citations:
+            return jsonify({'error': 'Citation list cannot be empty'}), 400
+        if len(citations) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_BATCH_SIZE} citations can be checked per request'}), 400
+        
+        include_unpublished = data.get('includeUnpublished', False)
+        
+        checker = checkers.get(api_key)
+        results = checker.check_many(citations, include_unpublished=include_unpublished)
+        
+        return jsonify({
+            'results': [dict(result, input=citation) for citation, result in zip(citations, results)],
+            'total': len(results)
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 500
+    except Exception as e:
+        app.logger.error(f"Error checking citation batch: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/check-document', methods=['POST'])
+def check_document():
+    """Extract every citation and case name from pasted text and verify each once"""
+    try:
+        api_key = request.headers.get('X-API-Key')
+        if not api_key:
+            return jsonify({'error': 'API key is required in X-API-Key header'}), 401
+        
+        data = request.get_json()
+        if not data or not isinstance(data.get('text'), str) or not data['text'].strip():
+            return jsonify({'error': 'Document text is required'}), 400
+        if len(data['text']) > MAX_DOCUMENT_CHARS:
+            return jsonify({'error': f'Documents are limited to {MAX_DOCUMENT_CHARS} characters'}), 400
+        
+        include_unpublished = data.get('includeUnpublished', False)
+        
+        checker = checkers.get(api_key)
+        return jsonify(checker.check_document(data['text'], include_unpublished=include_unpublished))
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 500
+    except Exception as e:
+        app.logger.error(f"Error checking document: {str(e)}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus scrape target: per-strategy upstream latency, outcomes, fallbacks and cache hits"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/stats')
+def api_stats():
+    """How many checks this worker answered without CourtListener or coalesced, and the calls saved"""
+    return jsonify({'local_answers': local_stats.stats(), 'single_flight': single_flight.stats()})
+
 @app.route('/api/status')
 def api_status():
     """Check if the CourtListener API is accessible with user's API key"""
@@ -79,18 +269,27 @@ def api_status():
         
         # Test API connection with user's key
         headers = {'Authorization': f'Token {api_key}'}
-        response = requests.get(
+        response = http_session.get(
             'https://www.courtlistener.com/api/rest/v4/search/',
             headers=headers,
             params={'q': 'test', 'format': 'json'},
             timeout=10
         )
+        rate_limiter.bucket(api_key).observe(response.status_code, response.headers)
         
         if response.status_code == 200:
             return jsonify({
                 'status': 'connected', 
                 'message': 'API connection successful',
-                'api_version': 'v4'
+                'api_version': 'v4',
+                'rate_limit': rate_limiter.budget(api_key)
+            })
+        elif response.status_code == 429:
+            return jsonify({
+                'status': 'error', 
+                'message': 'API rate limit reached - requests are being queued',
+                'api_version': 'v4',
+                'rate_limit': rate_limiter.budget(api_key)
             })
         elif response.status_code == 401:
             return jsonify({
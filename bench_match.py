@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark: matching a document's worth of case names against a large candidate set
+the old way (one SequenceMatcher loop per input) vs. the batched matcher (n-gram
+similarity matrix shortlist, then exact scoring of each input's shortlist).
+"""
+
+import random
+import re
+import time
+from difflib import SequenceMatcher
+
+import click
+
+from citecheck import CitationChecker
+from citecheck_match import Matcher, np
+
+SURNAMES = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Miller', 'Davis', 'Garcia', 'Wilson',
+            'Anderson', 'Taylor', 'Thomas', 'Moore', 'Martin', 'Jackson', 'Thompson', 'White', 'Harris']
+ENTITIES = ['United States', 'State of California', 'City of New York', 'Board of Education',
+            'Acme Corp.', 'Department of Labor', 'Commonwealth', 'County of Los Angeles']
+
+
+def synthetic_names(count, seed=0):
+    rng = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        plaintiff = rng.choice(SURNAMES + ENTITIES)
+        defendant = f"{rng.choice(SURNAMES)}{rng.choice(['', 'son', 'er', 'berg'])}" if rng.random() < 0.6 \
+            else rng.choice(ENTITIES)
+        names.add(f"{plaintiff} v. {defendant}")
+    return sorted(names)
+
+
+def misspell(name, rng):
+    chars = list(name)
+    i = rng.randrange(len(chars))
+    chars[i] = rng.choice('aeiou') if rng.random() < 0.5 else ''
+    return ''.join(chars)
+
+
+def legacy_similarity(input_text, case_name):
+    """Previous _calculate_similarity"""
+    input_norm = re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', input_text.lower().strip()))
+    case_norm = re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', '', case_name.lower().strip()))
+    if input_norm == case_norm:
+        return 1.0
+    if input_norm in case_norm:
+        return 0.85 + (0.15 * SequenceMatcher(None, input_norm, case_norm).ratio())
+    return SequenceMatcher(None, input_norm, case_norm).ratio()
+
+
+def legacy_best_match(input_text, cases):
+    """Previous _find_best_match"""
+    best_match, best_similarity = None, 0.0
+    for case in cases:
+        similarity = legacy_similarity(input_text, case['name'])
+        if similarity > best_similarity:
+            best_similarity, best_match = similarity, case
+    return best_match, best_similarity
+
+
+@click.command()
+@click.option('--inputs', default=300, help='Case names in the document')
+@click.option('--candidates', default=2000, help='Candidate case names to match against')
+def main(inputs, candidates):
+    rng = random.Random(1)
+    cases = [{'name': name} for name in synthetic_names(candidates)]
+    queries = [misspell(rng.choice(cases)['name'], rng) for _ in range(inputs)]
+    checker = CitationChecker('bench-key')
+    pairs = inputs * candidates
+
+    start = time.perf_counter()
+    legacy = [legacy_best_match(query, cases) for query in queries]
+    legacy_time = time.perf_counter() - start
+    print(f"{'legacy loop':>24}: {legacy_time:6.2f} s, {pairs / legacy_time / 1000:7.0f}k pairs/s")
+
+    for label, matcher in [(f"batched ({checker.matcher.name})", checker.matcher),
+                           ('batched (python)', Matcher())]:
+        checker.matcher = matcher
+        start = time.perf_counter()
+        batched = checker._find_best_matches(queries, cases)
+        batched_time = time.perf_counter() - start
+        agree = sum((old >= 0.8) == (new >= 0.8) for (_, old), (_, new) in zip(legacy, batched))
+        print(f"{label:>24}: {batched_time:6.2f} s, {pairs / batched_time / 1000:7.0f}k pairs/s "
+              f"({legacy_time / batched_time:.0f}x, valid/uncertain agrees on {agree}/{inputs})")
+    print(f"shortlist matrix: {'numpy' if np is not None else 'pure Python'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: offline index size, memory footprint and query latency for exact
+citations, exact case names and misspelled case names on a synthetic bulk export.
+"""
+
+import csv
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import click
+
+from citecheck import CitationChecker
+from citecheck_index import OfflineIndex, build_index, np
+
+SYLLABLES = [onset + vowel + coda for onset in ['', 'b', 'ch', 'd', 'f', 'g', 'h', 'k', 'l', 'm', 'n', 'p', 'r',
+                                                's', 'st', 't', 'v', 'w', 'z']
+             for vowel in 'aeiou' for coda in ['', 'n', 'r', 'ss']]
+PARTIES = ['United States', 'State', 'People', 'Commonwealth', 'City of {}', '{} Corp.', '{} County']
+REPORTERS = ['U.S.', 'F.3d', 'F.2d', 'P.2d', 'N.E.2d', 'So. 2d', 'A.2d', 'Cal. 4th']
+
+
+def _word(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+
+
+def write_exports(directory, count, seed=0):
+    rng = random.Random(seed)
+    clusters = []
+    with open(os.path.join(directory, 'citations.csv'), 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['id', 'volume', 'reporter', 'page', 'cluster_id'])
+        for cluster_id in range(count):
+            plaintiff = rng.choice(PARTIES).format(_word(rng)) if rng.random() < 0.3 else _word(rng)
+            clusters.append((cluster_id, f"{plaintiff} v. {_word(rng)}", '2000-01-01', 'Published',
+                             rng.randint(0, 500), 'case', cluster_id))
+            writer.writerow([cluster_id, rng.randint(1, 999), rng.choice(REPORTERS), rng.randint(1, 1999), cluster_id])
+    with open(os.path.join(directory, 'clusters.csv'), 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['id', 'case_name', 'date_filed', 'precedential_status', 'citation_count', 'slug',
+                         'docket_id'])
+        writer.writerows(clusters)
+    return [name for _, name, *_ in clusters]
+
+
+def _resident_kib():
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        return None
+
+
+def _latencies(fn, queries):
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times) * 1e6, times[int(len(times) * 0.99)] * 1e6
+
+
+def _misspell(name, rng):
+    i = rng.randrange(len(name))
+    return name[:i] + rng.choice('aeiou') + name[i + 1:]
+
+
+@click.command()
+@click.option('--cases', default=200000, help='Synthetic cases in the bulk export')
+@click.option('--queries', default=2000, help='Queries per kind')
+def main(cases, queries):
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        names = write_exports(directory, cases)
+        path = os.path.join(directory, 'cl.idx')
+        start = time.perf_counter()
+        stats = build_index(os.path.join(directory, 'citations.csv'), os.path.join(directory, 'clusters.csv'), path)
+        print(f"built {stats['citations']} citations / {stats['names']} names / {stats['trigrams']} trigrams "
+              f"in {time.perf_counter() - start:.1f} s: {stats['bytes'] / 2 ** 20:.1f} MiB on disk")
+
+        with open(os.path.join(directory, 'citations.csv')) as handle:
+            citations = [f"{row['volume']} {row['reporter']} {row['page']}" for row in csv.DictReader(handle)]
+
+        resident = _resident_kib()
+        tracemalloc.start()
+        index = OfflineIndex(path)
+        heap = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"python heap to open the index: {heap / 1024:.1f} KiB (the file itself is mapped, not loaded)")
+        checker = CitationChecker('bench-key', offline_index=index)
+
+        sample = rng.sample(range(cases), queries)
+        kinds = [
+            ('citation lookup', lambda i: index.lookup(*citations[i].rsplit(' ', 1)[0].split(' ', 1),
+                                                       citations[i].rsplit(' ', 1)[1])),
+            ('exact name', lambda i: index.search_names(names[i])),
+            ('misspelled name', lambda i: index.search_names(_misspell(names[i], rng))),
+        ]
+        for label, fn in kinds:
+            p50, p99 = _latencies(fn, sample)
+            print(f"{label:>18}: p50 {p50:7.1f} us, p99 {p99:7.1f} us")
+
+        misspelled = [_misspell(names[i], rng) for i in sample]
+        p50, p99 = _latencies(checker._offline_case_name_result, misspelled)
+        answered = sum(checker._offline_case_name_result(name) is not None for name in misspelled)
+        print(f"{'checker, misspelt':>18}: p50 {p50:7.1f} us, p99 {p99:7.1f} us, "
+              f"{answered / queries:.0%} answered without the Search API")
+
+        if resident is not None:
+            print(f"resident set growth after all queries: {(_resident_kib() - resident) / 1024:.1f} MiB")
+        print(f"candidate counting: {'numpy' if np is not None else 'pure Python'}")
+        checker.close()
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
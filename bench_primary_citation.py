@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: picking primary citations for search result pages the old way (priority
+list x citations nested loop, re-splitting every citation string per result) vs. the
+batched one-pass picker with precomputed reporter ranks and cached splits.
+"""
+
+import random
+import time
+
+import click
+
+from citecheck import CitationChecker
+from citecheck_reporters import PREFERENCE_ORDER, normalize_reporter
+
+PARALLEL_CITATIONS = [
+    ('U.S.', 'S. Ct.', 'L. Ed. 2d'),
+    ('Cal. 4th', 'Cal. Rptr. 2d', 'P.2d'),
+    ('N.Y.2d', 'N.Y.S.2d', 'N.E.2d'),
+    ('F.3d',),
+    ('F. Supp. 2d',),
+    ('Mass.', 'N.E.3d'),
+    ('So. 3d',),
+    ("F. App'x",),
+]
+
+
+def synthetic_pages(count, page_size=20, seed=0):
+    rng = random.Random(seed)
+    pages = []
+    for _ in range(count):
+        page = []
+        for _ in range(page_size):
+            reporters = list(rng.choice(PARALLEL_CITATIONS))
+            rng.shuffle(reporters)
+            page.append({'citation': [f"{rng.randint(1, 999)} {reporter} {rng.randint(1, 1999)}"
+                                      for reporter in reporters]})
+        pages.append(page)
+    return pages
+
+
+def legacy_primary_citation(citations):
+    """Previous _get_primary_citation_from_search_result_list + _get_primary_citation"""
+    citation_list = []
+    for cit_str in citations:
+        parts = cit_str.strip().split()
+        if len(parts) >= 3:
+            citation_list.append({'volume': parts[0], 'reporter': ' '.join(parts[1:-1]), 'page': parts[-1]})
+    normalized = [normalize_reporter(cit.get('reporter') or '') for cit in citation_list]
+    for priority_reporter in PREFERENCE_ORDER:
+        for cit, reporter in zip(citation_list, normalized):
+            if reporter == priority_reporter and cit.get('volume'):
+                return f"{cit.get('volume')} {cit.get('reporter')} {cit.get('page', '')}"
+    for cit in citation_list:
+        if cit.get('volume') and cit.get('reporter'):
+            return f"{cit.get('volume')} {cit.get('reporter')} {cit.get('page', '')}"
+    return "Citation format unavailable"
+
+
+@click.command()
+@click.option('--pages', default=20000, help='Search result pages to process')
+@click.option('--page-size', default=20, help='Results per page')
+def main(pages, page_size):
+    result_pages = synthetic_pages(pages, page_size)
+    checker = CitationChecker('bench-key')
+
+    start = time.perf_counter()
+    legacy = [[legacy_primary_citation(result['citation']) for result in page] for page in result_pages]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = [checker._primary_citations(page) for page in result_pages]
+    batched_time = time.perf_counter() - start
+
+    assert legacy == batched
+    results = pages * page_size
+    print(f"{'legacy nested loop':>20}: {legacy_time:6.2f} s, {results / legacy_time / 1000:7.0f}k results/s")
+    print(f"{'batched one pass':>20}: {batched_time:6.2f} s, {results / batched_time / 1000:7.0f}k results/s "
+          f"({legacy_time / batched_time:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
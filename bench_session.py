@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-lookup latency with bare requests calls vs. a pooled keep-alive session.
+Runs against the local fake CourtListener server, which sleeps once per new
+connection to stand in for the TCP+TLS handshake of the real service.
+"""
+
+import statistics
+import time
+
+import click
+import requests
+
+from citecheck import CitationChecker
+from fake_courtlistener import FakeCourtListener
+
+
+class UnpooledCitationChecker(CitationChecker):
+    """The pre-session behaviour: every call opens (and drops) its own connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = requests
+
+
+def _run(checker, citations, rounds):
+    timings = []
+    for _ in range(rounds):
+        for citation in citations:
+            start = time.perf_counter()
+            checker.check_citation(citation)
+            timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+@click.command()
+@click.option('--rounds', default=20, help='Passes over the sample citations')
+@click.option('--handshake-ms', default=20.0, help='Simulated connection setup cost')
+def main(rounds, handshake_ms):
+    citations = ['410 U.S. 113', '347 US 483', '999 U.S. 999', 'Miranda v. Arizona']
+
+    with FakeCourtListener(handshake_delay=handshake_ms / 1000) as fake:
+        for label, checker_cls in (('bare requests', UnpooledCitationChecker),
+                                   ('pooled session', CitationChecker)):
+            checker = checker_cls('bench-key', base_url=fake.url)
+            before = fake.connections
+            timings = _run(checker, citations, rounds)
+            lookups = len(timings)
+            print(f"{label:>15}: {lookups} lookups, "
+                  f"median {statistics.median(timings):7.2f} ms, "
+                  f"mean {statistics.mean(timings):7.2f} ms, "
+                  f"{fake.connections - before} TCP connections")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-check latency with the serial strategy chain vs. speculative mode
+and parallel case-name search.
+Replays a recorded workload (one input per line; real citations, case names and
+citations that don't exist) against the local fake CourtListener server with
+per-endpoint latencies standing in for the real service.
+"""
+
+import statistics
+import time
+
+import click
+
+from citecheck import CitationChecker
+from fake_courtlistener import FakeCourtListener
+
+
+def _run(checker, inputs, rounds):
+    timings = {}
+    for _ in range(rounds):
+        for text in inputs:
+            start = time.perf_counter()
+            result = checker.check_citation(text)
+            timings.setdefault(result['status'], []).append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+@click.command()
+@click.option('--workload', default='bench_workload.txt', type=click.File(),
+              help='Recorded inputs, one per line')
+@click.option('--rounds', default=3, help='Passes over the workload')
+@click.option('--lookup-ms', default=120.0, help='Simulated Citation Lookup API latency')
+@click.option('--search-ms', default=80.0, help='Simulated Search API latency')
+def main(workload, rounds, lookup_ms, search_ms):
+    inputs = [line.strip() for line in workload if line.strip()]
+    path_delays = {
+        '/api/rest/v4/citation-lookup/': lookup_ms / 1000,
+        '/api/rest/v4/search/': search_ms / 1000,
+    }
+
+    with FakeCourtListener(path_delays=path_delays) as fake:
+        modes = (
+            ('serial', {}),
+            ('speculative', {'speculative': True}),
+            ('+ parallel', {'speculative': True, 'parallel_case_search': True}),
+        )
+        for label, options in modes:
+            checker = CitationChecker('bench-key', base_url=fake.url, **options)
+            before = sum(fake.hits.values())
+            timings = _run(checker, inputs, rounds)
+            checker.close()
+            requests_sent = sum(fake.hits.values()) - before
+            every = [t for values in timings.values() for t in values]
+            print(f"{label:>12}: {len(every)} checks, {requests_sent} upstream requests, "
+                  f"median {statistics.median(every):7.1f} ms, mean {statistics.mean(every):7.1f} ms")
+            for status, values in sorted(timings.items()):
+                print(f"{'':>14}{status:>8}: n={len(values):<4} median {statistics.median(values):7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
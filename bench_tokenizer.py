@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: classifying and parsing inputs with the per-call regex predicates the
+checker used to run vs. the single-pass parse_input tokenizer.
+Each input gets the three questions check_citation asks: is it citation-shaped,
+is it a case name, and what are its volume, reporter and page.
+"""
+
+import random
+import re
+import time
+
+import click
+
+from citecheck_parse import parse_input
+
+REPORTERS = ['U.S.', 'US', 'S. Ct.', 'F.3d', 'F. Supp. 2d', 'P.2d', 'Cal. 4th', 'N.E.2d', 'So. 3d', 'A.3d']
+PARTIES = ['Roe', 'Wade', 'Smith', 'Jones', 'Brown', 'Board of Education', 'Miranda', 'Arizona', 'People', 'Green']
+
+
+def synthetic_inputs(count, seed=0):
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(count):
+        citation = f"{rng.randint(1, 999)} {rng.choice(REPORTERS)} {rng.randint(1, 1999)}"
+        name = f"{rng.choice(PARTIES)} v. {rng.choice(PARTIES)}"
+        inputs.append(rng.choice([citation, citation, name, f"{name}, {citation} ({rng.randint(1900, 2024)})"]))
+    return inputs
+
+
+def legacy_classify(text):
+    """The checker's previous _looks_like_citation_format / _looks_like_case_name / _parse_citation_parts"""
+    looks_like_citation = False
+    for pattern in (r'^\d+\s+[A-Za-z.]+\d+[a-z]*\s+\d+.*$', r'^\d+\s+[A-Za-z.]+\s+\d+.*$', r'^\d+\s+[A-Za-z]+\s+\d+.*$'):
+        if re.match(pattern, text.strip()):
+            looks_like_citation = True
+            break
+    looks_like_case_name = bool(re.search(r'\bv\.?\s+', text, re.IGNORECASE))
+    parts = None
+    for pattern in (r'(\d+)\s+([A-Za-z.]+\d+[a-z]*)\s+(\d+)', r'(\d+)\s+([A-Za-z.]+)\s+(\d+)'):
+        match = re.search(pattern, text.strip())
+        if match:
+            parts = match.groups()
+            break
+    return looks_like_citation, looks_like_case_name, parts
+
+
+def tokenizer_classify(text, parse=parse_input):
+    parsed = parse(text)
+    return parsed.looks_like_citation, parsed.looks_like_case_name, (parsed.volume, parsed.reporter, parsed.page)
+
+
+def _time(label, fn, inputs):
+    start = time.perf_counter()
+    for text in inputs:
+        fn(text)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22}: {elapsed:6.2f} s, {len(inputs) / elapsed / 1000:8.0f}k inputs/s")
+
+
+@click.command()
+@click.option('--count', default=1_000_000, help='Number of synthetic inputs')
+def main(count):
+    inputs = synthetic_inputs(count)
+    _time('legacy regexes', legacy_classify, inputs)
+    _time('tokenizer (uncached)', lambda text: tokenizer_classify(text, parse_input.__wrapped__), inputs)
+    _time('tokenizer (cached)', tokenizer_classify, inputs)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,31 +6,331 @@ Check legal citations using the CourtListener API v4
 
 import os
 import sys
+import bisect
+import logging
+import threading
+import time
+from concurrent import futures
 import requests
 import click
 import re
-from typing import Dict, List, Optional, Tuple
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, List, NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
-from difflib import SequenceMatcher
+from requests.adapters import HTTPAdapter
+from citecheck_index import (DEFAULT_FALSE_POSITIVE_RATE, CitationFilter, OfflineIndex, build_filter, build_index,
+                             citation_key)
+from citecheck_match import default_matcher
+from citecheck_metrics import CheckerMetrics
+from citecheck_parse import parse_input, split_citation
+from citecheck_cache import LocalAnswerStats
+from citecheck_reporters import (correct_reporter, impossibility, is_statute, lookup as lookup_reporter,
+                                 normalize_reporter, reporter_rank, reporter_suggestions)
+from citecheck_transport import (RETRYABLE_STATUSES, Deadline, TransportPolicy, default_transport_policies,
+                                 retry_after_seconds)
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+COURTLISTENER_BASE_URL = "https://www.courtlistener.com"
+
+# Citation Lookup API request limits (https://www.courtlistener.com/help/api/rest/citation-lookup/)
+CITATION_LOOKUP_MAX_CHARS = 64000
+CITATION_LOOKUP_MAX_CITATIONS = 250
+CITATION_LOOKUP_SEPARATOR = "\n\n"
+
+# How many times a throttled (429) request is queued and retried before giving up
+RATE_LIMIT_RETRIES = 3
+
+# Threads available for hedged duplicate requests, per checker
+HEDGE_WORKERS = 8
+
+# Threads running speculative citation-parts searches, per checker
+SPECULATIVE_WORKERS = 8
+
+# Upstream requests the default fallback chain would spend on an input each kind of
+# local answer covers: a citation that doesn't exist costs the Citation Lookup API
+# and the citation-parts search; a known citation or case name costs one request
+UPSTREAM_CALLS_SAVED = {'impossible': 2, 'citation_filter': 2, 'offline_index': 1}
+
+# Document scanning patterns, compiled once. A reporter is one or more capitalized
+# abbreviations optionally followed by a series ordinal ("U.S.", "S. Ct.", "F. Supp. 2d").
+DOCUMENT_CITATION_RE = re.compile(
+    r"\b(?P<volume>\d{1,4})\s+"
+    r"(?P<reporter>[A-Z][A-Za-z.']*(?:\s?(?:[A-Z][A-Za-z.']*|\d+(?:d|th|st|nd|rd)\b\.?))*)"
+    r"\s+(?P<page>\d{1,5})\b"
+    r"(?:,\s*(?P<pinpoint>\d{1,5})\b(?!\s+[A-Z]))?"
+    r"(?:\s*\((?:[^()]*?\s)?(?P<year>\d{4})\))?"
+)
+DOCUMENT_PARTY = r"[A-Z][\w.'&-]*(?:\s+(?:[A-Z][\w.'&-]*|of|the|and|for|in|on|de|ex\s+rel\.))*"
+DOCUMENT_CASE_NAME_RE = re.compile(
+    rf"(?P<name>(?P<plaintiff>{DOCUMENT_PARTY})\s+v(?:s)?\.?\s+(?P<defendant>{DOCUMENT_PARTY}))"
+)
+# Citation signals and sentence openers that precede, but are not part of, a case name
+DOCUMENT_NAME_PREFIXES = {
+    'in', 'see', 'cf.', 'but', 'also', 'accord', 'compare', 'e.g.', 'and', 'under',
+    'citing', 'following', 'as', 'similarly', 'contra', 'the', 'with', 'because', 'while',
+}
+
+def create_session(pool_size=10, keep_alive=True):
+    """
+    Build a pooled requests.Session for talking to CourtListener.
+    
+    The session carries no per-user state (auth headers are sent per request and
+    cookies are refused), so a single session can be shared by many checkers and
+    threads while urllib3's connection pool reuses warm TCP+TLS connections.
+    
+    Args:
+        pool_size (int): Maximum number of connections kept open per host
+        keep_alive (bool): Reuse connections between requests (default: True)
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
+
+class _Batch(NamedTuple):
+    """check_many's working state: inputs, results so far by unique text, and what to look up"""
+    inputs: List[str]
+    unique: List[str]
+    checked: Dict[str, dict]
+    lookup_texts: List[str]
+    corrections: Dict[str, str]
+
 class CitationChecker:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, session=None, pool_size=10, keep_alive=True, base_url=None,
+                 cache=None, negative_cache=None, single_flight=None, rate_limiter=None,
+                 max_rate_limit_wait=60.0, transport_policies=None, speculative=False,
+                 parallel_case_search=False, matcher=None, offline_index=None, citation_filter=None,
+                 local_stats=None, metrics=None):
+        """
+        Args:
+            api_key (str): CourtListener API token (default: COURTLISTENER_API_KEY)
+            session (requests.Session): Shared session to reuse; one is created if omitted
+            pool_size (int): Connection pool size for the session we create
+            keep_alive (bool): Keep connections alive between lookups (default: True)
+            base_url (str): CourtListener base URL, overridable for local testing
+            cache (ResultCache): Result cache to consult before calling CourtListener
+            negative_cache (ResultCache): Shorter-lived cache of "invalid" outcomes
+            single_flight (SingleFlight): Coalesces concurrent checks of the same input
+            rate_limiter (RateLimiter): Per-key scheduler every upstream request waits on
+            max_rate_limit_wait (float): Longest Retry-After we will queue for before giving up
+            transport_policies (dict): TransportPolicy overrides keyed by strategy
+                ('citation_lookup', 'citation_parts', 'enhanced_search')
+            speculative (bool): Start the citation-parts search alongside the Citation
+                Lookup API instead of after it (faster misses, more upstream requests)
+            parallel_case_search (bool): Send the fielded and broad case-name queries
+                together instead of the broad one only after a fielded miss
+            matcher (Matcher): Case-name scorer (default: rapidfuzz-backed when installed)
+            offline_index (OfflineIndex): Local exact-citation index consulted before any HTTP call
+            citation_filter (CitationFilter): Bloom filter of known citations; citations it
+                rules out are reported invalid without any HTTP call
+            local_stats (LocalAnswerStats): Shared tally of checks answered without
+                CourtListener and the upstream calls saved (one is created if omitted)
+            metrics (CheckerMetrics): Shared latency histograms and outcome counters
+                (one is created if omitted)
+        """
+        self._configure(api_key, base_url, cache=cache, negative_cache=negative_cache,
+                        single_flight=single_flight, rate_limiter=rate_limiter,
+                        max_rate_limit_wait=max_rate_limit_wait, transport_policies=transport_policies,
+                        speculative=speculative, parallel_case_search=parallel_case_search,
+                        matcher=matcher, offline_index=offline_index, citation_filter=citation_filter,
+                        local_stats=local_stats, metrics=metrics)
+        
+        # Reuse one pooled session across every strategy and lookup
+        self._owns_session = session is None
+        self.session = session or create_session(pool_size=pool_size, keep_alive=keep_alive)
+    
+    def _configure(self, api_key, base_url, cache=None, negative_cache=None, single_flight=None,
+                   rate_limiter=None, max_rate_limit_wait=60.0, transport_policies=None, speculative=False,
+                   parallel_case_search=False, matcher=None, offline_index=None, citation_filter=None,
+                   local_stats=None, metrics=None):
+        """Set up credentials, endpoint URLs and caches (shared with AsyncCitationChecker)"""
         # Use provided API key or fall back to environment variable
         self.api_key = api_key or os.getenv('COURTLISTENER_API_KEY')
         if not self.api_key:
             raise ValueError("API key is required - either pass it as parameter or set COURTLISTENER_API_KEY environment variable")
         
-        self.citation_lookup_url = "https://www.courtlistener.com/api/rest/v4/citation-lookup/"
-        self.search_url = "https://www.courtlistener.com/api/rest/v4/search/"
+        base_url = (base_url or COURTLISTENER_BASE_URL).rstrip('/')
+        self.citation_lookup_url = f"{base_url}/api/rest/v4/citation-lookup/"
+        self.search_url = f"{base_url}/api/rest/v4/search/"
         self.headers = {
             'Authorization': f'Token {self.api_key}',
             'User-Agent': 'CiteCheck/2.0'
         }
+        self.cache = cache
+        self.negative_cache = negative_cache
+        self.single_flight = single_flight
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.transport_policies = dict(default_transport_policies(), **(transport_policies or {}))
+        self.speculative = speculative
+        self.parallel_case_search = parallel_case_search
+        self.matcher = matcher or default_matcher()
+        self.offline_index = offline_index
+        self.citation_filter = citation_filter
+        self.local_stats = local_stats or LocalAnswerStats()
+        self.metrics = metrics or CheckerMetrics()
+        self._executors = {}
+        self._executors_lock = threading.Lock()
+    
+    def close(self):
+        """Release pooled connections (only if this checker created the session)"""
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+        if self._owns_session:
+            self.session.close()
+    
+    def rate_limit_budget(self):
+        """Current upstream request budget for this checker's API key (None if unscheduled)"""
+        if self.rate_limiter is None:
+            return None
+        return self.rate_limiter.budget(self.api_key)
+    
+    def _rate_limit_delay(self, response, attempt):
+        """
+        Seconds to wait before retrying a 429 response, or None to give up.
+        Honors Retry-After; without one, backs off exponentially.
+        """
+        if self.rate_limiter is not None:
+            delay = self.rate_limiter.bucket(self.api_key).observe(response.status_code, response.headers)
+        else:
+            delay = retry_after_seconds(response.headers) or 0.0
+        if response.status_code != 429 or attempt >= RATE_LIMIT_RETRIES:
+            return None
+        delay = max(delay, 2 ** attempt)
+        return delay if delay <= self.max_rate_limit_wait else None
+    
+    def _transport_policy(self, strategy):
+        policy = self.transport_policies.get(strategy)
+        if policy is None:
+            # Kept, so its latency samples accumulate like the defaults'
+            policy = self.transport_policies[strategy] = TransportPolicy()
+        return policy
+    
+    def _request(self, method, url, strategy=None, deadline=None, **kwargs):
+        """
+        Send one upstream request under the strategy's transport policy.
+        
+        Each attempt waits for the per-key rate limiter, uses the policy's connect
+        and read timeouts, and may be hedged. Idempotent requests that time out,
+        fail to connect or get a 5xx are retried with jittered backoff; 429s are
+        queued (rather than failed) when their Retry-After fits within
+        max_rate_limit_wait. With a deadline, timeouts are capped at the remaining
+        budget and no wait or retry is started that would outlast it. The time taken
+        and the final status are recorded in the strategy's metrics.
+        """
+        start = time.monotonic()
+        status = 'error'
+        try:
+            response = self._request_with_retries(method, url, strategy, deadline, **kwargs)
+            status = response.status_code
+            return response
+        finally:
+            self._record_upstream(strategy, status, time.monotonic() - start)
+    
+    def _record_upstream(self, strategy, status, seconds):
+        strategy = strategy or 'other'
+        self.metrics.upstream_seconds.observe(seconds, strategy=strategy)
+        self.metrics.upstream_requests.inc(strategy=strategy, status=status)
+    
+    def _strategy_result(self, strategy, result):
+        """Count a strategy's result by status and pass it through"""
+        self.metrics.strategy_results.inc(strategy=strategy, status=result['status'])
+        return result
+    
+    def _fallback(self, strategy):
+        self.metrics.fallbacks.inc(strategy=strategy)
+    
+    def _request_with_retries(self, method, url, strategy=None, deadline=None, **kwargs):
+        policy = self._transport_policy(strategy)
+        attempt = throttled = 0
+        while True:
+            try:
+                if deadline is not None and deadline.expired():
+                    raise requests.exceptions.Timeout(f'Deadline of {deadline.seconds}s exceeded')
+                response = self._send(method, url, policy, deadline, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if deadline is not None and deadline.expired():
+                    deadline.miss(strategy)
+                    raise
+                if not policy.can_retry(method, attempt):
+                    raise
+                self._sleep_within(policy.backoff_delay(attempt), deadline)
+                attempt += 1
+                continue
+            
+            delay = self._rate_limit_delay(response, throttled)
+            if delay is not None and self._fits(delay, deadline):
+                time.sleep(delay)
+                throttled += 1
+            elif (response.status_code in RETRYABLE_STATUSES and policy.can_retry(method, attempt)
+                  and not (deadline is not None and deadline.expired())):
+                self._sleep_within(policy.backoff_delay(attempt), deadline)
+                attempt += 1
+            else:
+                return response
+    
+    @staticmethod
+    def _fits(delay, deadline):
+        return deadline is None or delay < deadline.remaining()
+    
+    @staticmethod
+    def _sleep_within(delay, deadline):
+        time.sleep(delay if deadline is None else min(delay, deadline.remaining()))
+    
+    def _send_once(self, method, url, policy, deadline=None, **kwargs):
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.bucket(self.api_key).reserve()
+            if not self._fits(wait, deadline):
+                raise requests.exceptions.Timeout(f'Deadline of {deadline.seconds}s exceeded waiting for the rate limiter')
+            if wait > 0:
+                time.sleep(wait)
+        timeout = policy.timeout if deadline is None else deadline.timeout(policy)
+        start = time.monotonic()
+        response = self.session.request(method, url, headers=self.headers, timeout=timeout, **kwargs)
+        policy.latency.record(time.monotonic() - start)
+        return response
+    
+    def _send(self, method, url, policy, deadline=None, **kwargs):
+        """Send a request, hedging it with a duplicate if it outlives the policy's hedge delay"""
+        hedge_delay = policy.hedge_delay(method)
+        if hedge_delay is None or not self._fits(hedge_delay, deadline):
+            return self._send_once(method, url, policy, deadline, **kwargs)
+        
+        pool = self._pool('hedge', HEDGE_WORKERS)
+        pending = {pool.submit(self._send_once, method, url, policy, deadline, **kwargs)}
+        done, pending = futures.wait(pending, timeout=hedge_delay)
+        if not done:
+            pending.add(pool.submit(self._send_once, method, url, policy, deadline, **kwargs))
+        
+        # First successful answer wins; the loser finishes in the background and is discarded
+        error = None
+        while True:
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+            if not pending:
+                raise error
+            done, pending = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+    
+    def _pool(self, name, max_workers):
+        """Lazily created thread pool for background requests (separate pools can't starve each other)"""
+        with self._executors_lock:
+            executor = self._executors.get(name)
+            if executor is None:
+                executor = self._executors[name] = futures.ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix=f'citecheck-{name}')
+            return executor
     
-    def check_citation(self, citation_text, include_unpublished=False):
+    def check_citation(self, citation_text, include_unpublished=False, deadline=None):
         """
         Enhanced citation checking using multiple CourtListener APIs.
         Handles both case names and citation formats.
@@ -38,43 +338,663 @@ class CitationChecker:
         Args:
             citation_text (str): The citation or case name to search for
             include_unpublished (bool): Whether to include unpublished opinions (default: False)
+            deadline (float): Total seconds to spend on upstream calls. Each strategy gets
+                only the remaining budget and strategies that can't finish are skipped;
+                the best partial result is then returned with 'degraded': True. (The
+                budget caps each read, not a whole response - see Deadline.)
         """
         citation_text = citation_text.strip()
         
+        cached = self._cached_result(citation_text, include_unpublished)
+        if cached is not None:
+            return cached
+        
+        local = self._local_result(citation_text, include_unpublished)
+        if local is not None:
+            return local
+        
+        if deadline is not None:
+            deadline = Deadline(deadline)
+        
+        if self.single_flight is None:
+            return self._check_and_cache(citation_text, include_unpublished, deadline)
+        
+        # Concurrent callers checking the same input share one upstream operation
+        result, shared = self.single_flight.do(
+            self.cache_key(citation_text, include_unpublished),
+            lambda: self._check_and_cache(citation_text, include_unpublished, deadline)
+        )
+        if shared:
+            self.metrics.coalesced.inc()
+        if shared and self._should_recheck(result, deadline):
+            # The leader's failure may be specific to it (e.g. its API key or deadline) - try our own
+            result = self._check_and_cache(citation_text, include_unpublished, deadline)
+        return result
+    
+    @staticmethod
+    def _should_recheck(shared_result, deadline):
+        if shared_result['status'] != 'error' and not shared_result.get('degraded'):
+            return False
+        return deadline is None or not deadline.expired()
+    
+    def _check_and_cache(self, citation_text, include_unpublished=False, deadline=None):
+        corrected = self._corrected_citation(citation_text)
+        if corrected is not None:
+            result = self._check_with_correction(citation_text, corrected, include_unpublished, deadline)
         # First, try the Citation Lookup API if it looks like a citation format
-        if self._looks_like_citation_format(citation_text):
-            citation_result = self._check_with_citation_api(citation_text, include_unpublished)
-            if citation_result['status'] == 'valid':
-                return citation_result
-            elif citation_result['status'] == 'invalid':
-                # Citation Lookup API couldn't find it - try targeted citation search
-                parsed_citation = self._parse_citation_parts(citation_text)
-                if parsed_citation:
-                    fallback_result = self._search_by_citation_parts(parsed_citation, include_unpublished)
-                    if fallback_result['status'] == 'valid':
-                        return fallback_result
-                # If targeted search also fails, return the original citation lookup result
-                return citation_result
+        elif self._looks_like_citation_format(citation_text):
+            parsed_citation = self._parse_citation_parts(citation_text) if self.speculative else None
+            if parsed_citation:
+                result = self._speculative_lookup(citation_text, parsed_citation, include_unpublished, deadline)
             else:
-                # API error - continue with fallbacks
-                pass
+                if self._has_time(deadline, 'citation_lookup'):
+                    citation_result = self._check_with_citation_api(citation_text, include_unpublished, deadline)
+                else:
+                    citation_result = self._deadline_result(citation_text, deadline)
+                result = self._continue_after_lookup(citation_text, citation_result, include_unpublished, deadline)
+        else:
+            result = self._search_fallbacks(citation_text, include_unpublished, deadline)
+        result = self._with_reporter_suggestions(citation_text, result)
         
-        # If Citation API failed or this looks like a case name, use enhanced search
+        if deadline is not None and deadline.missed:
+            # A partial answer is returned as-is but never cached
+            return dict(result, degraded=True, missed_strategies=list(deadline.missed))
+        self._cache_result(citation_text, include_unpublished, result)
+        return result
+    
+    def _speculative_lookup(self, citation_text, parsed_citation, include_unpublished=False, deadline=None):
+        """
+        Run the Citation Lookup API and the citation-parts search concurrently.
+        
+        The answer follows the same precedence as the serial chain: a valid lookup
+        wins (the search is cancelled, or discarded if already sent), then a valid
+        search, then the lookup's "invalid". After a lookup error the search result
+        stands in for the serial fallback unless the input is a case name.
+        """
+        if not self._has_time(deadline, 'citation_lookup'):
+            citation_result = self._deadline_result(citation_text, deadline)
+            return self._continue_after_lookup(citation_text, citation_result, include_unpublished, deadline)
+        
+        search = self._pool('speculative', SPECULATIVE_WORKERS).submit(
+            self._search_by_citation_parts, parsed_citation, include_unpublished, deadline)
+        citation_result = self._check_with_citation_api(citation_text, include_unpublished, deadline)
+        if citation_result['status'] == 'valid':
+            search.cancel()
+            return citation_result
+        
+        fallback_result = search.result()
+        if citation_result['status'] == 'invalid':
+            return fallback_result if fallback_result['status'] == 'valid' else citation_result
         if self._looks_like_case_name(citation_text):
-            return self._enhanced_case_name_search(citation_text, include_unpublished)
-        else:
-            # Try parsing as citation and search for case name
+            return self._search_fallbacks(citation_text, include_unpublished, deadline, partial=citation_result)
+        return fallback_result
+    
+    def _has_time(self, deadline, strategy):
+        """Whether a strategy can still run within the deadline (always, without one)"""
+        return deadline is None or deadline.allows(strategy, self._transport_policy(strategy))
+    
+    def _deadline_result(self, citation_text, deadline):
+        return {
+            'status': 'error',
+            'message': f'Deadline of {deadline.seconds}s exceeded before "{citation_text}" could be checked',
+            'search_type': 'deadline',
+            'cases': []
+        }
+    
+    def cache_key(self, citation_text, include_unpublished=False):
+        """
+        Canonical cache key for an input: case and whitespace are folded, and a bare
+        volume-reporter-page citation is keyed on its normalized reporter, so
+        "410 US 113" and "410 U.S. 113" share an entry.
+        """
+        text = re.sub(r'\s+', ' ', citation_text.strip())
+        parsed = parse_input(text)
+        if parsed.looks_like_citation and parsed.span[1] == len(text):
+            text = f"{parsed.volume} {self._normalize_reporter(parsed.reporter)} {parsed.page}"
+        return (text.lower(), bool(include_unpublished))
+    
+    def _cached_result(self, citation_text, include_unpublished=False):
+        if self.cache is None and self.negative_cache is None:
+            return None
+        key = self.cache_key(citation_text, include_unpublished)
+        for name, cache in (('result', self.cache), ('negative', self.negative_cache)):
+            if cache is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    self.metrics.cache_hits.inc(cache=name)
+                    return cached
+        self.metrics.cache_misses.inc()
+        return None
+    
+    def _cache_result(self, citation_text, include_unpublished, result):
+        # Errors are transient, so they are never cached. "Not found" answers go to the
+        # negative cache (when configured) so they expire sooner than confirmed cases.
+        if result['status'] == 'error':
+            return
+        cache = self.cache
+        if result['status'] == 'invalid' and self.negative_cache is not None:
+            cache = self.negative_cache
+        if cache is not None:
+            cache.set(self.cache_key(citation_text, include_unpublished), result)
+    
+    def invalidate_cached(self, citation_text, include_unpublished=None):
+        """Forget cached results for an input (both publication filters unless one is given)"""
+        filters = (False, True) if include_unpublished is None else (include_unpublished,)
+        for cache in (self.cache, self.negative_cache):
+            if cache is not None:
+                for flag in filters:
+                    cache.invalidate(self.cache_key(citation_text, flag))
+    
+    def _local_result(self, citation_text, include_unpublished=False):
+        """
+        Answer an input without any HTTP call where possible: citations the reporter
+        table shows can't exist and citations the filter rules out are invalid, and
+        the offline index answers what it knows. None when nothing local can answer
+        confidently; the caller then checks upstream as usual, since the index may
+        be older or narrower than CourtListener.
+        """
+        parsed = parse_input(citation_text)
+        result = None
+        if parsed.looks_like_citation:
+            reason = impossibility(parsed.volume, parsed.reporter, parsed.page, parsed.year)
+            if reason is not None:
+                result = self._impossible_citation_result(citation_text, reason)
+        if result is None and self.offline_index is not None:
+            if parsed.looks_like_citation:
+                result = self._offline_citation_result(citation_text, parsed, include_unpublished)
+            elif parsed.kind == 'case_name':
+                result = self._offline_case_name_result(citation_text)
+        if (result is None and self.citation_filter is not None and parsed.looks_like_citation
+                and not self.citation_filter.might_exist(parsed.volume, parsed.reporter, parsed.page)):
+            result = self._filtered_citation_result(citation_text)
+        
+        if result is not None:
+            self._record_local(result['search_type'])
+        return result
+    
+    def _record_local(self, source):
+        calls_saved = UPSTREAM_CALLS_SAVED[source]
+        self.local_stats.record(source, calls_saved)
+        self.metrics.local_answers.inc(source=source)
+        self.metrics.upstream_calls_saved.inc(calls_saved)
+    
+    def _corrected_citation(self, citation_text):
+        """
+        The input with its reporter corrected ("609 PD2 468" -> "609 P.2d 468") when
+        the reporter table doesn't know the reporter but one known reporter stands
+        out as the likely intended one, else None. The correction is only a guess -
+        the table is not complete - so it is looked up alongside the input as
+        written, never instead of it (see _check_with_correction).
+        """
+        parsed = parse_input(citation_text)
+        if not parsed.looks_like_citation or lookup_reporter(parsed.reporter) is not None:
+            return None
+        reporter = correct_reporter(parsed.reporter)
+        return None if reporter is None else self._with_reporter(citation_text, parsed, reporter)
+    
+    @staticmethod
+    def _with_reporter(citation_text, parsed, reporter):
+        """The input with its citation's reporter replaced, keeping any pinpoint and year"""
+        start, end = parsed.span
+        return f"{citation_text[:start]}{parsed.volume} {reporter} {parsed.page}{citation_text[end:]}"
+    
+    def _check_with_correction(self, citation_text, corrected, include_unpublished=False, deadline=None):
+        """
+        Check an input with a likely misspelled reporter: the input as written and
+        its correction share one Citation Lookup request, so trying the correction
+        costs no extra call (see _finish_correction for what happens next).
+        """
+        if not self._has_time(deadline, 'citation_lookup'):
+            citation_result = self._deadline_result(citation_text, deadline)
+            return self._continue_after_lookup(citation_text, citation_result, include_unpublished, deadline)
+        lookups = self._check_chunk_with_citation_api([citation_text, corrected], include_unpublished, deadline)
+        self._record_lookups(lookups)
+        return self._finish_correction(citation_text, corrected, lookups[citation_text], lookups[corrected],
+                                       include_unpublished, deadline)
+    
+    def _finish_correction(self, citation_text, corrected, citation_result, corrected_result,
+                           include_unpublished=False, deadline=None):
+        """
+        Settle an input and its reporter correction from their Citation Lookup results.
+        
+        The input as written wins whenever CourtListener confirms it. Otherwise the
+        correction, which is followed through the usual fallbacks since the table
+        knows its reporter, is returned if it is confirmed; the input's own
+        citation-parts search is skipped, as its reporter is almost surely wrong.
+        If the lookup itself failed, the input goes through the usual fallbacks.
+        """
+        if citation_result['status'] != 'invalid':
+            return self._continue_after_lookup(citation_text, citation_result, include_unpublished, deadline)
+        corrected_result = self._continue_after_lookup(corrected, corrected_result, include_unpublished, deadline)
+        if corrected_result['status'] != 'valid':
+            return citation_result
+        self._cache_result(corrected, include_unpublished, corrected_result)
+        return self._correction_result(citation_text, corrected, corrected_result)
+    
+    @staticmethod
+    def _correction_result(citation_text, corrected, result):
+        """A corrected citation's result, annotated so the user sees what was checked"""
+        note = f'Reporter corrected: checked "{corrected}" for "{citation_text}"'
+        if result.get('note'):
+            note = f"{note}. {result['note']}"
+        return dict(result, corrected_citation=corrected, note=note)
+    
+    def _with_reporter_suggestions(self, citation_text, result):
+        """
+        An unconfirmed result for an input whose reporter the table doesn't know,
+        with "did you mean" suggestions attached; any other result unchanged.
+        """
+        if result['status'] == 'valid' or 'suggestions' in result:
+            return result
+        parsed = parse_input(citation_text)
+        if not parsed.looks_like_citation or lookup_reporter(parsed.reporter) is not None:
+            return result
+        suggestions = [self._with_reporter(citation_text, parsed, reporter)
+                       for reporter in reporter_suggestions(parsed.reporter)[:3]]
+        if not suggestions:
+            return result
+        note = 'Did you mean ' + ' or '.join(f'"{suggestion}"' for suggestion in suggestions) + '?'
+        if result.get('note'):
+            note = f"{result['note']}. {note}"
+        return dict(result, suggestions=suggestions, note=note)
+    
+    def _impossible_citation_result(self, citation_text, reason):
+        return {
+            'status': 'invalid',
+            'message': f'Citation cannot exist: {citation_text}',
+            'search_type': 'impossible',
+            'cases': [],
+            'note': reason,
+            'method': 'Reporter Table'
+        }
+    
+    def _filtered_citation_result(self, citation_text):
+        return {
+            'status': 'invalid',
+            'message': f'Citation not found in database: {citation_text}',
+            'search_type': 'citation_filter',
+            'cases': [],
+            'note': f'No case has this citation in CourtListener bulk data '
+                    f'({self.citation_filter.citations} citations indexed)',
+            'method': 'Citation Filter'
+        }
+    
+    def _offline_case(self, cluster):
+        """Case dict for an offline index cluster, shaped like _citation_lookup_cases'"""
+        precedential_status = cluster['precedential_status']
+        return {
+            'name': cluster['case_name'],
+            'court': cluster['court'],
+            'date': cluster['date_filed'],
+            'citation': self._get_primary_citation_from_search_result_list(cluster['citations']),
+            'absolute_url': cluster['absolute_url'],
+            'citation_count': cluster['citation_count'],
+            'slug': cluster['slug'],
+            'publication_status': precedential_status,
+            'is_published': self._is_published_status(precedential_status, cluster['court'])
+        }
+    
+    def _offline_citation_result(self, citation_text, parsed, include_unpublished=False):
+        """Citation Lookup-shaped result from the offline index, or None if it has no (published, unless requested) case"""
+        cases = []
+        for cluster in self.offline_index.lookup(parsed.volume, parsed.reporter, parsed.page):
+            case = self._offline_case(cluster)
+            if not include_unpublished and not case['is_published']:
+                continue
+            case['found_citation'] = citation_text[:parsed.span[1]]
+            case['normalized_citation'] = [citation_key(parsed.volume, parsed.reporter, parsed.page)]
+            cases.append(case)
+        if not cases:
+            return None
+        
+        return {
+            'status': 'valid',
+            'message': f'Found {len(cases)} case(s) in the offline index',
+            'search_type': 'offline_index',
+            'cases': cases,
+            'total_results': len(cases),
+            'method': 'Offline Index'
+        }
+    
+    def _offline_case_name_result(self, case_name):
+        """
+        Enhanced-search-shaped result for a case name from the offline index's
+        name postings, ranked and deduplicated like Search API results. None unless
+        the best match clears the same 0.8 similarity bar that marks a search
+        result uncertain - low-confidence names are left to the Search API.
+        """
+        cases = [self._offline_case(cluster) for cluster in self.offline_index.search_names(case_name)]
+        if not cases:
+            return None
+        
+        # Like Search API results: the top 5 by relevance, then deduplicated
+        similarity = {id(case): self._calculate_similarity(case_name, case['name']) for case in cases}
+        cases.sort(key=lambda case: (-similarity[id(case)], -(case['citation_count'] or 0)))
+        cases = self._deduplicate_cases(cases[:5])
+        best_match, best_similarity = self._find_best_match(case_name, cases)
+        if best_similarity < 0.8:
+            return None
+        
+        return {
+            'status': 'valid',
+            'message': f'Found {len(cases)} case(s) matching "{case_name}" in the offline index',
+            'search_type': 'offline_index',
+            'cases': cases,
+            'total_results': len(cases),
+            'method': 'Offline Index'
+        }
+    
+    def _continue_after_lookup(self, citation_text, citation_result, include_unpublished=False, deadline=None):
+        """Finish the fallback chain once the Citation Lookup API has answered"""
+        if citation_result['status'] == 'valid':
+            return citation_result
+        elif citation_result['status'] == 'invalid':
+            # Citation Lookup API couldn't find it - try targeted citation search
             parsed_citation = self._parse_citation_parts(citation_text)
-            if parsed_citation:
-                return self._search_by_citation_parts(parsed_citation, include_unpublished)
+            if parsed_citation and self._has_time(deadline, 'citation_parts'):
+                self._fallback('citation_parts')
+                fallback_result = self._search_by_citation_parts(parsed_citation, include_unpublished, deadline)
+                if fallback_result['status'] == 'valid':
+                    return fallback_result
+            # If targeted search also fails, return the original citation lookup result
+            return citation_result
+        
+        # API error - continue with fallbacks
+        return self._search_fallbacks(citation_text, include_unpublished, deadline, partial=citation_result)
+    
+    def _search_fallbacks(self, citation_text, include_unpublished=False, deadline=None, partial=None):
+        """
+        Search API strategies used when the Citation Lookup API can't answer.
+        `partial` is what to return if the deadline leaves no time to search.
+        """
+        # If Citation API failed or this looks like a case name, use enhanced search;
+        # otherwise try parsing as citation and search for case name
+        looks_like_case_name = self._looks_like_case_name(citation_text)
+        parsed_citation = None if looks_like_case_name else self._parse_citation_parts(citation_text)
+        
+        strategy = 'citation_parts' if parsed_citation else 'enhanced_search'
+        if not self._has_time(deadline, strategy):
+            return partial or self._deadline_result(citation_text, deadline)
+        if partial is not None:
+            self._fallback(strategy)
+        
+        if looks_like_case_name:
+            return self._enhanced_case_name_search(citation_text, include_unpublished, deadline)
+        elif parsed_citation:
+            return self._search_by_citation_parts(parsed_citation, include_unpublished, deadline)
+        else:
+            # Fall back to text search with warning
+            result = self._enhanced_case_name_search(citation_text, include_unpublished, deadline)
+            if result['status'] == 'invalid':
+                result['message'] = f'No cases found for "{citation_text}". Try entering a case name (like "Smith v. Jones") or a proper citation (like "410 U.S. 113").'
+            return result
+    
+    def check_many(self, citations, include_unpublished=False):
+        """
+        Check a batch of citations with as few Citation Lookup API calls as possible.
+        
+        Citation-shaped inputs are packed into shared Citation Lookup requests (up to
+        the endpoint's character and per-request citation limits) and the returned
+        entries are mapped back to each input by offset. Only inputs the lookup could
+        not confirm go through the per-item search fallbacks; case names are checked
+        individually as usual. Results are returned in input order.
+        
+        Args:
+            citations (list): Citations or case names to check
+            include_unpublished (bool): Whether to include unpublished opinions (default: False)
+        """
+        batch = self._plan_batch(citations, include_unpublished)
+        
+        lookups = {}
+        for chunk in self._pack_citation_lookup_chunks(batch.lookup_texts):
+            lookups.update(self._check_chunk_with_citation_api(chunk, include_unpublished))
+        self._record_lookups(lookups)
+        
+        for text in batch.unique:
+            if text not in batch.checked:
+                batch.checked[text] = self._finish_batch_item(text, batch, lookups, include_unpublished)
+        
+        return self._batch_results(batch)
+    
+    def _plan_batch(self, citations, include_unpublished=False):
+        """
+        The part of check_many both checkers share before any upstream call: inputs
+        are stripped and deduplicated, cached and locally answerable ones are
+        settled, and the rest that look like citations are queued for the batched
+        Citation Lookup.
+        """
+        inputs = [citation.strip() for citation in citations]
+        unique = list(dict.fromkeys(inputs))
+        
+        checked = {}
+        for text in unique:
+            cached = self._cached_result(text, include_unpublished)
+            if cached is None:
+                cached = self._local_result(text, include_unpublished)
+            if cached is not None:
+                checked[text] = cached
+        
+        lookup_texts, corrections = [], {}
+        for text in unique:
+            if text in checked:
+                continue
+            corrected = self._corrected_citation(text)
+            if corrected is not None:
+                # Looked up alongside the input as written (see _check_with_correction)
+                corrections[text] = corrected
+                lookup_texts.extend([text, corrected])
+            elif self._looks_like_citation_format(text):
+                lookup_texts.append(text)
+        return _Batch(inputs, unique, checked, list(dict.fromkeys(lookup_texts)), corrections)
+    
+    def _record_lookups(self, lookups):
+        for citation_result in lookups.values():
+            if citation_result is not None:
+                self._strategy_result('citation_lookup', citation_result)
+    
+    def _batch_lookups(self, text, batch, lookups):
+        """
+        A text's batched Citation Lookup result and its correction's, or None when
+        check_many must check it on its own: a case name, or beyond the
+        per-request citation limit
+        """
+        corrected = batch.corrections.get(text)
+        found = (lookups.get(text), lookups.get(corrected) if corrected is not None else None)
+        if found[0] is None or (corrected is not None and found[1] is None):
+            return None
+        return found
+    
+    def _finish_batch_item(self, text, batch, lookups, include_unpublished=False):
+        found = self._batch_lookups(text, batch, lookups)
+        if found is None:
+            return self.check_citation(text, include_unpublished)
+        citation_result, corrected_result = found
+        if text in batch.corrections:
+            result = self._finish_correction(text, batch.corrections[text], citation_result, corrected_result,
+                                             include_unpublished)
+        else:
+            result = self._continue_after_lookup(text, citation_result, include_unpublished)
+        result = self._with_reporter_suggestions(text, result)
+        self._cache_result(text, include_unpublished, result)
+        return result
+    
+    @staticmethod
+    def _batch_results(batch):
+        """check_many's results in input order, once every unique text is checked"""
+        return [batch.checked[text] for text in batch.inputs]
+    
+    def _pack_citation_lookup_chunks(self, texts):
+        """Group texts into chunks that respect the Citation Lookup API's request limits"""
+        chunk, size = [], 0
+        for text in texts:
+            added = len(text) + len(CITATION_LOOKUP_SEPARATOR)
+            if chunk and (size + added > CITATION_LOOKUP_MAX_CHARS or len(chunk) >= CITATION_LOOKUP_MAX_CITATIONS):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(text)
+            size += added
+        if chunk:
+            yield chunk
+    
+    def _check_chunk_with_citation_api(self, texts, include_unpublished=False, deadline=None):
+        """
+        Look up many citations in one Citation Lookup API call.
+        
+        Returns a dict of text -> per-item citation lookup result, shaped exactly like
+        _check_with_citation_api's, or None for texts the API declined to look up
+        (it answers 429 per citation once a request exceeds its citation limit).
+        """
+        body, spans = self._citation_lookup_body(texts)
+        try:
+            response = self._request('POST', self.citation_lookup_url, strategy='citation_lookup',
+                                     deadline=deadline, data={'text': body})
+        except requests.exceptions.RequestException as e:
+            return {text: self._citation_api_error(e) for text in texts}
+        return self._chunk_lookup_results(texts, body, spans, response, include_unpublished)
+    
+    @staticmethod
+    def _citation_lookup_body(texts):
+        """Texts joined into one Citation Lookup request body, with each text's (start, end) in it"""
+        spans = []
+        offset = 0
+        for text in texts:
+            spans.append((offset, offset + len(text)))
+            offset += len(text) + len(CITATION_LOOKUP_SEPARATOR)
+        return CITATION_LOOKUP_SEPARATOR.join(texts), spans
+    
+    def _chunk_lookup_results(self, texts, body, spans, response, include_unpublished=False):
+        """Map a batched Citation Lookup response back to per-text results (see _check_chunk_with_citation_api)"""
+        try:
+            payload = response.json() if response.status_code == 200 else None
+        except ValueError as e:
+            # A 200 that isn't JSON (a proxy or maintenance page) fails the whole chunk
+            return {text: self._citation_api_error(e) for text in texts}
+        if not isinstance(payload, list):
+            return {text: self._citation_api_result(text, response, include_unpublished) for text in texts}
+        
+        # Map each returned entry back to the input whose span contains it
+        entries = {text: [] for text in texts}
+        starts = [start for start, _ in spans]
+        cursor = 0
+        for entry in payload:
+            start = entry.get('start_index')
+            if start is None:
+                # Older responses lack offsets - locate the matched text instead
+                start = body.find(entry.get('citation', ''), cursor)
+                if start < 0:
+                    continue
+                cursor = start
+            i = bisect.bisect_right(starts, start) - 1
+            if i >= 0 and start < spans[i][1]:
+                # Re-base offsets so they point into the input rather than the packed text
+                if 'start_index' in entry:
+                    entry = dict(entry, start_index=entry['start_index'] - spans[i][0],
+                                 end_index=entry.get('end_index', start) - spans[i][0])
+                entries[texts[i]].append(entry)
+        
+        results = {}
+        for text, text_entries in entries.items():
+            if any(entry.get('status') == 429 for entry in text_entries):
+                results[text] = None
             else:
-                # Fall back to text search with warning
-                result = self._enhanced_case_name_search(citation_text, include_unpublished)
-                if result['status'] == 'invalid':
-                    result['message'] = f'No cases found for "{citation_text}". Try entering a case name (like "Smith v. Jones") or a proper citation (like "410 U.S. 113").'
-                return result
+                results[text] = self._citation_entries_result(text, text_entries, include_unpublished)
+        return results
+    
+    def extract_citations(self, text):
+        """
+        Find every volume-reporter-page citation and "X v. Y" case name in a document.
+        
+        Returns a list of dicts ordered by position, each with the character span
+        ('start', 'end'), the matched 'text', its 'kind' ('citation' or 'case_name')
+        and a canonical 'key' used to dedupe repeated references to the same case.
+        Citations also carry 'volume', 'reporter', 'page', 'pinpoint' and 'year'.
+        """
+        found = []
+        for match in DOCUMENT_CITATION_RE.finditer(text):
+            reporter = match.group('reporter').strip()
+            # Skip number-word-number runs that can't be reporters ("5 The Court 12")
+            if '.' not in reporter and not reporter.isupper():
+                continue
+            # Statutes and regulations ("42 U.S.C. 1983", "29 C.F.R. 1630") share the shape but aren't cases
+            if is_statute(reporter):
+                continue
+            volume, page = match.group('volume'), match.group('page')
+            found.append({
+                'start': match.start(),
+                'end': match.end('page'),
+                'text': text[match.start():match.end('page')],
+                'kind': 'citation',
+                'key': f"{volume} {self._normalize_reporter(reporter)} {page}",
+                'volume': volume,
+                'reporter': reporter,
+                'page': page,
+                'pinpoint': match.group('pinpoint'),
+                'year': match.group('year')
+            })
+        
+        for match in DOCUMENT_CASE_NAME_RE.finditer(text):
+            start = match.start('name')
+            name = match.group('name')
+            words = name.split()
+            # Drop leading signals ("See", "In", "Cf.") picked up by the greedy party pattern
+            while words and words[0].lower().rstrip(',') in DOCUMENT_NAME_PREFIXES:
+                start = text.index(words[1], start + len(words[0])) if len(words) > 1 else match.end()
+                words = words[1:]
+            name = text[start:match.end('name')].rstrip(' ,.') if words else ''
+            if not re.search(r'\sv(?:s)?\.?\s', name):
+                continue
+            found.append({
+                'start': start,
+                'end': start + len(name),
+                'text': name,
+                'kind': 'case_name',
+                'key': re.sub(r'\s+', ' ', name).lower()
+            })
+        
+        found.sort(key=lambda item: (item['start'], item['end']))
+        return found
+    
+    def check_document(self, text, include_unpublished=False):
+        """
+        Extract and verify every citation and case name in a document.
+        
+        Each distinct reference is verified once (citations are batched through
+        check_many), and every occurrence is annotated with the shared result.
+        
+        Returns:
+            dict with 'annotations' keyed by "start-end" span, 'results' keyed by the
+            canonical reference, and a 'summary' of status counts.
+        """
+        found, queries = self._document_queries(text)
+        results = dict(zip(queries, self.check_many(list(queries.values()), include_unpublished)))
+        return self._document_result(found, results)
+    
+    def _document_queries(self, text):
+        """Every reference found in a document, and the query checked for each distinct one"""
+        found = self.extract_citations(text)
+        queries = {}
+        for item in found:
+            queries.setdefault(item['key'], item['text'] if item['kind'] == 'case_name' else item['key'])
+        return found, queries
     
-    def _check_with_citation_api(self, citation_text, include_unpublished=False):
+    @staticmethod
+    def _document_result(found, results):
+        """check_document's answer once each distinct reference has its result"""
+        keys = list(results)
+        annotations = {}
+        summary = {'total': len(found), 'unique': len(keys), 'valid': 0, 'invalid': 0, 'uncertain': 0, 'error': 0}
+        for item in found:
+            status = results[item['key']]['status']
+            summary[status] = summary.get(status, 0) + 1
+            annotations[f"{item['start']}-{item['end']}"] = dict(item, status=status)
+        
+        return {
+            'annotations': annotations,
+            'results': results,
+            'summary': summary
+        }
+    
+    def _check_with_citation_api(self, citation_text, include_unpublished=False, deadline=None):
         """
         Use the CourtListener Citation Lookup API to validate and parse citations.
         This is the most accurate method for citation validation.
@@ -85,295 +1005,359 @@ class CitationChecker:
                 'text': citation_text
             }
             
-            response = requests.post(
+            response = self._request(
+                'POST',
                 self.citation_lookup_url, 
-                headers=self.headers, 
+                strategy='citation_lookup',
+                deadline=deadline,
                 data=data  # Use data, not json
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                
-                # The Citation Lookup API returns a list of found citations
-                if isinstance(result, list) and len(result) > 0:
-                    cases = []
-                    for citation_result in result:
-                        if citation_result.get('status') == 200 and citation_result.get('clusters'):
-                            # Get the first cluster (case) for each citation
-                            for cluster in citation_result['clusters']:
-                                # Get the primary/official citation only
-                                primary_citation = self._get_primary_citation(cluster.get('citations', []))
-                                
-                                # Get publication status from cluster
-                                precedential_status = cluster.get('precedential_status', 'unknown')
-                                court_name = cluster.get('docket', {}).get('court', 'Unknown') if isinstance(cluster.get('docket'), dict) else 'Unknown'
-                                is_published = self._is_published_status(precedential_status, court_name)
-                                
-                                # Filter out unpublished cases if not requested
-                                if not include_unpublished and not is_published:
-                                    continue
-                                
-                                case_info = {
-                                    'name': cluster.get('case_name', 'Unknown'),
-                                    'court': cluster.get('docket', {}).get('court', 'Unknown') if isinstance(cluster.get('docket'), dict) else 'Unknown',
-                                    'date': cluster.get('date_filed', 'Unknown'),
-                                    'citation': primary_citation,  # Single primary citation instead of list
-                                    'absolute_url': cluster.get('absolute_url', ''),
-                                    'citation_count': cluster.get('citation_count', 0),
-                                    'slug': cluster.get('slug', ''),
-                                    'found_citation': citation_result.get('citation', ''),
-                                    'normalized_citation': citation_result.get('normalized_citations', []),
-                                    'publication_status': precedential_status,
-                                    'is_published': is_published
-                                }
-                                cases.append(case_info)
-                    
-                    if cases:
-                        return {
-                            'status': 'valid',
-                            'message': f'Valid citation found: {citation_text}',
-                            'search_type': 'citation_lookup',
-                            'cases': cases,
-                            'total_results': len(cases),
-                            'method': 'Citation Lookup API',
-                            'raw_result': result  # For debugging
-                        }
-                
-                # No valid citations found
-                return {
-                    'status': 'invalid',
-                    'message': f'Citation not found in database: {citation_text}',
-                    'search_type': 'citation_lookup',
-                    'cases': [],
-                    'method': 'Citation Lookup API'
-                }
-            
-            elif response.status_code == 400:
-                return {
-                    'status': 'invalid',
-                    'message': f'Invalid citation format: {citation_text}',
-                    'search_type': 'citation_lookup',
-                    'cases': [],
-                    'method': 'Citation Lookup API'
-                }
-            
-            else:
-                # API error, fall back to search
-                return {
-                    'status': 'error',
-                    'message': f'Citation Lookup API error (status {response.status_code}): {response.text}',
-                    'search_type': 'citation_lookup',
-                    'cases': []
-                }
+            return self._strategy_result('citation_lookup',
+                                         self._citation_api_result(citation_text, response, include_unpublished))
                 
         except requests.exceptions.RequestException as e:
+            return self._strategy_result('citation_lookup', self._citation_api_error(e))
+    
+    def _citation_api_result(self, citation_text, response, include_unpublished=False):
+        """Turn a Citation Lookup API response into a check result"""
+        if response.status_code == 200:
+            result = response.json()
+            
+            # The Citation Lookup API returns a list of found citations
+            if not isinstance(result, list):
+                result = []
+            return self._citation_entries_result(citation_text, result, include_unpublished)
+        
+        elif response.status_code == 400:
+            return {
+                'status': 'invalid',
+                'message': f'Invalid citation format: {citation_text}',
+                'search_type': 'citation_lookup',
+                'cases': [],
+                'method': 'Citation Lookup API'
+            }
+        
+        else:
+            # API error, fall back to search
             return {
                 'status': 'error',
-                'message': f'Citation Lookup API request failed: {str(e)}',
+                'message': f'Citation Lookup API error (status {response.status_code}): {response.text}',
                 'search_type': 'citation_lookup',
                 'cases': []
             }
     
-    def _enhanced_case_name_search(self, case_name, include_unpublished=False):
+    def _citation_entries_result(self, citation_text, entries, include_unpublished=False):
+        """Build a check result from the Citation Lookup API entries for one input"""
+        cases = self._citation_lookup_cases(entries, include_unpublished)
+        
+        if cases:
+            return {
+                'status': 'valid',
+                'message': f'Valid citation found: {citation_text}',
+                'search_type': 'citation_lookup',
+                'cases': cases,
+                'total_results': len(cases),
+                'method': 'Citation Lookup API',
+                'raw_result': entries  # For debugging
+            }
+        
+        # No valid citations found
+        return {
+            'status': 'invalid',
+            'message': f'Citation not found in database: {citation_text}',
+            'search_type': 'citation_lookup',
+            'cases': [],
+            'method': 'Citation Lookup API'
+        }
+    
+    def _citation_api_error(self, error):
+        return {
+            'status': 'error',
+            'message': f'Citation Lookup API request failed: {str(error)}',
+            'search_type': 'citation_lookup',
+            'cases': []
+        }
+    
+    def _citation_lookup_cases(self, citation_results, include_unpublished=False):
+        """Build case dicts from the entries returned by the Citation Lookup API"""
+        cases = []
+        for citation_result in citation_results:
+            if citation_result.get('status') == 200 and citation_result.get('clusters'):
+                # Get the first cluster (case) for each citation
+                for cluster in citation_result['clusters']:
+                    # Get the primary/official citation only
+                    primary_citation = self._get_primary_citation(cluster.get('citations', []))
+                    
+                    # Get publication status from cluster
+                    precedential_status = cluster.get('precedential_status', 'unknown')
+                    court_name = cluster.get('docket', {}).get('court', 'Unknown') if isinstance(cluster.get('docket'), dict) else 'Unknown'
+                    is_published = self._is_published_status(precedential_status, court_name)
+                    
+                    # Filter out unpublished cases if not requested
+                    if not include_unpublished and not is_published:
+                        continue
+                    
+                    case_info = {
+                        'name': cluster.get('case_name', 'Unknown'),
+                        'court': cluster.get('docket', {}).get('court', 'Unknown') if isinstance(cluster.get('docket'), dict) else 'Unknown',
+                        'date': cluster.get('date_filed', 'Unknown'),
+                        'citation': primary_citation,  # Single primary citation instead of list
+                        'absolute_url': cluster.get('absolute_url', ''),
+                        'citation_count': cluster.get('citation_count', 0),
+                        'slug': cluster.get('slug', ''),
+                        'found_citation': citation_result.get('citation', ''),
+                        'normalized_citation': citation_result.get('normalized_citations', []),
+                        'publication_status': precedential_status,
+                        'is_published': is_published
+                    }
+                    cases.append(case_info)
+        return cases
+    
+    def _enhanced_case_name_search(self, case_name, include_unpublished=False, deadline=None):
         """
         Enhanced case name search with better filtering and date ranges.
         Based on user's friend's suggestions for using advanced operators.
         """
         try:
             # Use advanced search operators for better results
-            params = {
-                'q': f'caseName:({case_name})',  # Search specifically in case name field
-                'order_by': 'score desc',  # Best match first
-                'format': 'json'
-            }
+            params = self._case_name_search_params(case_name)
             
             # No publication filtering - get all results and let frontend handle it
             
-            print(f"DEBUG: API call params: {params}")
+            if self.parallel_case_search and self._has_time(deadline, 'enhanced_search'):
+                data = self._parallel_case_name_search(case_name, params, deadline)
+                return self._strategy_result('enhanced_search', self._case_name_search_result(case_name, data))
+            
+            logger.debug('Case name search params: %s', params)
             
-            response = requests.get(self.search_url, headers=self.headers, params=params)
+            response = self._request('GET', self.search_url, strategy='enhanced_search', deadline=deadline, params=params)
             response.raise_for_status()
             data = response.json()
             
-            print(f"DEBUG: API returned {len(data.get('results', []))} results")
-            if data.get('results'):
-                for i, result in enumerate(data.get('results', [])[:3]):
-                    print(f"  Result {i+1}: precedentialStatus='{result.get('precedentialStatus', 'MISSING')}'")
-            
-            results = data.get('results', [])
+            logger.debug('Case name search returned %d results', len(data.get('results', [])))
             
-            if not results:
+            if not data.get('results') and self._has_time(deadline, 'enhanced_search'):
                 # Try a broader search without field restriction
                 params['q'] = case_name
-                print(f"DEBUG: Broader search params: {params}")
+                logger.debug('Broader search params: %s', params)
+                self._fallback('broad_search')
                 # Keep the same publication filter for the broader search
-                response = requests.get(self.search_url, headers=self.headers, params=params)
+                response = self._request('GET', self.search_url, strategy='enhanced_search', deadline=deadline, params=params)
                 response.raise_for_status()
                 data = response.json()
-                results = data.get('results', [])
-                print(f"DEBUG: Broader search returned {len(results)} results")
+                logger.debug('Broader search returned %d results', len(data.get('results', [])))
             
-            if not results:
-                return {
-                    'status': 'invalid',
-                    'message': f'No cases found for "{case_name}"',
-                    'search_type': 'enhanced_search',
-                    'cases': [],
-                    'method': 'Enhanced Search API'
-                }
-            
-            # Format the results with publication status
-            cases = []
-            for result in results[:5]:  # Limit to top 5 results
-                # Process citations to get primary citation like Citation Lookup API
-                citations = result.get('citation', [])
-                primary_citation = self._get_primary_citation_from_search_result_list(citations)
-                
-                # Get publication status - try different possible field names
-                precedential_status = (result.get('precedential_status') or 
-                                     result.get('precedentialStatus') or 
-                                     'unknown')  # Default to unknown for missing data
-                
-                # DEBUG: Add logging to see what's happening  
-                print(f"  *** NEW CODE *** Raw precedential_status = '{precedential_status}'")
-                
-                # Get court name for publication status determination
-                court_name = result.get('court', 'Unknown')
-                
-                # Determine if published based on actual status
-                is_published = self._is_published_status(precedential_status, court_name)
-                print(f"  DEBUG: is_published = {is_published}")
-                
-                case_info = {
-                    'name': result.get('caseName', 'Unknown'),
-                    'court': result.get('court', 'Unknown'),
-                    'date': result.get('dateFiled', 'Unknown'),
-                    'citation': primary_citation,  # Single primary citation like Citation Lookup API
-                    'absolute_url': result.get('absolute_url', ''),
-                    'citation_count': result.get('citeCount', 0),
-                    'publication_status': precedential_status,
-                    'is_published': is_published
-                }
-                cases.append(case_info)
-            
-            # Deduplicate cases by name (keep the one with highest citation count)
-            cases = self._deduplicate_cases(cases)
-            
-            # Find the best match among all results
-            if cases:
-                best_match, best_similarity = self._find_best_match(case_name, cases)
-                
-                # If similarity is too low, warn the user
-                if best_similarity < 0.8:  # 80% similarity threshold
-                    return {
-                        'status': 'uncertain',
-                        'message': f'Found {len(results)} case(s), but best match differs from your input',
-                        'search_type': 'enhanced_search',
-                        'cases': cases,
-                        'total_results': data.get('count', len(results)),
-                        'note': f'Did you mean "{best_match["name"]}"? Your input was "{case_name}"',
-                        'method': 'Enhanced Search API'
-                    }
-            
-            return {
-                'status': 'valid',
-                'message': f'Found {len(results)} case(s) matching "{case_name}"',
-                'search_type': 'enhanced_search',
-                'cases': cases,
-                'total_results': data.get('count', len(results)),
-                'method': 'Enhanced Search API'
-            }
+            return self._strategy_result('enhanced_search', self._case_name_search_result(case_name, data))
             
         except requests.exceptions.RequestException as e:
+            return self._strategy_result('enhanced_search', self._case_name_search_error(e))
+    
+    def _parallel_case_name_search(self, case_name, params, deadline=None):
+        """
+        Send the fielded and broad case-name queries at the same time.
+        
+        Fielded matches keep their precedence: the broad results are used only when
+        the fielded query finds nothing, exactly as in the serial search, so a miss
+        costs one round trip instead of two. (A single OR'ed query can't do this - it
+        would mix broad matches into fielded hits.)
+        """
+        broad = self._pool('speculative', SPECULATIVE_WORKERS).submit(
+            self._case_name_search_json, dict(params, q=case_name), deadline)
+        try:
+            data = self._case_name_search_json(params, deadline)
+        except BaseException:
+            broad.cancel()
+            raise
+        if data.get('results'):
+            broad.cancel()
+            return data
+        self._fallback('broad_search')
+        return broad.result()
+    
+    def _case_name_search_json(self, params, deadline=None):
+        response = self._request('GET', self.search_url, strategy='enhanced_search', deadline=deadline, params=params)
+        response.raise_for_status()
+        return response.json()
+    
+    def _case_name_search_params(self, case_name):
+        return {
+            'q': f'caseName:({case_name})',  # Search specifically in case name field
+            'order_by': 'score desc',  # Best match first
+            'format': 'json'
+        }
+    
+    def _case_name_search_result(self, case_name, data):
+        """Rank and format Search API results for a case name query"""
+        results = data.get('results', [])
+        
+        if not results:
             return {
-                'status': 'error',
-                'message': f'Search API error: {str(e)}',
+                'status': 'invalid',
+                'message': f'No cases found for "{case_name}"',
                 'search_type': 'enhanced_search',
                 'cases': [],
                 'method': 'Enhanced Search API'
             }
+        
+        # Format the results with publication status
+        cases = []
+        results_shown = results[:5]  # Limit to top 5 results
+        # Primary citations like Citation Lookup API, picked for the whole page at once
+        primary_citations = self._primary_citations(results_shown)
+        for result, primary_citation in zip(results_shown, primary_citations):
+            
+            # Get publication status - try different possible field names
+            precedential_status = (result.get('precedential_status') or 
+                                 result.get('precedentialStatus') or 
+                                 'unknown')  # Default to unknown for missing data
+            
+            # Get court name for publication status determination
+            court_name = result.get('court', 'Unknown')
+            
+            # Determine if published based on actual status
+            is_published = self._is_published_status(precedential_status, court_name)
+            
+            case_info = {
+                'name': result.get('caseName', 'Unknown'),
+                'court': result.get('court', 'Unknown'),
+                'date': result.get('dateFiled', 'Unknown'),
+                'citation': primary_citation,  # Single primary citation like Citation Lookup API
+                'absolute_url': result.get('absolute_url', ''),
+                'citation_count': result.get('citeCount', 0),
+                'publication_status': precedential_status,
+                'is_published': is_published
+            }
+            cases.append(case_info)
+        
+        # Deduplicate cases by name (keep the one with highest citation count)
+        cases = self._deduplicate_cases(cases)
+        
+        # Find the best match among all results
+        if cases:
+            best_match, best_similarity = self._find_best_match(case_name, cases)
+            
+            # If similarity is too low, warn the user
+            if best_similarity < 0.8:  # 80% similarity threshold
+                return {
+                    'status': 'uncertain',
+                    'message': f'Found {len(results)} case(s), but best match differs from your input',
+                    'search_type': 'enhanced_search',
+                    'cases': cases,
+                    'total_results': data.get('count', len(results)),
+                    'note': f'Did you mean "{best_match["name"]}"? Your input was "{case_name}"',
+                    'method': 'Enhanced Search API'
+                }
+        
+        return {
+            'status': 'valid',
+            'message': f'Found {len(results)} case(s) matching "{case_name}"',
+            'search_type': 'enhanced_search',
+            'cases': cases,
+            'total_results': data.get('count', len(results)),
+            'method': 'Enhanced Search API'
+        }
     
-    def _search_by_citation_parts(self, citation_parts, include_unpublished=False):
+    def _case_name_search_error(self, error):
+        return {
+            'status': 'error',
+            'message': f'Search API error: {str(error)}',
+            'search_type': 'enhanced_search',
+            'cases': [],
+            'method': 'Enhanced Search API'
+        }
+    
+    def _search_by_citation_parts(self, citation_parts, include_unpublished=False, deadline=None):
         """
         Search using parsed citation components with date filtering.
         """
         try:
-            # Normalize the reporter format before searching
-            normalized_reporter = self._normalize_reporter(citation_parts['reporter'])
-            full_citation = f"{citation_parts['volume']} {normalized_reporter} {citation_parts['page']}"
-            query = f'citation:"{full_citation}"'
-            
-            params = {
-                'q': query,
-                'order_by': 'dateFiled desc',
-                'format': 'json'
-            }
+            params = self._citation_parts_params(citation_parts)
             
             # No publication filtering - get all results and let frontend handle it
             
-            response = requests.get(self.search_url, headers=self.headers, params=params)
+            response = self._request('GET', self.search_url, strategy='citation_parts', deadline=deadline, params=params)
             response.raise_for_status()
-            data = response.json()
             
-            results = data.get('results', [])
-            
-            if not results:
-                return {
-                    'status': 'invalid',
-                    'message': f'No cases found for citation: {citation_parts}',
-                    'search_type': 'citation_parts',
-                    'cases': [],
-                    'method': 'Citation Parts Search'
-                }
-            
-            # Format results to match Citation Lookup API structure
-            cases = []
-            for result in results[:3]:  # Fewer results for citation searches
-                # Get the primary citation for this case
-                primary_citation = self._get_primary_citation_from_search_result(result, citation_parts)
-                
-                # Get publication status - try different possible field names
-                precedential_status = (result.get('precedential_status') or 
-                                     result.get('precedentialStatus') or 
-                                     'unknown')  # Default to unknown for missing data
-                
-                # Get court name for publication status determination
-                court_name = result.get('court', 'Unknown')
-                
-                # Determine if published based on actual status
-                is_published = self._is_published_status(precedential_status, court_name)
-                
-                case_info = {
-                    'name': result.get('caseName', 'Unknown'),
-                    'court': result.get('court', 'Unknown'),
-                    'date': result.get('dateFiled', 'Unknown'),
-                    'citation': primary_citation,  # Single primary citation like Citation Lookup API
-                    'absolute_url': result.get('absolute_url', ''),
-                    'citation_count': result.get('citeCount', 0),
-                    'found_citation': f"{citation_parts['volume']} {citation_parts['reporter']} {citation_parts['page']}",
-                    'normalized_citation': [f"{citation_parts['volume']} {citation_parts['reporter']} {citation_parts['page']}"],
-                    'publication_status': precedential_status,
-                    'is_published': is_published
-                }
-                cases.append(case_info)
+            return self._strategy_result('citation_parts', self._citation_parts_result(citation_parts, response.json()))
             
+        except requests.exceptions.RequestException as e:
+            return self._strategy_result('citation_parts', self._citation_parts_error(e))
+    
+    def _citation_parts_params(self, citation_parts):
+        # Normalize the reporter format before searching
+        normalized_reporter = self._normalize_reporter(citation_parts['reporter'])
+        full_citation = f"{citation_parts['volume']} {normalized_reporter} {citation_parts['page']}"
+        query = f'citation:"{full_citation}"'
+        
+        return {
+            'q': query,
+            'order_by': 'dateFiled desc',
+            'format': 'json'
+        }
+    
+    def _citation_parts_result(self, citation_parts, data):
+        """Format Search API results for a volume/reporter/page query"""
+        results = data.get('results', [])
+        
+        if not results:
             return {
-                'status': 'valid',
-                'message': f'Valid citation found via search: {citation_parts["original"]}',
+                'status': 'invalid',
+                'message': f'No cases found for citation: {citation_parts}',
                 'search_type': 'citation_parts',
-                'cases': cases,
-                'total_results': len(cases),
-                'citation_parts': citation_parts,
+                'cases': [],
                 'method': 'Citation Parts Search'
             }
+        
+        # Format results to match Citation Lookup API structure
+        cases = []
+        results_shown = results[:3]  # Fewer results for citation searches
+        # Primary citation for each case, preferring the searched citation
+        primary_citations = self._primary_citations(results_shown, citation_parts)
+        for result, primary_citation in zip(results_shown, primary_citations):
             
-        except requests.exceptions.RequestException as e:
-            return {
-                'status': 'error',
-                'message': f'Citation parts search error: {str(e)}',
-                'search_type': 'citation_parts',
-                'cases': []
+            # Get publication status - try different possible field names
+            precedential_status = (result.get('precedential_status') or 
+                                 result.get('precedentialStatus') or 
+                                 'unknown')  # Default to unknown for missing data
+            
+            # Get court name for publication status determination
+            court_name = result.get('court', 'Unknown')
+            
+            # Determine if published based on actual status
+            is_published = self._is_published_status(precedential_status, court_name)
+            
+            case_info = {
+                'name': result.get('caseName', 'Unknown'),
+                'court': result.get('court', 'Unknown'),
+                'date': result.get('dateFiled', 'Unknown'),
+                'citation': primary_citation,  # Single primary citation like Citation Lookup API
+                'absolute_url': result.get('absolute_url', ''),
+                'citation_count': result.get('citeCount', 0),
+                'found_citation': f"{citation_parts['volume']} {citation_parts['reporter']} {citation_parts['page']}",
+                'normalized_citation': [f"{citation_parts['volume']} {citation_parts['reporter']} {citation_parts['page']}"],
+                'publication_status': precedential_status,
+                'is_published': is_published
             }
+            cases.append(case_info)
+        
+        return {
+            'status': 'valid',
+            'message': f'Valid citation found via search: {citation_parts["original"]}',
+            'search_type': 'citation_parts',
+            'cases': cases,
+            'total_results': len(cases),
+            'citation_parts': citation_parts,
+            'method': 'Citation Parts Search'
+        }
+    
+    def _citation_parts_error(self, error):
+        return {
+            'status': 'error',
+            'message': f'Citation parts search error: {str(error)}',
+            'search_type': 'citation_parts',
+            'cases': []
+        }
     
     def _is_published_status(self, precedential_status, court_name=None):
         """
@@ -388,22 +1372,15 @@ class CitationChecker:
         Special handling:
         - Supreme Court cases are always considered published
         """
-        print(f"    DEBUG _is_published_status: input = '{precedential_status}', court = '{court_name}'")
-        
         # Special case: Supreme Court cases are always published
         if court_name and 'supreme court' in court_name.lower():
-            print(f"    DEBUG _is_published_status: Supreme Court case, returning True")
             return True
         
         if not precedential_status:
-            print(f"    DEBUG _is_published_status: empty/None, returning False")
             return False
         
-        status = precedential_status.lower()
-        result = status in ['published', 'precedential']
-        print(f"    DEBUG _is_published_status: status = '{status}', result = {result}")
         # Only explicitly published cases are considered published
-        return result
+        return precedential_status.lower() in ['published', 'precedential']
     
     def _deduplicate_cases(self, cases):
         """
@@ -427,254 +1404,214 @@ class CitationChecker:
     
     def _looks_like_case_name(self, text):
         """Check if text looks like a case name (contains v. or v )"""
-        return bool(re.search(r'\bv\.?\s+', text, re.IGNORECASE))
+        return parse_input(text.strip()).looks_like_case_name
     
     def _looks_like_citation_format(self, text):
-        """Check if text looks like a citation format (volume reporter page)"""
-        # Pattern for: number + reporter + number (like "410 US 113", "347 U.S. 483", "623 P.2d 268")
-        citation_patterns = [
-            r'^\d+\s+[A-Za-z.]+\d+[a-z]*\s+\d+.*$',     # "623 P.2d 268", "123 F.3d 456" 
-            r'^\d+\s+[A-Za-z.]+\s+\d+.*$',              # "410 U.S. 113"
-            r'^\d+\s+[A-Za-z]+\s+\d+.*$',               # "410 US 113"
-        ]
-        
-        for pattern in citation_patterns:
-            if re.match(pattern, text.strip()):
-                return True
-        return False
+        """Check if text looks like a citation format (volume reporter page, like "410 US 113" or "623 P.2d 268")"""
+        return parse_input(text.strip()).looks_like_citation
     
     def _parse_citation_parts(self, citation):
         """
         Parse citation into volume, reporter, page components.
-        Enhanced version for better parsing.
-        """
-        # Common citation patterns
-        patterns = [
-            r'(\d+)\s+([A-Za-z.]+\d+[a-z]*)\s+(\d+)',           # "623 P.2d 268", "123 F.3d 456"
-            r'(\d+)\s+([A-Za-z.]+)\s+(\d+)',                    # "410 U.S. 113", "410 US 113"
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, citation.strip())
-            if match:
-                volume, reporter, page = match.groups()
-                return {
-                    'volume': volume.strip(),
-                    'reporter': reporter.strip(),
-                    'page': page.strip(),
-                    'original': citation
-                }
-        
-        return None
+        Multi-word reporters ("F. Supp. 2d", "Cal. 3d") are kept whole.
+        """
+        parsed = parse_input(citation.strip())
+        if not parsed.has_citation:
+            return None
+        return {
+            'volume': parsed.volume,
+            'reporter': parsed.reporter,
+            'page': parsed.page,
+            'original': citation
+        }
     
     def _normalize_reporter(self, reporter):
         """
         Normalize reporter abbreviations to standard format.
-        This helps match variations like 'us', 'US', 'U.S.' to the canonical form.
-        """
-        reporter_lower = reporter.lower()
-        
-        # Common reporter normalizations
-        normalizations = {
-            'us': 'U.S.',
-            'u.s': 'U.S.',  # Handle case where period is missing at the end
-            'sct': 'S. Ct.',
-            's.ct': 'S. Ct.',
-            'led': 'L. Ed.',
-            'l.ed': 'L. Ed.',
-            'led2d': 'L. Ed. 2d',
-            'l.ed.2d': 'L. Ed. 2d',
-            'f2d': 'F.2d',
-            'f.2d': 'F.2d',
-            'f3d': 'F.3d',
-            'f.3d': 'F.3d',
-            'fsupp': 'F. Supp.',
-            'f.supp': 'F. Supp.',
-            'fsupp2d': 'F. Supp. 2d',
-            'f.supp.2d': 'F. Supp. 2d',
-            'fsupp3d': 'F. Supp. 3d',
-            'f.supp.3d': 'F. Supp. 3d',
-            'p2d': 'P.2d',
-            'p.2d': 'P.2d',
-            'p3d': 'P.3d',
-            'p.3d': 'P.3d',
-            'cal': 'Cal.',
-            'cal2d': 'Cal. 2d',
-            'cal.2d': 'Cal. 2d',
-            'cal3d': 'Cal. 3d',
-            'cal.3d': 'Cal. 3d',
-            'cal4th': 'Cal. 4th',
-            'cal.4th': 'Cal. 4th',
-            'cal5th': 'Cal. 5th',
-            'cal.5th': 'Cal. 5th',
-        }
-        
-        # Try exact match first
-        if reporter_lower in normalizations:
-            return normalizations[reporter_lower]
-        
-        # If no exact match, return the reporter as-is but with proper capitalization
-        # Handle U.S. specially since it's the most common
-        if reporter_lower == 'u.s.':
-            return 'U.S.'
-        elif reporter_lower == 'us':
-            return 'U.S.'
-        elif reporter_lower.upper() == 'US':
-            return 'U.S.'
-        
-        # For other reporters, return as-is (they might already be in correct format)
-        return reporter
+        This helps match variations like 'us', 'US', 'U.S.' to the canonical form,
+        using the bundled reporter table (unknown reporters are returned as-is).
+        """
+        return normalize_reporter(reporter)
     
     def _calculate_similarity(self, input_text, case_name):
-        """Calculate similarity between input and found case name"""
-        # Normalize both strings for comparison
-        input_norm = input_text.lower().strip()
-        case_norm = case_name.lower().strip()
-        
-        # Remove common variations and extra punctuation
-        input_norm = re.sub(r'[^\w\s]', '', input_norm)
-        case_norm = re.sub(r'[^\w\s]', '', case_norm)
-        input_norm = re.sub(r'\s+', ' ', input_norm)
-        case_norm = re.sub(r'\s+', ' ', case_norm)
-        
-        # Check for exact match after normalization
-        if input_norm == case_norm:
-            return 1.0
-        
-        # Check if input is contained in case name (for partial matches)
-        if input_norm in case_norm:
-            # Bonus for containment, but not perfect score
-            return 0.85 + (0.15 * SequenceMatcher(None, input_norm, case_norm).ratio())
-        
-        # Calculate similarity ratio
-        return SequenceMatcher(None, input_norm, case_norm).ratio()
+        """Calculate similarity between input and found case name (see citecheck_match.Matcher)"""
+        return self.matcher.similarity(input_text, case_name)
     
     def _find_best_match(self, input_text, cases):
         """Find the best matching case from the results"""
-        if not cases:
-            return None, 0.0
-        
-        best_match = None
-        best_similarity = 0.0
+        return self._find_best_matches([input_text], cases)[0]
+    
+    def _find_best_matches(self, inputs, cases):
+        """
+        Find the best matching case for each of many inputs, as (case, similarity)
+        pairs in input order ((None, 0.0) when there are no cases).
         
-        for case in cases:
-            case_name = case['name']
-            similarity = self._calculate_similarity(input_text, case_name)
-            
-            if similarity > best_similarity:
-                best_similarity = similarity
-                best_match = case
+        The inputs are scored together against one candidate list (see
+        citecheck_match.Matcher.best_matches). The checker itself only ever matches
+        one name against the few cases its own search returned.
+        """
+        if not cases:
+            return [(None, 0.0)] * len(inputs)
         
-        return best_match, best_similarity
+        names = [case['name'] for case in cases]
+        return [(cases[index] if index is not None else None, similarity)
+                for index, similarity in self.matcher.best_matches(inputs, names)]
     
     def _get_primary_citation(self, citations):
         """Get the primary/official citation from a list of citations"""
         if not citations:
             return "No citation available"
         
-        # Priority order for reporters (official first)
-        reporter_priority = [
-            'U.S.',      # Supreme Court official
-            'Cal.',      # California official
-            'Cal. 2d',
-            'Cal. 3d', 
-            'Cal. 4th',
-            'Cal. 5th',
-            'F.3d',      # Federal courts
-            'F.2d', 
-            'F.',
-            'F. Supp. 3d',  # District courts
-            'F. Supp. 2d',
-            'F. Supp.',
-            'S. Ct.',    # Supreme Court Reporter (West)
-            'L. Ed. 2d', # Lawyer's Edition
-            'L. Ed.',
-            'P.2d',      # Pacific Reporter (lower priority than state official)
-            'P.3d'
-        ]
-        
-        # First, try to find citations by priority order
-        for priority_reporter in reporter_priority:
-            for cit in citations:
-                if cit.get('reporter') == priority_reporter and cit.get('volume'):
-                    return f"{cit.get('volume')} {cit.get('reporter')} {cit.get('page', '')}"
-        
-        # If no priority reporter found, return the first available citation
+        # One pass: keep the citation whose reporter ranks best (official first);
+        # among equals, and for reporters outside the table, the first one wins
+        best, best_rank = None, None
         for cit in citations:
             if cit.get('volume') and cit.get('reporter'):
-                return f"{cit.get('volume')} {cit.get('reporter')} {cit.get('page', '')}"
+                rank = reporter_rank(cit['reporter'])
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = cit, rank
         
-        return "Citation format unavailable"
+        if best is None:
+            return "Citation format unavailable"
+        return f"{best.get('volume')} {best.get('reporter')} {best.get('page', '')}"
+    
+    def _primary_citations(self, results, citation_parts=None):
+        """
+        Primary citation for every search result in one pass over the result set.
+        
+        Citation strings are split once (and cached across calls) and ranked with
+        the precomputed reporter ranks. With citation_parts, a result listing the
+        searched citation gets exactly that citation back.
+        """
+        searched = None
+        if citation_parts:
+            searched = f"{citation_parts['volume']} {citation_parts['reporter']} {citation_parts['page']}"
+        
+        primaries = []
+        for result in results:
+            citations = result.get('citation', [])
+            if not citations:
+                # Without citations, a citation search falls back to what was searched for
+                primaries.append(searched or "No citation available")
+                continue
+            if searched is not None and searched in citations:
+                primaries.append(searched)
+                continue
+            
+            best, best_rank = None, None
+            if isinstance(citations, list):
+                for text in citations:
+                    parts = split_citation(text)
+                    if parts is not None:
+                        rank = reporter_rank(parts[1])
+                        if best_rank is None or rank < best_rank:
+                            best, best_rank = parts, rank
+            primaries.append(' '.join(best) if best else "No citation available")
+        return primaries
     
     def _get_primary_citation_from_search_result(self, result, citation_parts):
         """Get the primary citation from a search result, preferring the searched citation if available"""
-        citations = result.get('citation', [])
-        
-        if not citations:
-            # If no citations in result, return the searched citation
-            return f"{citation_parts['volume']} {citation_parts['reporter']} {citation_parts['page']}"
-        
-        # Convert citation strings to a format we can parse
-        citation_list = []
-        if isinstance(citations, list):
-            for cit_str in citations:
-                # Parse citations like "623 P.2d 268" from the citation strings
-                parts = cit_str.strip().split()
-                if len(parts) >= 3:
-                    citation_list.append({
-                        'volume': parts[0],
-                        'reporter': ' '.join(parts[1:-1]), 
-                        'page': parts[-1]
-                    })
-        
-        # First, check if our searched citation exists in the results
-        search_citation = f"{citation_parts['volume']} {citation_parts['reporter']} {citation_parts['page']}"
-        if search_citation in citations:
-            return search_citation
-        
-        # Otherwise, use the primary citation logic
-        return self._get_primary_citation(citation_list)
+        return self._primary_citations([result], citation_parts)[0]
     
     def _get_primary_citation_from_search_result_list(self, citations):
         """Get the primary citation from a list of citation strings from search results"""
-        if not citations:
-            return "No citation available"
-        
-        # Convert citation strings to a format we can parse
-        citation_list = []
-        if isinstance(citations, list):
-            for cit_str in citations:
-                # Parse citations like "384 U.S. 436" from the citation strings
-                parts = cit_str.strip().split()
-                if len(parts) >= 3:
-                    citation_list.append({
-                        'volume': parts[0],
-                        'reporter': ' '.join(parts[1:-1]), 
-                        'page': parts[-1]
-                    })
-        
-        # Use the primary citation logic
-        return self._get_primary_citation(citation_list)
+        return self._primary_citations([{'citation': citations}])[0]
 
-@click.command()
-@click.argument('citation')
-def main(citation: str):
+def _echo_document_result(text, result):
+    """Print a document check as one line per citation found"""
+    summary = result['summary']
+    click.echo(f"Found {summary['total']} reference(s), {summary['unique']} unique:")
+    click.echo()
+    
+    icons = {'valid': '✅', 'invalid': '❌', 'uncertain': '⚠️ ', 'error': '❗'}
+    for annotation in result['annotations'].values():
+        check = result['results'][annotation['key']]
+        line = f"{icons.get(annotation['status'], '?')} [{annotation['start']}-{annotation['end']}] {annotation['text']}"
+        if check.get('cases'):
+            line += f" -> {check['cases'][0]['name']}"
+        click.echo(line)
+    
+    click.echo()
+    click.echo(f"Valid: {summary['valid']}  Invalid: {summary['invalid']}  "
+               f"Uncertain: {summary['uncertain']}  Errors: {summary['error']}")
+
+class DefaultCommandGroup(click.Group):
+    """Click group that runs a default command when the first argument isn't a subcommand"""
+    
+    def __init__(self, *args, default_command='check', **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+    
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = [self.default_command] + list(args)
+        return super().parse_args(ctx, args)
+
+@click.group(cls=DefaultCommandGroup)
+def main():
     """
     Check a legal case name using the CourtListener database.
     
+    \b
     Examples:
         citecheck.py "Roe v. Wade"
         citecheck.py "Brown v. Board of Education"  
         citecheck.py "Miranda v. Arizona"
+        citecheck.py --deadline 2.5 "410 U.S. 113"
+        citecheck.py --document - < brief.txt
+        citecheck.py cache prune
+        citecheck.py index build --citations citations.csv.bz2 --clusters clusters.csv.bz2 -o cl.idx
+        citecheck.py index filter --citations citations.csv.bz2 -o citations.bloom
     """
+
+def _open_disk_cache(cache_db, negative=False):
+    from citecheck_cache import SQLiteResultCache, cache_ttl
+    if negative:
+        return SQLiteResultCache(cache_db, ttl=cache_ttl(negative=True), namespace='negative')
+    return SQLiteResultCache(cache_db, ttl=cache_ttl())
+
+@main.command()
+@click.argument('citation')
+@click.option('--document', '-d', is_flag=True,
+              help='Treat the input as a whole document and check every citation in it (use "-" to read stdin)')
+@click.option('--cache-db', envvar='CITECHECK_CACHE_DB', type=click.Path(dir_okay=False),
+              help='SQLite file caching results across runs (default: $CITECHECK_CACHE_DB)')
+@click.option('--deadline', type=click.FloatRange(min=0, min_open=True),
+              help='Give up on slower lookups after this many seconds and show the best partial result')
+@click.option('--index', 'index_path', envvar='CITECHECK_INDEX', type=click.Path(dir_okay=False, exists=True),
+              help='Offline citation index to consult before CourtListener (default: $CITECHECK_INDEX)')
+@click.option('--filter', 'filter_path', envvar='CITECHECK_FILTER', type=click.Path(dir_okay=False, exists=True),
+              help='Citation filter that rules out unknown citations locally (default: $CITECHECK_FILTER)')
+@click.option('--verbose', '-v', is_flag=True, help='Log upstream queries and results to stderr')
+def check(citation: str, document: bool, cache_db: Optional[str], deadline: Optional[float],
+          index_path: Optional[str], filter_path: Optional[str], verbose: bool):
+    """Check a citation or case name (the default command)."""
+    if document and deadline is not None:
+        raise click.UsageError('--deadline applies to a single citation, not --document')
+    if verbose:
+        logging.basicConfig(level=logging.DEBUG, format='%(levelname)s %(name)s: %(message)s')
     try:
-        checker = CitationChecker()
+        checker = CitationChecker(
+            cache=_open_disk_cache(cache_db) if cache_db else None,
+            negative_cache=_open_disk_cache(cache_db, negative=True) if cache_db else None,
+            offline_index=OfflineIndex(index_path) if index_path else None,
+            citation_filter=CitationFilter(filter_path) if filter_path else None
+        )
+        
+        if document:
+            text = sys.stdin.read() if citation == '-' else citation
+            _echo_document_result(text, checker.check_document(text))
+            return
         
         click.echo(f"Checking: {citation}")
         click.echo("-" * 50)
         
         # Check the citation
-        result = checker.check_citation(citation)
+        result = checker.check_citation(citation, deadline=deadline)
+        
+        if result.get('degraded'):
+            click.echo(f"⚠️  Partial result: the {deadline}s deadline ran out before "
+                       f"{', '.join(result['missed_strategies'])} finished")
         
         if result['status'] == 'error':
             click.echo(f"Error: {result['message']}")
@@ -710,6 +1647,8 @@ def main(citation: str):
         elif result['status'] == 'invalid':
             click.echo(f"❌ {result['message']}")
             click.echo(f"Method: {result.get('method', 'Unknown')}")
+            if result.get('note'):
+                click.echo(f"\nNote: {result['note']}")
         elif result['status'] == 'uncertain':
             click.echo(f"⚠️  Citation format is valid, but found {result['total_results']} general results:")
             click.echo(f"Method: {result.get('method', 'Unknown')}")
@@ -727,6 +1666,64 @@ def main(citation: str):
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
 
+@main.group()
+def cache():
+    """Maintain the on-disk result cache."""
+
+@cache.command()
+@click.option('--cache-db', envvar='CITECHECK_CACHE_DB', required=True, type=click.Path(dir_okay=False),
+              help='SQLite cache file (default: $CITECHECK_CACHE_DB)')
+@click.option('--vacuum', is_flag=True, help='Also compact the database file afterwards')
+def prune(cache_db: str, vacuum: bool):
+    """Delete expired entries from the on-disk cache."""
+    disk_cache = _open_disk_cache(cache_db)
+    removed = disk_cache.vacuum() if vacuum else disk_cache.prune()
+    stats = disk_cache.stats()
+    click.echo(f"Removed {removed} expired entr{'y' if removed == 1 else 'ies'}; "
+               f"{stats['size']} remain ({stats['file_bytes'] / 1024:.0f} KiB)")
+
+@cache.command()
+@click.option('--cache-db', envvar='CITECHECK_CACHE_DB', required=True, type=click.Path(dir_okay=False),
+              help='SQLite cache file (default: $CITECHECK_CACHE_DB)')
+def stats(cache_db: str):
+    """Show on-disk cache size and expiry counts."""
+    for name, value in _open_disk_cache(cache_db).stats().items():
+        click.echo(f"{name}: {value}")
+
+@main.group()
+def index():
+    """Build the offline citation index and filter."""
+
+@index.command()
+@click.option('--citations', 'citations_csv', required=True, type=click.Path(dir_okay=False, exists=True),
+              help='CourtListener bulk citations export (.csv, .csv.bz2 or .csv.gz)')
+@click.option('--clusters', 'clusters_csv', required=True, type=click.Path(dir_okay=False, exists=True),
+              help='CourtListener bulk opinion clusters export')
+@click.option('--dockets', 'dockets_csv', type=click.Path(dir_okay=False, exists=True),
+              help='CourtListener bulk dockets export, to fill in courts')
+@click.option('--output', '-o', envvar='CITECHECK_INDEX', required=True, type=click.Path(dir_okay=False),
+              help='Index file to write (default: $CITECHECK_INDEX)')
+def build(citations_csv: str, clusters_csv: str, dockets_csv: Optional[str], output: str):
+    """Build the offline index from CourtListener bulk data."""
+    stats = build_index(citations_csv, clusters_csv, output, dockets_csv=dockets_csv)
+    click.echo(f"Indexed {stats['citations']} citation(s) of {stats['clusters']} case(s) "
+               f"into {output} ({stats['bytes'] / 1024:.0f} KiB)")
+
+@index.command(name='filter')
+@click.option('--citations', 'citations_csv', required=True, type=click.Path(dir_okay=False, exists=True),
+              help='CourtListener bulk citations export (.csv, .csv.bz2 or .csv.gz)')
+@click.option('--output', '-o', envvar='CITECHECK_FILTER', required=True, type=click.Path(dir_okay=False),
+              help='Filter file to write (default: $CITECHECK_FILTER)')
+@click.option('--false-positive-rate', default=DEFAULT_FALSE_POSITIVE_RATE, show_default=True,
+              type=click.FloatRange(min=0, max=1, min_open=True, max_open=True),
+              help='Chance that a citation which does not exist still passes the filter')
+def build_citation_filter(citations_csv: str, output: str, false_positive_rate: float):
+    """Build the citation filter from CourtListener bulk data."""
+    stats = build_filter(citations_csv, output, false_positive_rate=false_positive_rate)
+    click.echo(f"Filtered {stats['citations']} citation(s) in {stats['reporters']} reporter(s) into {output} "
+               f"({stats['bytes'] / 1024:.0f} KiB, {stats['hashes']} hashes, "
+               f"{false_positive_rate:.2%} false positives)")
+
 def test_citations():
     """Test function for debugging"""
     api_key = os.getenv('COURTLISTENER_API_KEY')
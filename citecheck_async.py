@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Async Citation Checker
+asyncio version of CitationChecker for driving many concurrent lookups from one process
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from citecheck import CitationChecker
+from citecheck_transport import RETRYABLE_STATUSES, Deadline
+
+
+class AsyncCitationChecker(CitationChecker):
+    """
+    Non-blocking CitationChecker built on httpx.AsyncClient.
+
+    Runs the same strategy pipeline as CitationChecker.check_citation
+    (citation lookup, then citation-parts search, then case-name search) and
+    returns the same result dicts; only the HTTP calls are awaited. At most
+    max_concurrency upstream requests are in flight at once.
+
+    Usage:
+        async with AsyncCitationChecker(api_key) as checker:
+            results = await checker.check_many(["410 U.S. 113", "Roe v. Wade"])
+    """
+
+    def __init__(self, api_key=None, client=None, max_concurrency=20, base_url=None,
+                 cache=None, negative_cache=None, single_flight=None, rate_limiter=None,
+                 max_rate_limit_wait=60.0, transport_policies=None, speculative=False,
+                 parallel_case_search=False, matcher=None, offline_index=None, citation_filter=None,
+                 local_stats=None, metrics=None):
+        """
+        Args:
+            api_key (str): CourtListener API token (default: COURTLISTENER_API_KEY)
+            client (httpx.AsyncClient): Shared client to reuse; one is created if omitted
+            max_concurrency (int): Maximum number of upstream requests in flight
+            base_url (str): CourtListener base URL, overridable for local testing
+            cache (ResultCache): Result cache to consult before calling CourtListener
+            negative_cache (ResultCache): Shorter-lived cache of "invalid" outcomes
+            single_flight (AsyncSingleFlight): Coalesces concurrent checks of the same input
+            rate_limiter (RateLimiter): Per-key scheduler every upstream request waits on
+            max_rate_limit_wait (float): Longest Retry-After we will queue for before giving up
+            transport_policies (dict): TransportPolicy overrides keyed by strategy
+            speculative (bool): Start the citation-parts search alongside the Citation Lookup API
+            parallel_case_search (bool): Send the fielded and broad case-name queries together
+            matcher (Matcher): Case-name scorer (default: rapidfuzz-backed when installed)
+            offline_index (OfflineIndex): Local exact-citation index consulted before any HTTP call
+            citation_filter (CitationFilter): Bloom filter of known citations (see CitationChecker)
+            local_stats (LocalAnswerStats): Shared tally of checks answered without CourtListener
+            metrics (CheckerMetrics): Shared latency histograms and outcome counters
+        """
+        self._configure(api_key, base_url, cache=cache, negative_cache=negative_cache,
+                        single_flight=single_flight, rate_limiter=rate_limiter,
+                        max_rate_limit_wait=max_rate_limit_wait, transport_policies=transport_policies,
+                        speculative=speculative, parallel_case_search=parallel_case_search,
+                        matcher=matcher, offline_index=offline_index, citation_filter=citation_filter,
+                        local_stats=local_stats, metrics=metrics)
+        self.max_concurrency = max_concurrency
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+        )
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Release pooled connections (only if this checker created the client)"""
+        if self._owns_client:
+            await self.client.aclose()
+
+    def close(self):
+        raise TypeError("AsyncCitationChecker must be closed with 'await checker.aclose()'")
+
+    @property
+    def semaphore(self):
+        # Created on first use so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _request(self, method, url, strategy=None, deadline=None, **kwargs):
+        """Async counterpart of CitationChecker._request: scheduled, retried, hedged, queued on 429, measured"""
+        start = time.monotonic()
+        status = 'error'
+        try:
+            response = await self._request_with_retries(method, url, strategy, deadline, **kwargs)
+            status = response.status_code
+            return response
+        except asyncio.CancelledError:
+            # A speculative request that lost its race
+            status = 'cancelled'
+            raise
+        finally:
+            self._record_upstream(strategy, status, time.monotonic() - start)
+
+    async def _request_with_retries(self, method, url, strategy=None, deadline=None, **kwargs):
+        policy = self._transport_policy(strategy)
+        attempt = throttled = 0
+        while True:
+            try:
+                if deadline is not None and deadline.expired():
+                    raise httpx.TimeoutException(f'Deadline of {deadline.seconds}s exceeded')
+                response = await self._send(method, url, policy, deadline, **kwargs)
+            except httpx.TransportError:
+                if deadline is not None and deadline.expired():
+                    deadline.miss(strategy)
+                    raise
+                if not policy.can_retry(method, attempt):
+                    raise
+                await self._sleep_within(policy.backoff_delay(attempt), deadline)
+                attempt += 1
+                continue
+
+            delay = self._rate_limit_delay(response, throttled)
+            if delay is not None and self._fits(delay, deadline):
+                await asyncio.sleep(delay)
+                throttled += 1
+            elif (response.status_code in RETRYABLE_STATUSES and policy.can_retry(method, attempt)
+                  and not (deadline is not None and deadline.expired())):
+                await self._sleep_within(policy.backoff_delay(attempt), deadline)
+                attempt += 1
+            else:
+                return response
+
+    @staticmethod
+    async def _sleep_within(delay, deadline):
+        await asyncio.sleep(delay if deadline is None else min(delay, deadline.remaining()))
+
+    async def _send_once(self, method, url, policy, deadline=None, **kwargs):
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.bucket(self.api_key).reserve()
+            if not self._fits(wait, deadline):
+                raise httpx.TimeoutException(f'Deadline of {deadline.seconds}s exceeded waiting for the rate limiter')
+            if wait > 0:
+                await asyncio.sleep(wait)
+        async with self.semaphore:
+            connect, read = policy.timeout if deadline is None else deadline.timeout(policy)
+            start = time.monotonic()
+            response = await self.client.request(method, url, headers=self.headers,
+                                                 timeout=httpx.Timeout(read, connect=connect), **kwargs)
+        policy.latency.record(time.monotonic() - start)
+        return response
+
+    async def _send(self, method, url, policy, deadline=None, **kwargs):
+        """Send a request, hedging it with a duplicate if it outlives the policy's hedge delay"""
+        hedge_delay = policy.hedge_delay(method)
+        if hedge_delay is None or not self._fits(hedge_delay, deadline):
+            return await self._send_once(method, url, policy, deadline, **kwargs)
+
+        pending = {asyncio.ensure_future(self._send_once(method, url, policy, deadline, **kwargs))}
+        done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+        if not done:
+            pending.add(asyncio.ensure_future(self._send_once(method, url, policy, deadline, **kwargs)))
+
+        # First successful answer wins; the loser is cancelled
+        error = None
+        try:
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _get(self, url, params, strategy, deadline=None):
+        response = await self._request('GET', url, strategy=strategy, deadline=deadline, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def _post(self, url, data, strategy, deadline=None):
+        return await self._request('POST', url, strategy=strategy, deadline=deadline, data=data)
+
+    async def check_citation(self, citation_text, include_unpublished=False, deadline=None):
+        """
+        Async counterpart of CitationChecker.check_citation with the same fallback chain.
+
+        Args:
+            citation_text (str): The citation or case name to search for
+            include_unpublished (bool): Whether to include unpublished opinions (default: False)
+            deadline (float): Total seconds to spend on upstream calls (see CitationChecker.check_citation)
+        """
+        citation_text = citation_text.strip()
+
+        cached = self._cached_result(citation_text, include_unpublished)
+        if cached is not None:
+            return cached
+
+        local = self._local_result(citation_text, include_unpublished)
+        if local is not None:
+            return local
+
+        if deadline is not None:
+            deadline = Deadline(deadline)
+
+        if self.single_flight is None:
+            return await self._check_and_cache(citation_text, include_unpublished, deadline)
+
+        # Concurrent callers checking the same input share one upstream operation
+        result, shared = await self.single_flight.do(
+            self.cache_key(citation_text, include_unpublished),
+            lambda: self._check_and_cache(citation_text, include_unpublished, deadline)
+        )
+        if shared:
+            self.metrics.coalesced.inc()
+        if shared and self._should_recheck(result, deadline):
+            # The leader's failure may be specific to it (e.g. its API key or deadline) - try our own
+            result = await self._check_and_cache(citation_text, include_unpublished, deadline)
+        return result
+
+    async def _check_and_cache(self, citation_text, include_unpublished=False, deadline=None):
+        result = self._with_reporter_suggestions(
+            citation_text, await self._check_uncached(citation_text, include_unpublished, deadline))
+        if deadline is not None and deadline.missed:
+            # A partial answer is returned as-is but never cached
+            return dict(result, degraded=True, missed_strategies=list(deadline.missed))
+        self._cache_result(citation_text, include_unpublished, result)
+        return result
+
+    async def _check_uncached(self, citation_text, include_unpublished=False, deadline=None):
+        corrected = self._corrected_citation(citation_text)
+        if corrected is not None:
+            return await self._check_with_correction(citation_text, corrected, include_unpublished, deadline)
+        # First, try the Citation Lookup API if it looks like a citation format
+        if self._looks_like_citation_format(citation_text):
+            parsed_citation = self._parse_citation_parts(citation_text) if self.speculative else None
+            if parsed_citation and self._has_time(deadline, 'citation_lookup'):
+                return await self._speculative_lookup(citation_text, parsed_citation, include_unpublished, deadline)
+            if self._has_time(deadline, 'citation_lookup'):
+                citation_result = await self._check_with_citation_api(citation_text, include_unpublished, deadline)
+            else:
+                citation_result = self._deadline_result(citation_text, deadline)
+            return await self._continue_after_lookup(citation_text, citation_result, include_unpublished, deadline)
+        return await self._search_fallbacks(citation_text, include_unpublished, deadline)
+
+    async def _continue_after_lookup(self, citation_text, citation_result, include_unpublished=False, deadline=None):
+        """Async counterpart of CitationChecker._continue_after_lookup"""
+        if citation_result['status'] == 'valid':
+            return citation_result
+        elif citation_result['status'] == 'invalid':
+            # Citation Lookup API couldn't find it - try targeted citation search
+            parsed_citation = self._parse_citation_parts(citation_text)
+            if parsed_citation and self._has_time(deadline, 'citation_parts'):
+                self._fallback('citation_parts')
+                fallback_result = await self._search_by_citation_parts(parsed_citation, include_unpublished, deadline)
+                if fallback_result['status'] == 'valid':
+                    return fallback_result
+            # If targeted search also fails, return the original citation lookup result
+            return citation_result
+
+        # API error - continue with fallbacks
+        return await self._search_fallbacks(citation_text, include_unpublished, deadline, partial=citation_result)
+
+    async def _search_fallbacks(self, citation_text, include_unpublished=False, deadline=None, partial=None):
+        """Async counterpart of CitationChecker._search_fallbacks"""
+        looks_like_case_name = self._looks_like_case_name(citation_text)
+        parsed_citation = None if looks_like_case_name else self._parse_citation_parts(citation_text)
+
+        strategy = 'citation_parts' if parsed_citation else 'enhanced_search'
+        if not self._has_time(deadline, strategy):
+            return partial or self._deadline_result(citation_text, deadline)
+        if partial is not None:
+            self._fallback(strategy)
+
+        if looks_like_case_name:
+            return await self._enhanced_case_name_search(citation_text, include_unpublished, deadline)
+        if parsed_citation:
+            return await self._search_by_citation_parts(parsed_citation, include_unpublished, deadline)
+
+        # Fall back to text search with warning
+        result = await self._enhanced_case_name_search(citation_text, include_unpublished, deadline)
+        if result['status'] == 'invalid':
+            result['message'] = f'No cases found for "{citation_text}". Try entering a case name (like "Smith v. Jones") or a proper citation (like "410 U.S. 113").'
+        return result
+
+    async def _speculative_lookup(self, citation_text, parsed_citation, include_unpublished=False, deadline=None):
+        """Async counterpart of CitationChecker._speculative_lookup; the losing search is cancelled"""
+        search = asyncio.ensure_future(self._search_by_citation_parts(parsed_citation, include_unpublished, deadline))
+        try:
+            citation_result = await self._check_with_citation_api(citation_text, include_unpublished, deadline)
+        except BaseException:
+            search.cancel()
+            raise
+        if citation_result['status'] == 'valid':
+            search.cancel()
+            return citation_result
+
+        fallback_result = await search
+        if citation_result['status'] == 'invalid':
+            return fallback_result if fallback_result['status'] == 'valid' else citation_result
+        if self._looks_like_case_name(citation_text):
+            return await self._search_fallbacks(citation_text, include_unpublished, deadline, partial=citation_result)
+        return fallback_result
+
+    async def check_many(self, citations, include_unpublished=False):
+        """
+        Async counterpart of CitationChecker.check_many: citations are packed into the
+        same shared Citation Lookup requests (sent concurrently), and the per-item
+        fallbacks and case-name checks then run concurrently. Results are in input order.
+        """
+        batch = self._plan_batch(citations, include_unpublished)
+
+        # Inputs the batched lookup won't cover start right away, alongside the lookup chunks
+        pending = {text: asyncio.ensure_future(self.check_citation(text, include_unpublished))
+                   for text in batch.unique if text not in batch.checked and text not in batch.lookup_texts}
+        chunks = list(self._pack_citation_lookup_chunks(batch.lookup_texts))
+        lookups = {}
+        for results in await asyncio.gather(*(
+            self._check_chunk_with_citation_api(chunk, include_unpublished) for chunk in chunks
+        )):
+            lookups.update(results)
+        self._record_lookups(lookups)
+
+        for text in batch.unique:
+            if text not in batch.checked and text not in pending:
+                pending[text] = asyncio.ensure_future(self._finish_batch_item(text, batch, lookups, include_unpublished))
+
+        batch.checked.update(zip(pending, await asyncio.gather(*pending.values())))
+        return self._batch_results(batch)
+
+    async def _finish_batch_item(self, text, batch, lookups, include_unpublished=False):
+        """Async counterpart of CitationChecker._finish_batch_item"""
+        found = self._batch_lookups(text, batch, lookups)
+        if found is None:
+            return await self.check_citation(text, include_unpublished)
+        citation_result, corrected_result = found
+        if text in batch.corrections:
+            result = await self._finish_correction(text, batch.corrections[text], citation_result, corrected_result,
+                                                   include_unpublished)
+        else:
+            result = await self._continue_after_lookup(text, citation_result, include_unpublished)
+        result = self._with_reporter_suggestions(text, result)
+        self._cache_result(text, include_unpublished, result)
+        return result
+
+    async def _check_with_correction(self, citation_text, corrected, include_unpublished=False, deadline=None):
+        """Async counterpart of CitationChecker._check_with_correction"""
+        if not self._has_time(deadline, 'citation_lookup'):
+            citation_result = self._deadline_result(citation_text, deadline)
+            return await self._continue_after_lookup(citation_text, citation_result, include_unpublished, deadline)
+        lookups = await self._check_chunk_with_citation_api([citation_text, corrected], include_unpublished, deadline)
+        self._record_lookups(lookups)
+        return await self._finish_correction(citation_text, corrected, lookups[citation_text], lookups[corrected],
+                                             include_unpublished, deadline)
+
+    async def _finish_correction(self, citation_text, corrected, citation_result, corrected_result,
+                                 include_unpublished=False, deadline=None):
+        """Async counterpart of CitationChecker._finish_correction"""
+        if citation_result['status'] != 'invalid':
+            return await self._continue_after_lookup(citation_text, citation_result, include_unpublished, deadline)
+        corrected_result = await self._continue_after_lookup(corrected, corrected_result, include_unpublished, deadline)
+        if corrected_result['status'] != 'valid':
+            return citation_result
+        self._cache_result(corrected, include_unpublished, corrected_result)
+        return self._correction_result(citation_text, corrected, corrected_result)
+
+    async def _check_chunk_with_citation_api(self, texts, include_unpublished=False, deadline=None):
+        """Async counterpart of CitationChecker._check_chunk_with_citation_api"""
+        body, spans = self._citation_lookup_body(texts)
+        try:
+            response = await self._post(self.citation_lookup_url, {'text': body}, 'citation_lookup', deadline)
+        except httpx.HTTPError as e:
+            return {text: self._citation_api_error(e) for text in texts}
+        return self._chunk_lookup_results(texts, body, spans, response, include_unpublished)
+
+    async def check_document(self, text, include_unpublished=False):
+        """Async counterpart of CitationChecker.check_document"""
+        found, queries = self._document_queries(text)
+        results = dict(zip(queries, await self.check_many(list(queries.values()), include_unpublished)))
+        return self._document_result(found, results)
+
+    async def _check_with_citation_api(self, citation_text, include_unpublished=False, deadline=None):
+        try:
+            response = await self._post(self.citation_lookup_url, {'text': citation_text}, 'citation_lookup', deadline)
+            return self._strategy_result('citation_lookup',
+                                         self._citation_api_result(citation_text, response, include_unpublished))
+        except (httpx.HTTPError, ValueError) as e:
+            return self._strategy_result('citation_lookup', self._citation_api_error(e))
+
+    async def _enhanced_case_name_search(self, case_name, include_unpublished=False, deadline=None):
+        try:
+            params = self._case_name_search_params(case_name)
+            if self.parallel_case_search and self._has_time(deadline, 'enhanced_search'):
+                data = await self._parallel_case_name_search(case_name, params, deadline)
+                return self._strategy_result('enhanced_search', self._case_name_search_result(case_name, data))
+            data = await self._get(self.search_url, params, 'enhanced_search', deadline)
+            if not data.get('results') and self._has_time(deadline, 'enhanced_search'):
+                # Try a broader search without field restriction
+                params['q'] = case_name
+                self._fallback('broad_search')
+                data = await self._get(self.search_url, params, 'enhanced_search', deadline)
+            return self._strategy_result('enhanced_search', self._case_name_search_result(case_name, data))
+        except (httpx.HTTPError, ValueError) as e:
+            return self._strategy_result('enhanced_search', self._case_name_search_error(e))
+
+    async def _parallel_case_name_search(self, case_name, params, deadline=None):
+        """Async counterpart of CitationChecker._parallel_case_name_search; an unneeded broad query is cancelled"""
+        broad = asyncio.ensure_future(self._get(self.search_url, dict(params, q=case_name), 'enhanced_search', deadline))
+        try:
+            data = await self._get(self.search_url, params, 'enhanced_search', deadline)
+        except BaseException:
+            broad.cancel()
+            raise
+        if data.get('results'):
+            broad.cancel()
+            return data
+        self._fallback('broad_search')
+        return await broad
+
+    async def _search_by_citation_parts(self, citation_parts, include_unpublished=False, deadline=None):
+        try:
+            params = self._citation_parts_params(citation_parts)
+            data = await self._get(self.search_url, params, 'citation_parts', deadline)
+            return self._strategy_result('citation_parts', self._citation_parts_result(citation_parts, data))
+        except (httpx.HTTPError, ValueError) as e:
+            return self._strategy_result('citation_parts', self._citation_parts_error(e))
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Citation Checker Caches
+Result caches and request coalescing that let CitationChecker skip redundant CourtListener calls
+"""
+
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+# How long shared check results stay fresh, for the web app and CLI alike, since
+# both read and write the same SQLite file; CITECHECK_CACHE_TTL overrides it
+DEFAULT_CACHE_TTL = 24 * 3600
+# "Not found" results expire sooner (CITECHECK_NEGATIVE_CACHE_TTL)
+DEFAULT_NEGATIVE_CACHE_TTL = 3600
+
+
+def cache_ttl(negative=False):
+    """Configured TTL in seconds for positive (or negative) results"""
+    if negative:
+        return float(os.environ.get('CITECHECK_NEGATIVE_CACHE_TTL', DEFAULT_NEGATIVE_CACHE_TTL))
+    return float(os.environ.get('CITECHECK_CACHE_TTL', DEFAULT_CACHE_TTL))
+
+
+class ResultCache:
+    """
+    Thread-safe in-memory cache of check results with LRU eviction and a TTL.
+
+    One instance can be shared by every CitationChecker in a process. Values are
+    deep-copied on the way in and out so callers can't mutate cached results.
+    """
+
+    def __init__(self, max_size=1024, ttl=3600, clock=time.monotonic):
+        """
+        Args:
+            max_size (int): Maximum number of entries before the least recently used is evicted
+            ttl (float): Seconds an entry stays fresh
+            clock (callable): Time source, injectable for tests
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        """Return a copy of the cached value for key, or None if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def set(self, key, value, ttl=None):
+        """Store a copy of value under key for ttl seconds (default: the cache's TTL)"""
+        value = copy.deepcopy(value)
+        expires_at = self.clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop one entry; returns True if it was cached"""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        """Counters for monitoring: hits, misses, evictions, expirations and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class SQLiteResultCache:
+    """
+    Persistent check-result cache in a SQLite database, shared between processes.
+
+    The database runs in WAL mode so the CLI and every gunicorn worker can read
+    while one of them writes. Payloads are compact JSON compressed with zlib, and
+    every row carries its own expiry time; expired rows are ignored on read and
+    removed by prune(). Each thread (and each forked process) gets its own
+    connection. Several caches can share one file under different namespaces.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS results (
+            key TEXT PRIMARY KEY,
+            expires_at REAL NOT NULL,
+            payload BLOB NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS results_expires_at ON results (expires_at);
+    """
+
+    def __init__(self, path, ttl=DEFAULT_CACHE_TTL, busy_timeout=5.0, namespace=''):
+        """
+        Args:
+            path (str): Database file; created on first use
+            ttl (float): Seconds an entry stays fresh
+            busy_timeout (float): Seconds to wait for another process's write lock
+            namespace (str): Key prefix separating caches that share the file
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.executescript(self.SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _key(self, key):
+        key = key if isinstance(key, str) else json.dumps(key, separators=(',', ':'))
+        return f'{self.namespace}:{key}' if self.namespace else key
+
+    @staticmethod
+    def _dump(value):
+        return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+    @staticmethod
+    def _load(payload):
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def get(self, key):
+        """Return the cached value for key, or None if absent or expired"""
+        row = self._connect().execute(
+            'SELECT payload FROM results WHERE key = ? AND expires_at > ?',
+            (self._key(key), time.time())
+        ).fetchone()
+        with self._lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return self._load(row[0]) if row else None
+
+    def set(self, key, value, ttl=None):
+        """Store value under key for ttl seconds (default: the cache's TTL)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._connect().execute(
+            'INSERT OR REPLACE INTO results (key, expires_at, payload) VALUES (?, ?, ?)',
+            (self._key(key), expires_at, self._dump(value))
+        )
+
+    def invalidate(self, key):
+        """Drop one entry; returns True if it was cached"""
+        cursor = self._connect().execute('DELETE FROM results WHERE key = ?', (self._key(key),))
+        return cursor.rowcount > 0
+
+    def clear(self):
+        if self.namespace:
+            self._connect().execute('DELETE FROM results WHERE substr(key, 1, ?) = ?',
+                                    (len(self.namespace) + 1, f'{self.namespace}:'))
+        else:
+            self._connect().execute('DELETE FROM results')
+
+    def prune(self):
+        """Delete expired entries (in every namespace); returns how many were removed"""
+        cursor = self._connect().execute('DELETE FROM results WHERE expires_at <= ?', (time.time(),))
+        return cursor.rowcount
+
+    def vacuum(self):
+        """Prune expired entries, then compact the database file and its WAL"""
+        removed = self.prune()
+        conn = self._connect()
+        conn.execute('VACUUM')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return removed
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def stats(self):
+        """Counters for monitoring: hits, misses, live and expired rows, and file size"""
+        conn = self._connect()
+        live, expired = conn.execute(
+            'SELECT COALESCE(SUM(expires_at > ?), 0), COALESCE(SUM(expires_at <= ?), 0) FROM results',
+            (time.time(), time.time())
+        ).fetchone()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'path': self.path,
+                'size': live,
+                'expired': expired,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'file_bytes': os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            }
+
+
+class TieredCache:
+    """
+    Chain of caches consulted fastest-first, e.g. ResultCache in front of SQLiteResultCache.
+
+    A hit in a slower tier is copied into the faster ones; writes go to every tier.
+    """
+
+    def __init__(self, *tiers):
+        self.tiers = tiers
+
+    def get(self, key):
+        for i, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster in self.tiers[:i]:
+                    faster.set(key, value)
+                return value
+        return None
+
+    def set(self, key, value, ttl=None):
+        for tier in self.tiers:
+            tier.set(key, value, ttl=ttl)
+
+    def invalidate(self, key):
+        return any([tier.invalidate(key) for tier in self.tiers])
+
+    def clear(self):
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self):
+        return [tier.stats() for tier in self.tiers]
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight operation.
+
+    The first caller for a key (the leader) runs the function; callers arriving
+    while it is running wait and receive a copy of the leader's result (or its
+    exception). Safe to share across threads, e.g. every request handler in a
+    Flask/gunicorn worker.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Run fn() once for every group of concurrent callers with the same key.
+
+        Returns:
+            (result, shared) where shared is True for callers that waited on
+            another caller's operation instead of running fn themselves
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.result), True
+
+        try:
+            flight.result = fn()
+            return flight.result, False
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self):
+        """Counters for monitoring: operations run, callers coalesced, operations in flight"""
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced, 'in_flight': len(self._flights)}
+
+
+class _AsyncFlight:
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+class AsyncSingleFlight(SingleFlight):
+    """
+    SingleFlight for coroutines: concurrent awaits of the same key share one task.
+
+    The task runs on its own, so a caller that is cancelled (the leader included)
+    stops waiting without cancelling the work for everyone else; it is cancelled
+    only once every caller has gone.
+    """
+
+    async def do(self, key, fn):
+        """Await fn() once per group of concurrent callers; returns (result, shared)"""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _AsyncFlight(asyncio.ensure_future(fn()))
+                flight.task.add_done_callback(lambda task: self._land(key, flight))
+                self.calls += 1
+            else:
+                self.coalesced += 1
+            flight.waiters += 1
+
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0 and not flight.task.done()
+                if abandoned and self._flights.get(key) is flight:
+                    del self._flights[key]
+            if abandoned:
+                # Every caller was cancelled - nobody is left to want the result
+                flight.task.cancel()
+        return (result, False) if leader else (copy.deepcopy(result), True)
+
+    def _land(self, key, flight):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+
+class LocalAnswerStats:
+    """
+    Tally of checks answered locally (impossible citations, offline index hits,
+    citation filter misses) and the upstream requests each would otherwise have
+    cost. One instance can be shared by every CitationChecker in a process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.answers = {}
+        self.upstream_calls_saved = 0
+
+    def record(self, source, calls_saved):
+        with self._lock:
+            self.answers[source] = self.answers.get(source, 0) + 1
+            self.upstream_calls_saved += calls_saved
+
+    def stats(self):
+        """Counters for monitoring: local answers by source and upstream calls saved"""
+        with self._lock:
+            return {'answers': dict(self.answers), 'total': sum(self.answers.values()),
+                    'upstream_calls_saved': self.upstream_calls_saved}
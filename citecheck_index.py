@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Citation Checker Offline Index
+Memory-mapped exact-citation and case-name index, and a Bloom filter of known
+citations, built from CourtListener's bulk data exports
+"""
+
+import bisect
+import bz2
+import csv
+import gzip
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+
+from collections import Counter
+
+from citecheck_match import ngram_counts, np, prepare
+from citecheck_reporters import lookup as lookup_reporter, normalize_reporter
+
+MAGIC = b'CCIX'
+VERSION = 2
+# magic, version, reserved, citation entries, records offset, names, distinct trigrams, names offset
+_HEADER = struct.Struct('<4sHHQQQQQ')
+_RECORD_LENGTH = struct.Struct('<I')
+
+FILTER_MAGIC = b'CCBF'
+FILTER_VERSION = 1
+# magic, version, hash count, bits, citations, target false-positive rate, reporter list length
+_FILTER_HEADER = struct.Struct('<4sHHQQdI')
+DEFAULT_FALSE_POSITIVE_RATE = 0.001
+
+
+def citation_key(volume, reporter, page):
+    """Canonical (volume, reporter, page) key, e.g. ("410", "us", "113") -> "410 U.S. 113" """
+    return f"{str(volume).strip().lstrip('0') or '0'} {normalize_reporter(reporter.strip())} {str(page).strip()}"
+
+
+def key_hash(key):
+    """64-bit hash the index is sorted by"""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def gram_code(gram):
+    """Stable 64-bit code for a trigram: its UTF-8 bytes when they fit, else a hash"""
+    data = gram.encode('utf-8')
+    return int.from_bytes(data, 'little') if len(data) <= 8 else key_hash(gram)
+
+
+def _name_grams(text):
+    return sorted({gram_code(gram) for gram in ngram_counts.__wrapped__(text)})
+
+
+def _open_text(path):
+    """Open a bulk export, transparently decompressing .bz2 / .gz files"""
+    if path.endswith('.bz2'):
+        return bz2.open(path, 'rt', encoding='utf-8', newline='')
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def _read_csv(path):
+    # Opinion text columns in the bulk exports exceed csv's default field limit
+    csv.field_size_limit(min(sys.maxsize, 2 ** 31 - 1))
+    with _open_text(path) as handle:
+        yield from csv.DictReader(handle)
+
+
+def build_index(citations_csv, clusters_csv, output, dockets_csv=None):
+    """
+    Build an offline index from CourtListener bulk exports.
+
+    Citations are read first, so only clusters that are actually cited are kept in
+    memory while the (much larger) clusters export streams past; courts are filled
+    in from the dockets export when given. The index is written to a temporary file
+    and renamed into place, so readers never see a partial index.
+
+    Args:
+        citations_csv (str): citations export (id, volume, reporter, page, cluster_id, ...)
+        clusters_csv (str): opinion clusters export (id, case_name, date_filed, docket_id, ...)
+        output (str): Index file to write
+        dockets_csv (str): Optional dockets export (id, court_id, ...) for court names
+
+    Returns:
+        dict with 'citations', 'clusters' and 'bytes' written
+    """
+    cited = {}  # cluster id -> canonical citation keys
+    for row in _read_csv(citations_csv):
+        if row.get('volume') and row.get('reporter') and row.get('page'):
+            keys = cited.setdefault(row['cluster_id'], [])
+            key = citation_key(row['volume'], row['reporter'], row['page'])
+            if key not in keys:
+                keys.append(key)
+
+    clusters = {}
+    for row in _read_csv(clusters_csv):
+        if row['id'] in cited:
+            clusters[row['id']] = row
+
+    courts = {}
+    if dockets_csv:
+        dockets = {cluster.get('docket_id') for cluster in clusters.values()}
+        for row in _read_csv(dockets_csv):
+            if row['id'] in dockets:
+                courts[row['id']] = row.get('court_id') or 'Unknown'
+
+    entries = []
+    records = bytearray()
+    record_offsets = []
+    names = []
+    for cluster_id, cluster in clusters.items():
+        record = json.dumps({
+            'case_name': cluster.get('case_name') or cluster.get('case_name_full') or 'Unknown',
+            'court': courts.get(cluster.get('docket_id'), 'Unknown'),
+            'date_filed': cluster.get('date_filed') or 'Unknown',
+            'citations': cited[cluster_id],
+            'absolute_url': f"/opinion/{cluster_id}/{cluster.get('slug', '')}/",
+            'citation_count': int(cluster.get('citation_count') or 0),
+            'slug': cluster.get('slug', ''),
+            'precedential_status': cluster.get('precedential_status') or 'unknown'
+        }, separators=(',', ':')).encode('utf-8')
+        entries.extend((key_hash(key), len(records)) for key in cited[cluster_id])
+        record_offsets.append(len(records))
+        names.append(prepare.__wrapped__(cluster.get('case_name') or cluster.get('case_name_full') or '').text)
+        records += _RECORD_LENGTH.pack(len(record)) + record
+    entries.sort()
+    records += bytes(-len(records) % 8)  # keep the name section 8-byte aligned
+
+    # Case names: normalized-name keys for exact hits, trigram postings for fuzzy candidates
+    name_keys = sorted((key_hash(name), name_id) for name_id, name in enumerate(names))
+    postings = {}
+    gram_counts = []
+    for name_id, name in enumerate(names):
+        grams = _name_grams(name)
+        gram_counts.append(min(len(grams), 0xFFFF))
+        for code in grams:
+            postings.setdefault(code, []).append(name_id)
+    grams = sorted(postings)
+    starts = [0]
+    for code in grams:
+        starts.append(starts[-1] + len(postings[code]))
+
+    records_offset = _HEADER.size + 16 * len(entries)
+    names_offset = records_offset + len(records)
+    tmp = f"{output}.tmp"
+    with open(tmp, 'wb') as handle:
+        handle.write(_HEADER.pack(MAGIC, VERSION, 0, len(entries), records_offset,
+                                  len(names), len(grams), names_offset))
+        handle.write(struct.pack(f'<{len(entries)}Q', *(h for h, _ in entries)))
+        handle.write(struct.pack(f'<{len(entries)}Q', *(offset for _, offset in entries)))
+        handle.write(records)
+        # 8-byte arrays first so every array stays aligned
+        handle.write(struct.pack(f'<{len(grams)}Q', *grams))
+        handle.write(struct.pack(f'<{len(starts)}Q', *starts))
+        handle.write(struct.pack(f'<{len(names)}Q', *(h for h, _ in name_keys)))
+        handle.write(struct.pack(f'<{len(names)}Q', *record_offsets))
+        handle.write(struct.pack(f'<{len(names)}I', *(name_id for _, name_id in name_keys)))
+        for code in grams:
+            handle.write(struct.pack(f'<{len(postings[code])}I', *postings[code]))
+        handle.write(struct.pack(f'<{len(names)}H', *gram_counts))
+        size = handle.tell()
+    os.replace(tmp, output)
+    return {'citations': len(entries), 'clusters': len(clusters), 'names': len(names),
+            'trigrams': len(grams), 'bytes': size}
+
+
+class OfflineIndex:
+    """
+    Read-only citation and case-name index, memory-mapped so lookups touch only
+    the pages they need and every process on the host shares one copy of the file.
+
+    Layout: a header, the sorted 64-bit citation key hashes, the matching record
+    offsets, length-prefixed JSON cluster records, then the case-name section:
+    sorted trigram codes with their postings ranges, sorted normalized-name
+    hashes, each name's record offset, the name-id postings and each name's
+    trigram count. Citation lookups binary-search the hashes and confirm the key
+    against the record's own citations, so hash collisions can't produce a wrong
+    case. Safe to share between threads.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Index file written by build_index / `citecheck index build`
+        """
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, records_offset, name_count, gram_count, names_offset = \
+            _HEADER.unpack_from(self._mmap) if len(self._mmap) >= _HEADER.size else (None,) * 8
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a citecheck offline index (version {VERSION}); rebuild it")
+        # The arrays are written little-endian and read in native order (every supported host is little-endian)
+        self._view = memoryview(self._mmap)
+        self._records_offset = records_offset
+        self._arrays = []
+        self._cursor = _HEADER.size
+        self._hashes = self._array('Q', count)
+        self._offsets = self._array('Q', count)
+        self._cursor = names_offset
+        self._grams = self._array('Q', gram_count)
+        self._gram_starts = self._array('Q', gram_count + 1)
+        self._name_hashes = self._array('Q', name_count)
+        self._name_records = self._array('Q', name_count)
+        self._name_ids = self._array('I', name_count)
+        self._postings_offset = self._cursor
+        self._postings = self._array('I', self._gram_starts[-1])
+        self._gram_counts_offset = self._cursor
+        self._name_gram_counts = self._array('H', name_count)
+
+    def _array(self, code, length):
+        """Next typed array of the file, as a zero-copy view"""
+        size = struct.calcsize(code) * length
+        array = self._view[self._cursor:self._cursor + size].cast(code)
+        self._cursor += size
+        self._arrays.append(array)
+        return array
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for array in self._arrays:
+            array.release()
+        self._view.release()
+        self._mmap.close()
+
+    def _record(self, offset):
+        start = self._records_offset + offset
+        (length,) = _RECORD_LENGTH.unpack_from(self._mmap, start)
+        start += _RECORD_LENGTH.size
+        return json.loads(self._mmap[start:start + length])
+
+    def lookup(self, volume, reporter, page):
+        """
+        Clusters cited as volume / reporter / page (reporter spelling is normalized).
+
+        Returns:
+            list of cluster dicts (case_name, court, date_filed, citations,
+            absolute_url, citation_count, slug, precedential_status); empty when
+            the citation isn't in the index
+        """
+        key = citation_key(volume, reporter, page)
+        target = key_hash(key)
+        i = bisect.bisect_left(self._hashes, target)
+        clusters = []
+        while i < len(self._hashes) and self._hashes[i] == target:
+            record = self._record(self._offsets[i])
+            if key in record['citations']:
+                clusters.append(record)
+            i += 1
+        return clusters
+
+    def _posting_range(self, code):
+        i = bisect.bisect_left(self._grams, code)
+        if i < len(self._grams) and self._grams[i] == code:
+            return self._gram_starts[i], self._gram_starts[i + 1]
+        return 0, 0
+
+    def _dice_top(self, overlaps, query_grams, limit):
+        gram_counts = self._name_gram_counts
+        return heapq.nsmallest(limit, overlaps, key=lambda name_id: (
+            -overlaps[name_id] / (query_grams + gram_counts[name_id]), name_id))
+
+    def _overlap_python(self, ranges, required, limit):
+        """
+        Names sharing at least required of the query's trigrams (ranges, rarest
+        first), best Dice overlap first. Candidates come from the rarest trigrams
+        only - a name sharing required trigrams must share one of those - and are
+        then probed for the common ones (" v ", "the", ...) by binary search,
+        dropping any that can no longer reach required.
+        """
+        prefix, rest = ranges[:len(ranges) - required + 1], ranges[len(ranges) - required + 1:]
+        postings = self._postings
+        shared = Counter()
+        for start, end in prefix:
+            shared.update(postings[start:end].tolist())
+        for done, (start, end) in enumerate(rest, 1):
+            remaining = len(rest) - done
+            for name_id in list(shared):
+                i = bisect.bisect_left(postings, name_id, start, end)
+                if i < end and postings[i] == name_id:
+                    shared[name_id] += 1
+                elif shared[name_id] + remaining < required:
+                    del shared[name_id]
+        return self._dice_top({name_id: count for name_id, count in shared.items() if count >= required},
+                              len(ranges), limit)
+
+    def _overlap_numpy(self, ranges, required, limit):
+        """_overlap_python's answer, counting every posting of every query trigram at once"""
+        if not ranges:
+            return []
+        postings = np.concatenate([
+            np.frombuffer(self._mmap, dtype='<u4', count=end - start, offset=self._postings_offset + 4 * start)
+            for start, end in ranges
+        ])
+        name_ids, counts = np.unique(postings, return_counts=True)
+        keep = counts >= required
+        name_ids, counts = name_ids[keep], counts[keep]
+        gram_counts = np.frombuffer(self._mmap, dtype='<u2', count=len(self._name_gram_counts),
+                                    offset=self._gram_counts_offset)[name_ids]
+        dice = counts / (len(ranges) + gram_counts.astype(np.float64))
+        return name_ids[np.lexsort((name_ids, -dice))[:limit]].tolist()
+
+    def search_names(self, name, limit=20):
+        """
+        Clusters whose case names are likeliest to match name, best first.
+
+        An exact normalized-name hit ranks first. Other candidates are names sharing
+        at least half of the query's trigrams, ranked by Dice overlap of trigram
+        sets; callers rescore them with a Matcher.
+
+        Returns:
+            list of cluster dicts like lookup()'s
+        """
+        text = prepare(name).text
+        exact = []
+        target = key_hash(text)
+        i = bisect.bisect_left(self._name_hashes, target)
+        while i < len(self._name_hashes) and self._name_hashes[i] == target:
+            exact.append(self._name_ids[i])
+            i += 1
+
+        ranges = sorted((self._posting_range(code) for code in _name_grams(text)), key=lambda r: r[1] - r[0])
+        overlap = self._overlap_numpy if np is not None else self._overlap_python
+        ranked = overlap(ranges, (len(ranges) + 1) // 2, limit)
+
+        clusters = []
+        for name_id in list(dict.fromkeys(exact + ranked))[:limit]:
+            record = self._record(self._name_records[name_id])
+            if name_id not in exact or prepare(record['case_name']).text == text:
+                clusters.append(record)
+        return clusters
+
+
+def _filter_positions(key, hashes, bits):
+    """Bit positions for a key by double hashing one 128-bit digest"""
+    digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], 'little')
+    h2 = int.from_bytes(digest[8:], 'little') | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+def build_filter(citations_csv, output, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE):
+    """
+    Build a Bloom filter over every canonical citation in a CourtListener bulk
+    citations export. Sized for the requested false-positive rate: about 14.4 bits
+    per citation at the default 0.1%.
+
+    Args:
+        citations_csv (str): citations export (.csv, .csv.bz2 or .csv.gz)
+        output (str): Filter file to write
+        false_positive_rate (float): Chance a citation that doesn't exist passes the filter
+
+    Returns:
+        dict with 'citations', 'bits', 'hashes', 'reporters' and 'bytes' written
+    """
+    keys = set()
+    reporters = set()
+    for row in _read_csv(citations_csv):
+        if row.get('volume') and row.get('reporter') and row.get('page'):
+            key = citation_key(row['volume'], row['reporter'], row['page'])
+            keys.add(key)
+            reporters.add(normalize_reporter(row['reporter'].strip()))
+
+    bits = max(64, math.ceil(-len(keys) * math.log(false_positive_rate) / math.log(2) ** 2))
+    bits += -bits % 8
+    hashes = max(1, round(bits / max(len(keys), 1) * math.log(2)))
+    array = bytearray(bits // 8)
+    for key in keys:
+        for position in _filter_positions(key, hashes, bits):
+            array[position >> 3] |= 1 << (position & 7)
+
+    reporter_list = json.dumps(sorted(reporters)).encode('utf-8')
+    tmp = f"{output}.tmp"
+    with open(tmp, 'wb') as handle:
+        handle.write(_FILTER_HEADER.pack(FILTER_MAGIC, FILTER_VERSION, hashes, bits, len(keys),
+                                         false_positive_rate, len(reporter_list)))
+        handle.write(reporter_list)
+        handle.write(array)
+        size = handle.tell()
+    os.replace(tmp, output)
+    return {'citations': len(keys), 'bits': bits, 'hashes': hashes, 'reporters': len(reporters), 'bytes': size}
+
+
+class CitationFilter:
+    """
+    Bloom filter of every citation known when it was built, memory-mapped so it
+    opens in well under a millisecond whatever its size.
+
+    A citation the filter rules out was not in the bulk data, so checks of
+    fabricated citations can stop without calling CourtListener. It is one-sided:
+    a citation that does exist always passes, while one that doesn't still passes
+    with probability false_positive_rate (and is then checked upstream as usual).
+    It only rules on reporters it has data for and that the reporter table
+    recognizes, so an unfamiliar spelling of a real citation is never ruled out.
+    Citations published after the bulk export was taken are not covered - rebuild
+    the filter with each export.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Filter file written by build_filter / `citecheck index filter`
+        """
+        self.path = path
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        header = _FILTER_HEADER.unpack_from(self._mmap) if len(self._mmap) >= _FILTER_HEADER.size else (None,) * 7
+        magic, version, self.hashes, self.bits, self.citations, self.false_positive_rate, reporters_length = header
+        if magic != FILTER_MAGIC or version != FILTER_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a citecheck citation filter (version {FILTER_VERSION})")
+        start = _FILTER_HEADER.size
+        self.reporters = frozenset(json.loads(self._mmap[start:start + reporters_length]))
+        self._bits_offset = start + reporters_length
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def covers(self, reporter):
+        """Whether the filter can rule on citations in this reporter"""
+        return lookup_reporter(reporter) is not None and normalize_reporter(reporter) in self.reporters
+
+    def might_exist(self, volume, reporter, page):
+        """
+        False only when the citation is certainly not in the bulk data; True when it
+        is, may be (a false positive), or the filter doesn't cover its reporter.
+        """
+        if not self.covers(reporter):
+            return True
+        data, offset = self._mmap, self._bits_offset
+        for position in _filter_positions(citation_key(volume, reporter, page), self.hashes, self.bits):
+            if not data[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Citation Checker Name Matching
+Scores how closely a found case name matches the user's input
+"""
+
+import heapq
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import FrozenSet, NamedTuple, Tuple
+
+try:
+    from rapidfuzz.distance import Indel as _rapidfuzz_indel
+except ImportError:  # optional C-accelerated backend
+    _rapidfuzz_indel = None
+
+try:
+    import numpy as np
+except ImportError:  # optional vectorized shortlist
+    np = None
+
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+# A found name that contains the input (as text or as a token subset) scores at least this
+CONTAINMENT_FLOOR = 0.85
+
+# Batches with more candidates than this are shortlisted by n-gram cosine before exact scoring
+SHORTLIST_SIZE = 8
+NGRAM_SIZE = 3
+# Candidate rows encoded per matrix block, bounding memory for large candidate sets
+_MATRIX_BLOCK = 1024
+
+
+_VERSUS_TOKENS = frozenset({'v', 'vs'})
+
+
+class PreparedName(NamedTuple):
+    """
+    A name normalized once for repeated scoring.
+
+    text is lower-cased with punctuation dropped and whitespace collapsed
+    ("Roe v. Wade" -> "roe v wade"). parties holds each side's token set, split
+    at the first "v"/"vs" (one entry when there is none), and sorted_text is the
+    name rebuilt with each side's tokens sorted.
+    """
+    text: str
+    parties: Tuple[FrozenSet[str], ...]
+    sorted_text: str
+
+    @property
+    def tokens(self):
+        return frozenset().union(*self.parties)
+
+
+@lru_cache(maxsize=8192)
+def prepare(name):
+    """Normalize a name for scoring; cached, since the same names recur across searches"""
+    words = _NON_WORD_RE.sub('', name.lower()).split()
+    split = next((i for i, word in enumerate(words) if word in _VERSUS_TOKENS and 0 < i < len(words) - 1), None)
+    sides = [words] if split is None else [words[:split], words[split + 1:]]
+    parties = tuple(frozenset(side) for side in sides)
+    sorted_text = ' v '.join(' '.join(sorted(side)) for side in parties)
+    return PreparedName(' '.join(words), parties, sorted_text)
+
+
+def _lcs_length(a, b):
+    """Longest common subsequence length, bit-parallel (Allison-Dix / Hyyro): O(len(b)) big-int steps"""
+    if not a or not b:
+        return 0
+    masks = {}
+    for i, char in enumerate(a):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    row = full
+    for char in b:
+        matches = row & masks.get(char, 0)
+        row = ((row + matches) | (row - matches)) & full
+    return len(a) - bin(row).count('1')
+
+
+@lru_cache(maxsize=8192)
+def ngram_counts(text):
+    """Character n-gram counts of a prepared text, padded so word edges count"""
+    padded = f' {text} '
+    return Counter(padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1))
+
+
+def _norm(counts):
+    return sum(count * count for count in counts.values()) ** 0.5 or 1.0
+
+
+def _top_indices(scores, k):
+    """Indices of the k highest scores, best first (lower index first on ties)"""
+    return heapq.nsmallest(k, range(len(scores)), key=lambda j: (-scores[j], j))
+
+
+def _shortlists_numpy(query_counts, candidate_counts, k):
+    vocabulary = {}
+    for counts in candidate_counts:
+        for gram in counts:
+            vocabulary.setdefault(gram, len(vocabulary))
+
+    def encode(rows):
+        matrix = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+        for i, counts in enumerate(rows):
+            cols = [vocabulary[gram] for gram in counts if gram in vocabulary]
+            matrix[i, cols] = [counts[gram] for gram in counts if gram in vocabulary]
+            matrix[i] /= _norm(counts)
+        return matrix
+
+    queries = encode(query_counts)
+    scores = np.empty((len(query_counts), len(candidate_counts)), dtype=np.float32)
+    for start in range(0, len(candidate_counts), _MATRIX_BLOCK):
+        block = encode(candidate_counts[start:start + _MATRIX_BLOCK])
+        scores[:, start:start + len(block)] = queries @ block.T
+    # Stable sort on negated scores keeps the lower index first on ties
+    return np.argsort(-scores, axis=1, kind='stable')[:, :k].tolist()
+
+
+def _shortlists_python(query_counts, candidate_counts, k):
+    postings = {}
+    for j, counts in enumerate(candidate_counts):
+        norm = _norm(counts)
+        for gram, count in counts.items():
+            postings.setdefault(gram, []).append((j, count / norm))
+    shortlists = []
+    for counts in query_counts:
+        scores = [0.0] * len(candidate_counts)
+        norm = _norm(counts)
+        for gram, count in counts.items():
+            for j, weight in postings.get(gram, ()):
+                scores[j] += count / norm * weight
+        shortlists.append(_top_indices(scores, k))
+    return shortlists
+
+
+def shortlist(inputs, names, k=SHORTLIST_SIZE):
+    """
+    For every input, the indices of the k names with the most similar character
+    n-grams (cosine over trigram counts), best first.
+
+    The whole inputs x names similarity matrix is computed at once - as matrix
+    products with numpy when installed, through an n-gram inverted index otherwise.
+    """
+    query_counts = [ngram_counts(prepare(text).text) for text in inputs]
+    candidate_counts = [ngram_counts(prepare(name).text) for name in names]
+    if np is not None:
+        return _shortlists_numpy(query_counts, candidate_counts, k)
+    return _shortlists_python(query_counts, candidate_counts, k)
+
+
+def _contains_parties(candidate, query):
+    """Every query token appears on the same side of the candidate (anywhere, for a one-sided query)"""
+    if len(query.parties) == 1:
+        return query.parties[0] <= candidate.tokens
+    return len(candidate.parties) == 2 and all(q <= c for q, c in zip(query.parties, candidate.parties))
+
+
+class Matcher:
+    """
+    Pure-Python name matcher.
+
+    Scores are normalized Indel similarity - Levenshtein distance restricted to
+    insertions and deletions, 2 * LCS / (len(a) + len(b)) - which is on the same
+    0..1 scale as difflib's ratio(). Each pair is scored both as written and with
+    every party's tokens sorted, so word order within a party doesn't matter
+    ("Brown v. Education, Board of" still finds Brown) but party order does
+    ("Nixon v. United States" is a different case from "United States v. Nixon").
+    A found name that contains the whole input, as a substring or party by party
+    as token subsets, scores at least CONTAINMENT_FLOOR, as before; the existing
+    0.8 "uncertain" threshold keeps its meaning.
+    """
+
+    name = 'python'
+
+    def ratio(self, a, b):
+        """Normalized Indel similarity of two strings, 0..1"""
+        total = len(a) + len(b)
+        return 2 * _lcs_length(a, b) / total if total else 1.0
+
+    def score(self, query, candidate):
+        """Similarity of two PreparedNames, 0..1"""
+        if query.text == candidate.text:
+            return 1.0
+        similarity = max(self.ratio(query.text, candidate.text),
+                         self.ratio(query.sorted_text, candidate.sorted_text))
+        if query.text in candidate.text or _contains_parties(candidate, query):
+            return CONTAINMENT_FLOOR + (1 - CONTAINMENT_FLOOR) * similarity
+        return similarity
+
+    def similarity(self, input_text, case_name):
+        return self.score(prepare(input_text), prepare(case_name))
+
+    def best_match(self, input_text, names):
+        """Index and score of the best-scoring name (first wins ties), or (None, 0.0)"""
+        return self.best_matches([input_text], names)[0]
+
+    def best_matches(self, inputs, names, shortlist_size=SHORTLIST_SIZE):
+        """
+        Best (index, score) among names for every input, in input order.
+
+        Each input and name is normalized once for the whole batch. With more than
+        shortlist_size names, only each input's n-gram shortlist (see shortlist())
+        is scored exactly, so document-sized batches cost one similarity matrix
+        plus a few exact scores per input; scores are always the exact ones.
+        """
+        candidates = [prepare(name) for name in names]
+        unique = list(dict.fromkeys(inputs))
+        if len(names) > shortlist_size:
+            indices = shortlist(unique, names, shortlist_size)
+        else:
+            indices = [range(len(names))] * len(unique)
+
+        best = {}
+        for text, candidate_indices in zip(unique, indices):
+            query = prepare(text)
+            best_index, best_score = None, 0.0
+            for i in sorted(candidate_indices):
+                score = self.score(query, candidates[i])
+                if score > best_score:
+                    best_index, best_score = i, score
+            best[text] = (best_index, best_score)
+        return [best[text] for text in inputs]
+
+
+class RapidFuzzMatcher(Matcher):
+    """Matcher with the same scores, computing Indel similarity in rapidfuzz's C++ implementation"""
+
+    name = 'rapidfuzz'
+
+    def ratio(self, a, b):
+        return _rapidfuzz_indel.normalized_similarity(a, b)
+
+
+def default_matcher():
+    """The fastest matcher available: rapidfuzz when installed, else pure Python"""
+    return RapidFuzzMatcher() if _rapidfuzz_indel is not None else Matcher()
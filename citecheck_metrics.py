@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Citation Checker Metrics
+In-process counters and histograms, exposed in the Prometheus text format
+"""
+
+import bisect
+import threading
+
+# Upper bounds (seconds) for upstream latency histograms; CourtListener answers
+# in tens to hundreds of milliseconds, and slow searches run to the read timeout
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f'{self.name} takes labels {self.labelnames}, got {tuple(labels)}')
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.extend(self._samples(key, value))
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, one series per label combination"""
+
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _samples(self, key, value):
+        return [f'{self.name}{_labels(self.labelnames, key)} {_number(value)}']
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets, one series per label combination"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, then the overflow count, sum and total
+                series = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, **labels):
+        with self._lock:
+            series = self._values.get(self._key(labels))
+            return series[2] if series else 0
+
+    def _samples(self, key, series):
+        counts, total, count = series
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += bucket_count
+            lines.append(f'{self.name}_bucket{_labels(self.labelnames, key, [("le", _number(bound))])} {cumulative}')
+        lines.append(f'{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}')
+        lines.append(f'{self.name}_count{_labels(self.labelnames, key)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """A named set of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f'Metric {metric.name!r} is already registered')
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        """Every metric in the Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+class CheckerMetrics:
+    """
+    What CitationChecker records about its work: upstream latency and responses
+    per strategy, each strategy's outcome, fallbacks taken, cache hits and misses,
+    checks coalesced by single flight, and checks answered locally. One instance
+    can be shared by every checker in a process; render() gives the Prometheus
+    exposition of all of it.
+    """
+
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        self.upstream_seconds = self.registry.histogram(
+            'citecheck_upstream_request_seconds',
+            'Time spent on one upstream request by strategy, including retries, hedges and rate limiting',
+            ['strategy'])
+        self.upstream_requests = self.registry.counter(
+            'citecheck_upstream_requests_total',
+            'Upstream requests by strategy and final HTTP status (or "error" when none was received)',
+            ['strategy', 'status'])
+        self.strategy_results = self.registry.counter(
+            'citecheck_strategy_results_total',
+            'Results of each lookup strategy by status', ['strategy', 'status'])
+        self.fallbacks = self.registry.counter(
+            'citecheck_fallbacks_total',
+            'Fallback strategies run after an earlier strategy could not confirm the input', ['strategy'])
+        self.cache_hits = self.registry.counter(
+            'citecheck_cache_hits_total', 'Checks answered from a result cache', ['cache'])
+        self.cache_misses = self.registry.counter(
+            'citecheck_cache_misses_total', 'Checks no result cache could answer')
+        self.coalesced = self.registry.counter(
+            'citecheck_coalesced_total',
+            'Checks that shared a concurrent identical check instead of calling upstream')
+        self.local_answers = self.registry.counter(
+            'citecheck_local_answers_total',
+            'Checks answered without CourtListener, by source', ['source'])
+        self.upstream_calls_saved = self.registry.counter(
+            'citecheck_upstream_calls_saved_total', 'Upstream calls avoided by local answers')
+
+    def render(self):
+        return self.registry.render()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Citation Checker Input Parser
+Single-pass tokenizer that classifies user input and pulls out its citation parts
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional, Tuple
+
+# One reporter token: an abbreviation ("U.S.", "Cal.", "F.3d") or a series ordinal ("2d", "4th").
+# A standalone "v"/"vs" never starts a token, so "5 Roe v. Wade 10" isn't read as a citation.
+_REPORTER_TOKEN = r"(?!vs?\.?\s)(?:[A-Za-z][A-Za-z.']*(?:\d+[a-z]*\.?)?|\d+(?:d|th|st|nd|rd)\b\.?)"
+
+# Everything the checker needs in one scan: the "v." that marks a case name, and
+# volume / reporter / page with an optional pinpoint and parenthetical year.
+# A pinpoint followed by a capitalized word is really a parallel citation's volume.
+INPUT_RE = re.compile(
+    r"(?=[\dvV])(?:"  # cheap first-character filter before trying either branch
+    r"(?P<versus>\b[vV]\.?\s+)"
+    r"|(?P<volume>\b\d+)\s+"
+    rf"(?P<reporter>(?!\d){_REPORTER_TOKEN}(?:\s+{_REPORTER_TOKEN})*?)"
+    r"\s+(?P<page>\d+)(?![\w])"
+    r"(?:,\s*(?P<pinpoint>\d+)(?![\w])(?!\s+[A-Za-z]))?"
+    r"(?:\s*\((?:[^()]*?\s)?(?P<year>\d{4})\))?"
+    r")"
+)
+
+
+class ParsedInput(NamedTuple):
+    """
+    Typed result of parse_input.
+
+    kind is 'citation' (volume reporter page), 'case_name' ("X v. Y"), 'full'
+    (a case name with a citation) or 'text' (neither). The citation fields are
+    None when no citation was found; parties is (plaintiff, defendant) when the
+    input names a case. span is the citation's (start, end) offsets in the text.
+    """
+    kind: str
+    volume: Optional[str] = None
+    reporter: Optional[str] = None
+    page: Optional[str] = None
+    pinpoint: Optional[str] = None
+    year: Optional[str] = None
+    parties: Optional[Tuple[str, str]] = None
+    span: Optional[Tuple[int, int]] = None
+
+    @property
+    def has_citation(self):
+        return self.volume is not None
+
+    @property
+    def looks_like_case_name(self):
+        return self.parties is not None
+
+    @property
+    def looks_like_citation(self):
+        """The input starts with volume, reporter and page"""
+        return self.span is not None and self.span[0] == 0
+
+
+@lru_cache(maxsize=4096)
+def parse_input(text):
+    """
+    Classify a (stripped) citation or case name in one pass over the text.
+
+    Results are immutable and cached, so repeated checks of the same input and the
+    several questions the checker asks about it cost one scan.
+    """
+    versus = citation = None
+    for match in INPUT_RE.finditer(text):
+        if match.lastgroup == 'versus':
+            if versus is None:
+                versus = match
+        elif citation is None:
+            citation = match
+        if versus is not None and citation is not None:
+            break
+
+    parties = None
+    if versus is not None:
+        # The defendant runs up to the citation (or the comma before it)
+        name_end = citation.start() if citation is not None and citation.start() > versus.end() else len(text)
+        defendant = text[versus.end():name_end].rstrip().rstrip(',').strip()
+        parties = (text[:versus.start()].strip(), defendant)
+
+    if citation is None:
+        return ParsedInput('case_name' if parties else 'text', parties=parties)
+
+    volume, reporter, page, pinpoint, year = citation.group('volume', 'reporter', 'page', 'pinpoint', 'year')
+    return ParsedInput('full' if parties else 'citation', volume, reporter, page, pinpoint, year,
+                       parties, (citation.start(), citation.end('page')))
+
+
+@lru_cache(maxsize=8192)
+def split_citation(citation):
+    """
+    Split a citation string from a search result ("623 P.2d 268") into
+    (volume, reporter, page), or None when it has fewer than three parts.
+    Search results repeat the same citations constantly, so splits are cached.
+    """
+    parts = citation.split()
+    if len(parts) < 3:
+        return None
+    return parts[0], ' '.join(parts[1:-1]), parts[-1]
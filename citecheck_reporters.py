@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+"""
+Citation Checker Reporter Table
+Bundled table of U.S. case reporters, built once at import into a frozen lookup map
+"""
+
+import datetime
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import NamedTuple, Optional, Tuple
+
+# Citation preference tiers, most authoritative first
+SUPREME_OFFICIAL = 0      # U.S. Reports
+STATE_OFFICIAL = 1        # Official state reports (Cal., N.Y., Mass., ...)
+FEDERAL_APPELLATE = 2     # Federal Reporter
+FEDERAL_TRIAL = 3         # Federal Supplement
+SUPREME_UNOFFICIAL = 4    # Supreme Court Reporter
+LAWYERS_EDITION = 5       # Lawyers' Edition
+REGIONAL = 6              # West regional reporters (A., N.E., P., ...)
+OTHER = 7                 # Specialty and unofficial state reporters
+
+
+class Reporter(NamedTuple):
+    """
+    One reporter series edition.
+
+    series and edition place it in its family ("F. Supp. 2d" is edition 2 of
+    "F. Supp."). Volumes run from min_volume to max_volume; max_volume is None
+    while the series is still being published (or its last volume is uncertain).
+    volumes_per_year, for some series still being published, is a generous ceiling
+    on how fast volumes appear, bounding the latest volume that can exist by now.
+    dates_checked marks series whose start_year and end_year have been checked
+    against their first and last volumes; only those are trusted to rule out a
+    citation by its year.
+    """
+    abbreviation: str
+    name: str
+    series: str
+    edition: int
+    tier: int
+    jurisdiction: str
+    min_volume: int = 1
+    max_volume: Optional[int] = None
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+    volumes_per_year: Optional[int] = None
+    dates_checked: bool = False
+
+    def volume_in_range(self, volume):
+        return volume >= self.min_volume and (self.max_volume is None or volume <= self.max_volume)
+
+    def latest_possible_volume(self, year):
+        """Highest volume that can exist by the end of year (None when unbounded)"""
+        if self.max_volume is not None:
+            return self.max_volume
+        if self.volumes_per_year is None or self.start_year is None:
+            return None
+        return self.min_volume - 1 + self.volumes_per_year * (year - self.start_year + 1)
+
+
+# (abbreviation, name, tier, jurisdiction, start_year, end_year, max_volume, extra variants)
+#
+# The table covers the reporters cited most, not every series CourtListener knows.
+# A spelling it doesn't recognize is never judged, corrected or ruled out locally:
+# impossibility() and the citation filter return "can't tell", normalize_reporter()
+# leaves it alone, and the check goes upstream as written.
+_TABLE = (
+    # Supreme Court
+    ('U.S.', 'United States Reports', SUPREME_OFFICIAL, 'us', 1790, None, None, ()),
+    ('S. Ct.', 'Supreme Court Reporter', SUPREME_UNOFFICIAL, 'us', 1882, None, None, ('Sup. Ct.',)),
+    ('L. Ed.', "Lawyers' Edition", LAWYERS_EDITION, 'us', 1790, 1956, 100, ('Law. Ed.',)),
+    ('L. Ed. 2d', "Lawyers' Edition, Second Series", LAWYERS_EDITION, 'us', 1956, None, None, ()),
+    ('Dall.', 'Dallas', OTHER, 'us', 1790, 1800, 4, ()),
+    ('Cranch', 'Cranch', OTHER, 'us', 1801, 1815, 9, ()),
+    ('Wheat.', 'Wheaton', OTHER, 'us', 1816, 1827, 12, ()),
+    ('Pet.', 'Peters', OTHER, 'us', 1828, 1842, 16, ()),
+    ('How.', 'Howard', OTHER, 'us', 1843, 1860, 24, ()),
+    ('Black', 'Black', OTHER, 'us', 1861, 1862, 2, ()),
+    ('Wall.', 'Wallace', OTHER, 'us', 1863, 1874, 23, ()),
+
+    # Federal courts
+    ('F.', 'Federal Reporter', FEDERAL_APPELLATE, 'federal', 1880, 1924, 300, ('Fed.',)),
+    ('F.2d', 'Federal Reporter, Second Series', FEDERAL_APPELLATE, 'federal', 1924, 1993, 999, ('Fed. 2d',)),
+    ('F.3d', 'Federal Reporter, Third Series', FEDERAL_APPELLATE, 'federal', 1993, 2021, 999, ('Fed. 3d',)),
+    ('F.4th', 'Federal Reporter, Fourth Series', FEDERAL_APPELLATE, 'federal', 2021, None, None, ()),
+    ('F. Supp.', 'Federal Supplement', FEDERAL_TRIAL, 'federal', 1932, 1998, 999, ('Fed. Supp.',)),
+    ('F. Supp. 2d', 'Federal Supplement, Second Series', FEDERAL_TRIAL, 'federal', 1998, 2014, 999, ('Fed. Supp. 2d',)),
+    ('F. Supp. 3d', 'Federal Supplement, Third Series', FEDERAL_TRIAL, 'federal', 2014, None, None, ('Fed. Supp. 3d',)),
+    ("F. App'x", 'Federal Appendix', OTHER, 'federal', 2001, 2021, None, ('F. Appx.', 'Fed. Appx.', "Fed. App'x")),
+    ('F. Cas.', 'Federal Cases', OTHER, 'federal', 1789, 1880, 30, ('Fed. Cas.',)),
+    ('U.S. App. D.C.', 'United States Court of Appeals Reports (D.C. Circuit)', OTHER, 'dc', 1941, None, None, ()),
+    ('App. D.C.', 'Appeal Cases, District of Columbia', OTHER, 'dc', 1893, 1941, 74, ()),
+    ('F.R.D.', 'Federal Rules Decisions', OTHER, 'federal', 1938, None, None, ()),
+    ('B.R.', 'Bankruptcy Reporter', OTHER, 'federal', 1979, None, None, ('Bankr.',)),
+    ('Fed. Cl.', 'Federal Claims Reporter', OTHER, 'federal', 1992, None, None, ()),
+    ('Ct. Cl.', 'Court of Claims Reports', OTHER, 'federal', 1863, 1982, None, ()),
+    ('Cl. Ct.', 'Claims Court Reporter', OTHER, 'federal', 1983, 1992, None, ()),
+    ('T.C.', 'Reports of the United States Tax Court', OTHER, 'federal', 1942, None, None, ()),
+    ('T.C.M.', 'Tax Court Memorandum Decisions', OTHER, 'federal', 1942, None, None, ()),
+    ('B.T.A.', 'Board of Tax Appeals Reports', OTHER, 'federal', 1924, 1942, 47, ()),
+    ("Ct. Int'l Trade", 'Court of International Trade Reports', OTHER, 'federal', 1980, None, None, ('CIT',)),
+    ('Cust. Ct.', 'Customs Court Reports', OTHER, 'federal', 1938, 1980, None, ()),
+    ('C.C.P.A.', 'Court of Customs and Patent Appeals Reports', OTHER, 'federal', 1929, 1982, None, ()),
+    ('M.J.', 'Military Justice Reporter', OTHER, 'federal', 1975, None, None, ()),
+    ('Vet. App.', "Veterans Appeals Reporter", OTHER, 'federal', 1989, None, None, ()),
+
+    # West regional reporters
+    ('A.', 'Atlantic Reporter', REGIONAL, 'regional', 1885, 1938, 200, ('Atl.',)),
+    ('A.2d', 'Atlantic Reporter, Second Series', REGIONAL, 'regional', 1938, 2010, 999, ('Atl. 2d',)),
+    ('A.3d', 'Atlantic Reporter, Third Series', REGIONAL, 'regional', 2010, None, None, ()),
+    ('N.E.', 'North Eastern Reporter', REGIONAL, 'regional', 1885, 1936, 200, ()),
+    ('N.E.2d', 'North Eastern Reporter, Second Series', REGIONAL, 'regional', 1936, 2014, 999, ()),
+    ('N.E.3d', 'North Eastern Reporter, Third Series', REGIONAL, 'regional', 2014, None, None, ()),
+    ('N.W.', 'North Western Reporter', REGIONAL, 'regional', 1879, 1941, 300, ()),
+    ('N.W.2d', 'North Western Reporter, Second Series', REGIONAL, 'regional', 1941, None, None, ()),
+    ('N.W.3d', 'North Western Reporter, Third Series', REGIONAL, 'regional', None, None, None, ()),
+    ('P.', 'Pacific Reporter', REGIONAL, 'regional', 1883, 1931, 300, ('Pac.',)),
+    ('P.2d', 'Pacific Reporter, Second Series', REGIONAL, 'regional', 1931, 2000, 999, ('Pac. 2d',)),
+    ('P.3d', 'Pacific Reporter, Third Series', REGIONAL, 'regional', 2000, None, None, ()),
+    ('S.E.', 'South Eastern Reporter', REGIONAL, 'regional', 1887, 1939, 200, ()),
+    ('S.E.2d', 'South Eastern Reporter, Second Series', REGIONAL, 'regional', 1939, None, None, ()),
+    ('S.W.', 'South Western Reporter', REGIONAL, 'regional', 1886, 1928, 300, ()),
+    ('S.W.2d', 'South Western Reporter, Second Series', REGIONAL, 'regional', 1928, 1999, 999, ()),
+    ('S.W.3d', 'South Western Reporter, Third Series', REGIONAL, 'regional', 1999, None, None, ()),
+    ('So.', 'Southern Reporter', REGIONAL, 'regional', 1887, 1941, 200, ('South.',)),
+    ('So. 2d', 'Southern Reporter, Second Series', REGIONAL, 'regional', 1941, 2008, 999, ()),
+    ('So. 3d', 'Southern Reporter, Third Series', REGIONAL, 'regional', 2008, None, None, ()),
+
+    # Unofficial state reporters
+    ('Cal. Rptr.', 'California Reporter', OTHER, 'cal', 1959, 1991, 286, ()),
+    ('Cal. Rptr. 2d', 'California Reporter, Second Series', OTHER, 'cal', 1991, 2003, 135, ()),
+    ('Cal. Rptr. 3d', 'California Reporter, Third Series', OTHER, 'cal', 2003, None, None, ()),
+    ('N.Y.S.', 'New York Supplement', OTHER, 'ny', 1888, 1937, None, ()),
+    ('N.Y.S.2d', 'New York Supplement, Second Series', OTHER, 'ny', 1938, None, None, ()),
+    ('N.Y.S.3d', 'New York Supplement, Third Series', OTHER, 'ny', 2015, None, None, ()),
+    ('Ill. Dec.', "West's Illinois Decisions", OTHER, 'ill', 1976, None, None, ()),
+    ('Conn. Supp.', 'Connecticut Supplement', OTHER, 'conn', 1935, None, None, ()),
+    ('Fla. Supp.', 'Florida Supplement', OTHER, 'fla', 1948, 1981, None, ()),
+    ('Fla. Supp. 2d', 'Florida Supplement, Second Series', OTHER, 'fla', 1983, None, None, ()),
+    ('Ohio Misc.', 'Ohio Miscellaneous Reports', OTHER, 'ohio', 1962, 1982, None, ()),
+    ('Ohio Misc. 2d', 'Ohio Miscellaneous Reports, Second Series', OTHER, 'ohio', 1982, None, None, ()),
+    ('N.J. Misc.', 'New Jersey Miscellaneous Reports', OTHER, 'nj', 1923, 1949, None, ()),
+    ('N.J. Tax', 'New Jersey Tax Court Reports', OTHER, 'nj', 1979, None, None, ()),
+    ('Pa. D. & C.', 'Pennsylvania District and County Reports', OTHER, 'pa', 1921, None, None, ()),
+
+    # Annotations
+    ('A.L.R.', 'American Law Reports', OTHER, 'us', 1919, 1948, 175, ()),
+    ('A.L.R.2d', 'American Law Reports, Second Series', OTHER, 'us', 1948, 1965, 100, ()),
+    ('A.L.R.3d', 'American Law Reports, Third Series', OTHER, 'us', 1965, 1980, 100, ()),
+    ('A.L.R.4th', 'American Law Reports, Fourth Series', OTHER, 'us', 1980, 1992, None, ()),
+    ('A.L.R.5th', 'American Law Reports, Fifth Series', OTHER, 'us', 1992, 2005, None, ()),
+    ('A.L.R.6th', 'American Law Reports, Sixth Series', OTHER, 'us', 2005, None, None, ()),
+    ('A.L.R.7th', 'American Law Reports, Seventh Series', OTHER, 'us', 2015, None, None, ()),
+    ('A.L.R. Fed.', 'American Law Reports, Federal', OTHER, 'federal', 1969, 2005, None, ()),
+    ('A.L.R. Fed. 2d', 'American Law Reports, Federal, Second Series', OTHER, 'federal', 2005, None, None, ()),
+
+    # Official state reports
+    ('Ala.', 'Alabama Reports', STATE_OFFICIAL, 'ala', 1840, 1976, None, ()),
+    ('Ala. App.', 'Alabama Appellate Court Reports', STATE_OFFICIAL, 'ala', 1910, 1976, None, ()),
+    ('Alaska', 'Alaska Reports', STATE_OFFICIAL, 'alaska', 1884, 1959, None, ()),
+    ('Ariz.', 'Arizona Reports', STATE_OFFICIAL, 'ariz', 1866, None, None, ()),
+    ('Ariz. App.', 'Arizona Appeals Reports', STATE_OFFICIAL, 'ariz', 1965, 1976, None, ()),
+    ('Ark.', 'Arkansas Reports', STATE_OFFICIAL, 'ark', 1837, 2009, None, ()),
+    ('Ark. App.', 'Arkansas Appellate Reports', STATE_OFFICIAL, 'ark', 1981, 2009, None, ()),
+    ('Cal.', 'California Reports', STATE_OFFICIAL, 'cal', 1850, 1934, 220, ()),
+    ('Cal. 2d', 'California Reports, Second Series', STATE_OFFICIAL, 'cal', 1934, 1969, 71, ()),
+    ('Cal. 3d', 'California Reports, Third Series', STATE_OFFICIAL, 'cal', 1969, 1991, 54, ()),
+    ('Cal. 4th', 'California Reports, Fourth Series', STATE_OFFICIAL, 'cal', 1991, 2018, 63, ()),
+    ('Cal. 5th', 'California Reports, Fifth Series', STATE_OFFICIAL, 'cal', 2018, None, None, ()),
+    ('Cal. App.', 'California Appellate Reports', STATE_OFFICIAL, 'cal', 1905, 1934, 140, ()),
+    ('Cal. App. 2d', 'California Appellate Reports, Second Series', STATE_OFFICIAL, 'cal', 1934, 1969, 276, ()),
+    ('Cal. App. 3d', 'California Appellate Reports, Third Series', STATE_OFFICIAL, 'cal', 1969, 1991, 235, ()),
+    ('Cal. App. 4th', 'California Appellate Reports, Fourth Series', STATE_OFFICIAL, 'cal', 1991, 2016, 248, ()),
+    ('Cal. App. 5th', 'California Appellate Reports, Fifth Series', STATE_OFFICIAL, 'cal', 2016, None, None, ()),
+    ('Colo.', 'Colorado Reports', STATE_OFFICIAL, 'colo', 1864, 1980, None, ()),
+    ('Colo. App.', 'Colorado Court of Appeals Reports', STATE_OFFICIAL, 'colo', 1891, 1980, None, ()),
+    ('Conn.', 'Connecticut Reports', STATE_OFFICIAL, 'conn', 1814, None, None, ()),
+    ('Conn. App.', 'Connecticut Appellate Reports', STATE_OFFICIAL, 'conn', 1983, None, None, ()),
+    ('Del.', 'Delaware Reports', STATE_OFFICIAL, 'del', 1832, 1966, None, ()),
+    ('Del. Ch.', 'Delaware Chancery Reports', STATE_OFFICIAL, 'del', 1814, 1968, None, ()),
+    ('Fla.', 'Florida Reports', STATE_OFFICIAL, 'fla', 1846, 1948, None, ()),
+    ('Ga.', 'Georgia Reports', STATE_OFFICIAL, 'ga', 1846, None, None, ()),
+    ('Ga. App.', 'Georgia Appeals Reports', STATE_OFFICIAL, 'ga', 1907, None, None, ()),
+    ('Haw.', 'Hawaii Reports', STATE_OFFICIAL, 'haw', 1847, None, None, ()),
+    ('Haw. App.', 'Hawaii Appellate Reports', STATE_OFFICIAL, 'haw', 1980, 1994, None, ()),
+    ('Idaho', 'Idaho Reports', STATE_OFFICIAL, 'idaho', 1866, None, None, ()),
+    ('Ill.', 'Illinois Reports', STATE_OFFICIAL, 'ill', 1819, 1954, None, ()),
+    ('Ill. 2d', 'Illinois Reports, Second Series', STATE_OFFICIAL, 'ill', 1954, 2011, None, ()),
+    ('Ill. App.', 'Illinois Appellate Court Reports', STATE_OFFICIAL, 'ill', 1877, 1954, None, ()),
+    ('Ill. App. 2d', 'Illinois Appellate Court Reports, Second Series', STATE_OFFICIAL, 'ill', 1954, 1971, None, ()),
+    ('Ill. App. 3d', 'Illinois Appellate Court Reports, Third Series', STATE_OFFICIAL, 'ill', 1971, 2011, None, ()),
+    ('Ind.', 'Indiana Reports', STATE_OFFICIAL, 'ind', 1817, 1981, None, ()),
+    ('Ind. App.', 'Indiana Court of Appeals Reports', STATE_OFFICIAL, 'ind', 1890, 1979, None, ()),
+    ('Iowa', 'Iowa Reports', STATE_OFFICIAL, 'iowa', 1855, 1968, None, ()),
+    ('Kan.', 'Kansas Reports', STATE_OFFICIAL, 'kan', 1862, None, None, ()),
+    ('Kan. App.', 'Kansas Court of Appeals Reports', STATE_OFFICIAL, 'kan', 1895, 1901, None, ()),
+    ('Kan. App. 2d', 'Kansas Court of Appeals Reports, Second Series', STATE_OFFICIAL, 'kan', 1977, None, None, ()),
+    ('Ky.', 'Kentucky Reports', STATE_OFFICIAL, 'ky', 1785, 1951, None, ()),
+    ('La.', 'Louisiana Reports', STATE_OFFICIAL, 'la', 1830, 1972, None, ()),
+    ('La. Ann.', 'Louisiana Annual Reports', STATE_OFFICIAL, 'la', 1846, 1900, None, ()),
+    ('La. App.', 'Louisiana Courts of Appeal Reports', STATE_OFFICIAL, 'la', 1924, 1932, None, ()),
+    ('Me.', 'Maine Reports', STATE_OFFICIAL, 'me', 1820, 1965, None, ()),
+    ('Md.', 'Maryland Reports', STATE_OFFICIAL, 'md', 1851, None, None, ()),
+    ('Md. App.', 'Maryland Appellate Reports', STATE_OFFICIAL, 'md', 1967, None, None, ()),
+    ('Mass.', 'Massachusetts Reports', STATE_OFFICIAL, 'mass', 1804, None, None, ()),
+    ('Mass. App. Ct.', 'Massachusetts Appeals Court Reports', STATE_OFFICIAL, 'mass', 1972, None, None, ('Mass. App.',)),
+    ('Mich.', 'Michigan Reports', STATE_OFFICIAL, 'mich', 1847, None, None, ()),
+    ('Mich. App.', 'Michigan Appeals Reports', STATE_OFFICIAL, 'mich', 1965, None, None, ()),
+    ('Minn.', 'Minnesota Reports', STATE_OFFICIAL, 'minn', 1851, 1977, None, ()),
+    ('Miss.', 'Mississippi Reports', STATE_OFFICIAL, 'miss', 1818, 1966, None, ()),
+    ('Mo.', 'Missouri Reports', STATE_OFFICIAL, 'mo', 1821, 1956, None, ()),
+    ('Mo. App.', 'Missouri Appeal Reports', STATE_OFFICIAL, 'mo', 1876, 1954, None, ()),
+    ('Mont.', 'Montana Reports', STATE_OFFICIAL, 'mont', 1868, None, None, ()),
+    ('Neb.', 'Nebraska Reports', STATE_OFFICIAL, 'neb', 1860, None, None, ()),
+    ('Neb. App.', 'Nebraska Appellate Reports', STATE_OFFICIAL, 'neb', 1992, None, None, ()),
+    ('Nev.', 'Nevada Reports', STATE_OFFICIAL, 'nev', 1865, None, None, ()),
+    ('N.H.', 'New Hampshire Reports', STATE_OFFICIAL, 'nh', 1816, None, None, ()),
+    ('N.J.', 'New Jersey Reports', STATE_OFFICIAL, 'nj', 1948, None, None, ()),
+    ('N.J.L.', 'New Jersey Law Reports', STATE_OFFICIAL, 'nj', 1790, 1948, None, ()),
+    ('N.J. Eq.', 'New Jersey Equity Reports', STATE_OFFICIAL, 'nj', 1830, 1948, None, ()),
+    ('N.J. Super.', 'New Jersey Superior Court Reports', STATE_OFFICIAL, 'nj', 1948, None, None, ()),
+    ('N.M.', 'New Mexico Reports', STATE_OFFICIAL, 'nm', 1852, None, None, ()),
+    ('N.Y.', 'New York Reports', STATE_OFFICIAL, 'ny', 1847, 1956, None, ()),
+    ('N.Y.2d', 'New York Reports, Second Series', STATE_OFFICIAL, 'ny', 1956, 2004, 100, ()),
+    ('N.Y.3d', 'New York Reports, Third Series', STATE_OFFICIAL, 'ny', 2004, None, None, ()),
+    ('A.D.', 'Appellate Division Reports', STATE_OFFICIAL, 'ny', 1896, 1955, None, ('App. Div.',)),
+    ('A.D.2d', 'Appellate Division Reports, Second Series', STATE_OFFICIAL, 'ny', 1955, 2004, None, ('App. Div. 2d',)),
+    ('A.D.3d', 'Appellate Division Reports, Third Series', STATE_OFFICIAL, 'ny', 2004, None, None, ('App. Div. 3d',)),
+    ('Misc.', 'New York Miscellaneous Reports', STATE_OFFICIAL, 'ny', 1892, 1955, None, ()),
+    ('Misc. 2d', 'New York Miscellaneous Reports, Second Series', STATE_OFFICIAL, 'ny', 1955, 2004, None, ()),
+    ('Misc. 3d', 'New York Miscellaneous Reports, Third Series', STATE_OFFICIAL, 'ny', 2004, None, None, ()),
+    ('N.C.', 'North Carolina Reports', STATE_OFFICIAL, 'nc', 1778, None, None, ()),
+    ('N.C. App.', 'North Carolina Court of Appeals Reports', STATE_OFFICIAL, 'nc', 1968, None, None, ()),
+    ('N.D.', 'North Dakota Reports', STATE_OFFICIAL, 'nd', 1890, 1953, None, ()),
+    ('Ohio', 'Ohio Reports', STATE_OFFICIAL, 'ohio', 1821, 1852, None, ()),
+    ('Ohio St.', 'Ohio State Reports', STATE_OFFICIAL, 'ohio', 1852, 1964, None, ()),
+    ('Ohio St. 2d', 'Ohio State Reports, Second Series', STATE_OFFICIAL, 'ohio', 1965, 1982, None, ()),
+    ('Ohio St. 3d', 'Ohio State Reports, Third Series', STATE_OFFICIAL, 'ohio', 1982, None, None, ()),
+    ('Ohio App.', 'Ohio Appellate Reports', STATE_OFFICIAL, 'ohio', 1913, 1965, None, ()),
+    ('Ohio App. 2d', 'Ohio Appellate Reports, Second Series', STATE_OFFICIAL, 'ohio', 1965, 1982, None, ()),
+    ('Ohio App. 3d', 'Ohio Appellate Reports, Third Series', STATE_OFFICIAL, 'ohio', 1982, None, None, ()),
+    ('Okla.', 'Oklahoma Reports', STATE_OFFICIAL, 'okla', 1890, 1953, None, ()),
+    ('Okla. Crim.', 'Oklahoma Criminal Reports', STATE_OFFICIAL, 'okla', 1908, 1953, None, ()),
+    ('Or.', 'Oregon Reports', STATE_OFFICIAL, 'or', 1853, None, None, ('Ore.',)),
+    ('Or. App.', 'Oregon Court of Appeals Reports', STATE_OFFICIAL, 'or', 1969, None, None, ('Ore. App.',)),
+    ('Pa.', 'Pennsylvania State Reports', STATE_OFFICIAL, 'pa', 1845, None, None, ()),
+    ('Pa. Super.', 'Pennsylvania Superior Court Reports', STATE_OFFICIAL, 'pa', 1895, 1997, None, ()),
+    ('Pa. Commw.', 'Pennsylvania Commonwealth Court Reports', STATE_OFFICIAL, 'pa', 1970, 1994, None, ('Pa. Cmwlth.',)),
+    ('R.I.', 'Rhode Island Reports', STATE_OFFICIAL, 'ri', 1828, 1980, None, ()),
+    ('S.C.', 'South Carolina Reports', STATE_OFFICIAL, 'sc', 1868, None, None, ()),
+    ('S.D.', 'South Dakota Reports', STATE_OFFICIAL, 'sd', 1890, 1976, None, ()),
+    ('Tenn.', 'Tennessee Reports', STATE_OFFICIAL, 'tenn', 1791, 1971, None, ()),
+    ('Tenn. App.', 'Tennessee Appeals Reports', STATE_OFFICIAL, 'tenn', 1925, 1971, None, ()),
+    ('Tenn. Crim. App.', 'Tennessee Criminal Appeals Reports', STATE_OFFICIAL, 'tenn', 1967, 1971, None, ()),
+    ('Tex.', 'Texas Reports', STATE_OFFICIAL, 'tex', 1846, 1962, None, ()),
+    ('Tex. App.', 'Texas Court of Appeals Reports', STATE_OFFICIAL, 'tex', 1876, 1892, None, ()),
+    ('Tex. Civ. App.', 'Texas Civil Appeals Reports', STATE_OFFICIAL, 'tex', 1892, 1911, None, ()),
+    ('Tex. Crim.', 'Texas Criminal Reports', STATE_OFFICIAL, 'tex', 1876, 1962, None, ('Tex. Crim. App.', 'Tex. Cr. R.')),
+    ('Utah', 'Utah Reports', STATE_OFFICIAL, 'utah', 1855, 1950, None, ()),
+    ('Utah 2d', 'Utah Reports, Second Series', STATE_OFFICIAL, 'utah', 1953, 1974, None, ()),
+    ('Vt.', 'Vermont Reports', STATE_OFFICIAL, 'vt', 1826, None, None, ()),
+    ('Va.', 'Virginia Reports', STATE_OFFICIAL, 'va', 1790, None, None, ()),
+    ('Va. App.', 'Virginia Court of Appeals Reports', STATE_OFFICIAL, 'va', 1985, None, None, ()),
+    ('Wash.', 'Washington Reports', STATE_OFFICIAL, 'wash', 1889, 1939, None, ('Wn.',)),
+    ('Wash. 2d', 'Washington Reports, Second Series', STATE_OFFICIAL, 'wash', 1939, None, None, ('Wn.2d',)),
+    ('Wash. App.', 'Washington Appellate Reports', STATE_OFFICIAL, 'wash', 1969, None, None, ('Wn. App.',)),
+    ('Wash. App. 2d', 'Washington Appellate Reports, Second Series', STATE_OFFICIAL, 'wash', 2017, None, None,
+     ('Wn. App. 2d',)),
+    ('W. Va.', 'West Virginia Reports', STATE_OFFICIAL, 'wva', 1864, None, None, ()),
+    ('Wis.', 'Wisconsin Reports', STATE_OFFICIAL, 'wis', 1853, 1957, None, ()),
+    ('Wis. 2d', 'Wisconsin Reports, Second Series', STATE_OFFICIAL, 'wis', 1957, None, None, ()),
+    ('Wyo.', 'Wyoming Reports', STATE_OFFICIAL, 'wyo', 1870, 1959, None, ()),
+)
+
+# Series whose start and end years are those of their first and last volumes. Other
+# years in the table are approximate (official state reports often begin with renumbered
+# nominative volumes decades earlier), so citations in them are never rejected by year
+_DATES_CHECKED = frozenset((
+    'S. Ct.', 'L. Ed. 2d',
+    'F.', 'F.2d', 'F.3d', 'F.4th', 'F. Supp.', 'F. Supp. 2d', 'F. Supp. 3d', "F. App'x", 'B.R.',
+    'A.', 'A.2d', 'A.3d', 'N.E.', 'N.E.2d', 'N.E.3d', 'N.W.', 'N.W.2d', 'P.', 'P.2d', 'P.3d',
+    'S.E.', 'S.E.2d', 'S.W.', 'S.W.2d', 'S.W.3d', 'So.', 'So. 2d', 'So. 3d',
+    'Cal. Rptr.', 'Cal. Rptr. 2d', 'Cal. Rptr. 3d', 'N.Y.S.2d',
+    'Ill.', 'Ind.', 'Ky.', 'Mass.', 'Miss.',
+))
+
+# Ceilings on volumes published per year for open series, roughly twice the observed
+# rate (U.S. Reports averages 2.6 a year since 1790, F. Supp. 3d about 60), so the
+# bound they give is far beyond any real volume but rules out "999 U.S. 999"
+_VOLUMES_PER_YEAR = {
+    'U.S.': 4, 'S. Ct.': 2, 'L. Ed. 2d': 12,
+    'F.4th': 60, 'F. Supp. 3d': 120, 'F.R.D.': 15, 'B.R.': 40,
+    'A.3d': 60, 'N.E.3d': 60, 'P.3d': 60, 'S.W.3d': 60, 'So. 3d': 60,
+    'Cal. Rptr. 3d': 40, 'Cal. 5th': 10, 'Cal. App. 5th': 40, 'N.Y.3d': 10, 'N.Y.S.3d': 60,
+}
+
+_EDITION_RE = re.compile(r'\s*(\d)(?:d|th)$')
+_SQUASH_TABLE = str.maketrans('', '', " .'")
+_ORDINAL_RE = re.compile(r'(\d)(?:nd|rd)$')
+
+
+def squash(reporter):
+    """Lookup key for a reporter spelling: lower-case, no spaces, periods or apostrophes, '2nd' -> '2d'"""
+    return _ORDINAL_RE.sub(r'\1d', reporter.translate(_SQUASH_TABLE).lower())
+
+
+def _build():
+    by_key = {}
+    for abbreviation, name, tier, jurisdiction, start_year, end_year, max_volume, variants in _TABLE:
+        edition = _EDITION_RE.search(abbreviation.replace('.', ''))
+        series = _EDITION_RE.sub('', abbreviation) if edition else abbreviation
+        reporter = Reporter(abbreviation, name, series.rstrip(), int(edition.group(1)) if edition else 1,
+                            tier, jurisdiction, max_volume=max_volume, start_year=start_year, end_year=end_year,
+                            volumes_per_year=_VOLUMES_PER_YEAR.get(abbreviation),
+                            dates_checked=abbreviation in _DATES_CHECKED)
+        for spelling in (abbreviation,) + variants:
+            key = squash(spelling)
+            if by_key.get(key, reporter) != reporter:
+                raise ValueError(f'Reporter spelling {spelling!r} is ambiguous')
+            by_key[key] = reporter
+    return MappingProxyType(by_key)
+
+
+# squashed spelling -> Reporter, for every canonical abbreviation and known variant
+REPORTERS = _build()
+
+
+def _preference_order():
+    reporters = list(dict.fromkeys(REPORTERS.values()))
+    series_order = {}
+    for reporter in reporters:
+        series_order.setdefault(reporter.series, len(series_order))
+    reporters.sort(key=lambda reporter: (reporter.tier, series_order[reporter.series], -reporter.edition))
+    return tuple(reporter.abbreviation for reporter in reporters)
+
+
+# Canonical abbreviations in citation preference order: by tier, then series in table
+# order with the newest edition first
+PREFERENCE_ORDER = _preference_order()
+
+
+# Canonical abbreviation -> position in PREFERENCE_ORDER (lower is preferred)
+PREFERENCE_RANK = MappingProxyType({abbreviation: i for i, abbreviation in enumerate(PREFERENCE_ORDER)})
+UNRANKED = len(PREFERENCE_ORDER)
+
+
+def lookup(reporter):
+    """The Reporter for any known spelling ("us", "F. Supp. 2d", "N.E.2nd"), or None"""
+    return REPORTERS.get(squash(reporter))
+
+
+@lru_cache(maxsize=2048)
+def normalize_reporter(reporter):
+    """Canonical abbreviation for a known reporter spelling; unknown reporters are returned unchanged"""
+    found = REPORTERS.get(squash(reporter))
+    return found.abbreviation if found else reporter
+
+
+@lru_cache(maxsize=2048)
+def reporter_rank(reporter):
+    """Preference rank of any reporter spelling; unknown reporters rank last (UNRANKED)"""
+    found = REPORTERS.get(squash(reporter))
+    return PREFERENCE_RANK[found.abbreviation] if found else UNRANKED
+
+
+def impossibility(volume, reporter, page, year=None, current_year=None):
+    """
+    Why a volume / reporter / page citation (with its parenthetical year, if any)
+    cannot exist, judged from the reporter table alone - or None if it might.
+    Unknown reporters are never judged, and the year only rules a citation out in
+    series whose dates have been checked (Reporter.dates_checked).
+
+    Args:
+        volume, page (str or int): Citation volume and first page
+        reporter (str): Any reporter spelling
+        year (str or int): Year from the citation's parenthetical
+        current_year (int): Year to judge open series against (default: this year)
+    """
+    found = lookup(reporter)
+    if found is None:
+        return None
+    volume, page = int(volume), int(page)
+    current_year = current_year or datetime.date.today().year
+    label = f"{volume} {found.abbreviation} {page}"
+
+    if volume < found.min_volume:
+        return f"{label} cannot exist: {found.name} volumes start at {found.min_volume}"
+    if found.max_volume is not None and volume > found.max_volume:
+        return (f"{label} cannot exist: {found.name} ended at volume {found.max_volume}"
+                f"{f' in {found.end_year}' if found.end_year else ''}")
+    latest = found.latest_possible_volume(current_year)
+    if latest is not None and volume > latest:
+        return (f"{label} cannot exist: {found.name} has not reached volume {volume} "
+                f"(at most about {latest} by {current_year})")
+    if page < 1:
+        return f"{label} cannot exist: pages start at 1"
+    if year is not None:
+        year = int(year)
+        # Series change over mid-year, so allow a year's slack either side
+        if year > current_year:
+            return f"{label} cannot exist: it is dated {year}, which is in the future"
+        if not found.dates_checked:
+            return None
+        if found.start_year is not None and year < found.start_year - 1:
+            return f"{label} cannot exist: {found.name} began in {found.start_year}, but it is dated {year}"
+        if found.end_year is not None and year > found.end_year + 1:
+            return f"{label} cannot exist: {found.name} ended in {found.end_year}, but it is dated {year}"
+    return None
+
+
+def levenshtein(a, b):
+    """Edit distance with unit-cost insertions, deletions and substitutions"""
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def osa_distance(a, b):
+    """Optimal string alignment distance: Levenshtein plus adjacent transpositions ("pd2" -> "p2d" is 1)"""
+    rows = [list(range(len(b) + 1))]
+    for i, char_a in enumerate(a, 1):
+        row = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = min(rows[-1][j] + 1, row[j - 1] + 1, rows[-1][j - 1] + (char_a != char_b))
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                cost = min(cost, rows[-2][j - 2] + 1)
+            row.append(cost)
+        rows.append(row)
+    return rows[-1][-1]
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over strings under Levenshtein distance.
+
+    Each child hangs off its parent by its distance to it, so the triangle
+    inequality limits a search within d of the query to the children whose edge
+    lies within d of the query's distance to the parent. Levenshtein rather than
+    OSA keys the tree because OSA is not a metric.
+    """
+
+    def __init__(self, words=()):
+        self._root = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        if self._root is None:
+            self._root = (word, {})
+            return
+        node = self._root
+        while True:
+            distance = levenshtein(word, node[0])
+            if distance == 0:
+                return
+            if distance not in node[1]:
+                node[1][distance] = (word, {})
+                return
+            node = node[1][distance]
+
+    def search(self, word, max_distance):
+        """Every (distance, stored word) within max_distance of word"""
+        found = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            stored, children = stack.pop()
+            distance = levenshtein(word, stored)
+            if distance <= max_distance:
+                found.append((distance, stored))
+            stack.extend(child for edge, child in children.items()
+                         if distance - max_distance <= edge <= distance + max_distance)
+        return found
+
+
+# Every known squashed spelling, for typo correction
+SPELLING_TREE = BKTree(sorted(REPORTERS))
+
+# Statutes, regulations and treaties cited in the volume-reporter-page shape ("42 U.S.C.
+# 1983", "86 Stat. 816", "Cal. Civ. Code 1714") - never mistaken for reporter typos
+_NOT_REPORTERS = frozenset(squash(abbreviation) for abbreviation in (
+    'U.S.C.', 'U.S.C.A.', 'U.S.C.S.', 'C.F.R.', 'Stat.', 'Pub. L.', 'Fed. Reg.', 'U.S.T.', 'T.I.A.S.',
+    'U.N.T.S.', 'I.L.M.'))
+_STATUTE_WORD_RE = re.compile(r'code|stat|laws|regs?$|rules?$|const')
+
+
+def is_statute(reporter):
+    """Whether a volume-reporter-page "reporter" is really a statute, regulation or treaty ("U.S.C.")"""
+    key = squash(reporter)
+    return key not in REPORTERS and (key in _NOT_REPORTERS or bool(_STATUTE_WORD_RE.search(key)))
+
+
+def _typo_budget(key):
+    """Edits tolerated in an unknown spelling; short abbreviations are too close together for any"""
+    if len(key) < 3:
+        return 0
+    return 1 if len(key) <= 5 else 2
+
+
+@lru_cache(maxsize=2048)
+def _typo_candidates(key):
+    """(OSA distance, canonical abbreviation) of every reporter within the typo budget, closest first"""
+    budget = _typo_budget(key)
+    if key in REPORTERS or is_statute(key) or budget == 0:
+        return ()
+    # A transposition costs two under Levenshtein, so search one wider and rerank by OSA
+    best = {}
+    for _, spelling in SPELLING_TREE.search(key, budget + 1):
+        distance = osa_distance(key, spelling)
+        abbreviation = REPORTERS[spelling].abbreviation
+        if distance <= budget and distance < best.get(abbreviation, budget + 1):
+            best[abbreviation] = distance
+    return tuple(sorted(((distance, abbreviation) for abbreviation, distance in best.items()),
+                        key=lambda candidate: (candidate[0], PREFERENCE_RANK[candidate[1]])))
+
+
+def reporter_suggestions(reporter):
+    """
+    Known reporters an unknown spelling may be a typo of ("F.5d" -> F.3d, F.2d,
+    ...), closest first and preferred reporters first among equals. Empty for
+    known spellings, statutes and regulations, and those too far from every
+    reporter. An unknown spelling may also be a real reporter the table lacks, so
+    these are only ever offered alongside an upstream answer.
+    """
+    return tuple(abbreviation for _, abbreviation in _typo_candidates(squash(reporter)))
+
+
+def correct_reporter(reporter):
+    """
+    The canonical abbreviation an unknown spelling is unambiguously a typo of - the
+    one reporter at the smallest distance ("PD2" -> "P.2d", "F.3dd" -> "F.3d") -
+    or None when the spelling is known, too far from every reporter, or equally
+    close to several. The correction is a guess until CourtListener confirms it.
+    """
+    candidates = _typo_candidates(squash(reporter))
+    if not candidates or (len(candidates) > 1 and candidates[0][0] == candidates[1][0]):
+        return None
+    return candidates[0][1]
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Citation Checker Transport
+Upstream request policy for CitationChecker: per-API-key rate limiting, 429 handling,
+timeouts, retries with jittered backoff and hedged requests
+"""
+
+import email.utils
+import hashlib
+import math
+import random
+import threading
+import time
+from collections import deque
+
+# Responses worth retrying for idempotent requests: the upstream or a proxy hiccuped
+RETRYABLE_STATUSES = frozenset([500, 502, 503, 504])
+
+
+def retry_after_seconds(headers, now=None):
+    """
+    Seconds to wait according to a Retry-After header (delta-seconds or HTTP date).
+    Returns None when the header is missing or unparseable.
+    """
+    value = headers.get('Retry-After')
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (time.time() if now is None else now))
+
+
+class TokenBucket:
+    """
+    Token bucket that queues callers instead of rejecting them.
+
+    reserve() always takes a token, letting the balance go negative, and returns
+    how long the caller must wait before sending; callers therefore leave in
+    arrival order at exactly the configured rate. Upstream feedback (rate-limit
+    headers and 429 Retry-After) tightens the schedule for everyone sharing the
+    bucket.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic):
+        """
+        Args:
+            rate (float): Sustained requests per second
+            capacity (float): Burst size (tokens available when idle)
+            clock (callable): Time source, injectable for tests
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.tokens = capacity
+        self.updated = clock()
+        self.blocked_until = 0.0
+        self.upstream_limit = None
+        self.upstream_remaining = None
+        self.upstream_reset_at = None
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self):
+        """Take a token and return the number of seconds to wait before using it"""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def observe(self, status_code, headers):
+        """Fold an upstream response's rate-limit signals into the schedule"""
+        with self._lock:
+            now = self.clock()
+            limit = headers.get('X-RateLimit-Limit')
+            remaining = headers.get('X-RateLimit-Remaining')
+            reset = headers.get('X-RateLimit-Reset')
+            if limit is not None and limit.isdigit():
+                self.upstream_limit = int(limit)
+            if reset is not None and reset.replace('.', '', 1).isdigit():
+                reset = float(reset)
+                # Either an epoch timestamp or seconds from now
+                self.upstream_reset_at = now + (reset - time.time() if reset > 1e9 else reset)
+            if remaining is not None and remaining.isdigit():
+                self.upstream_remaining = int(remaining)
+                if self.upstream_remaining == 0 and self.upstream_reset_at is not None:
+                    self.blocked_until = max(self.blocked_until, self.upstream_reset_at)
+                else:
+                    # Never hold more local tokens than the server says we have left
+                    self.tokens = min(self.tokens, self.upstream_remaining)
+
+            if status_code == 429:
+                self.throttled += 1
+                delay = retry_after_seconds(headers)
+                if delay is not None:
+                    self.blocked_until = max(self.blocked_until, now + delay)
+            return max(0.0, self.blocked_until - now)
+
+    def budget(self):
+        """Current state of the schedule, for reporting"""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            return {
+                'rate_per_second': self.rate,
+                'capacity': self.capacity,
+                'available': max(0.0, self.tokens),
+                'queued': math.ceil(-self.tokens) if self.tokens < 0 else 0,
+                'blocked_for': max(0.0, self.blocked_until - now),
+                'upstream_limit': self.upstream_limit,
+                'upstream_remaining': self.upstream_remaining,
+                'upstream_reset_in': (max(0.0, self.upstream_reset_at - now)
+                                      if self.upstream_reset_at is not None else None),
+                'throttled': self.throttled,
+            }
+
+
+class RateLimiter:
+    """
+    Per-API-key token buckets, shared by every checker that sends upstream requests.
+
+    CourtListener throttles each token separately, so each key gets its own
+    bucket; keys are held only as SHA-256 digests.
+    """
+
+    def __init__(self, rate=5000 / 3600, capacity=60, clock=time.monotonic):
+        """
+        Args:
+            rate (float): Sustained requests per second per key (default: 5,000 per hour)
+            capacity (float): Burst size per key
+            clock (callable): Time source, injectable for tests
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, api_key):
+        digest = hashlib.sha256(api_key.encode('utf-8')).hexdigest()
+        with self._lock:
+            bucket = self._buckets.get(digest)
+            if bucket is None:
+                bucket = self._buckets[digest] = TokenBucket(self.rate, self.capacity, clock=self.clock)
+            return bucket
+
+    def budget(self, api_key):
+        return self.bucket(api_key).budget()
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies with quantile lookup"""
+
+    def __init__(self, window=200):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+
+    def quantile(self, q):
+        """The q-quantile (0..1) of the window, or None when empty"""
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class TransportPolicy:
+    """
+    How one lookup strategy talks to CourtListener.
+
+    Every request gets separate connect and read timeouts. Idempotent requests
+    (GET) that fail with a connection error, timeout or 5xx are retried up to
+    `retries` times with full-jitter exponential backoff. With `hedge` on, a GET
+    still unanswered after the strategy's recent p95 latency (or a fixed
+    `hedge_after`) gets a second, identical request and the first answer wins.
+    """
+
+    def __init__(self, connect_timeout=3.05, read_timeout=20.0, retries=2, backoff=0.25,
+                 max_backoff=4.0, hedge=False, hedge_after=None, hedge_quantile=0.95,
+                 hedge_min_samples=20):
+        """
+        Args:
+            connect_timeout (float): Seconds to establish a connection
+            read_timeout (float): Seconds to wait for each chunk of the response
+            retries (int): Extra attempts for idempotent requests
+            backoff (float): Base backoff in seconds, doubled per attempt
+            max_backoff (float): Cap on a single backoff sleep
+            hedge (bool): Send a second request when the first is slow
+            hedge_after (float): Fixed hedge delay; default is the observed latency quantile
+            hedge_quantile (float): Latency quantile that triggers a hedge (default p95)
+            hedge_min_samples (int): Samples needed before the quantile is trusted
+        """
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.latency = LatencyTracker()
+
+    @property
+    def timeout(self):
+        return (self.connect_timeout, self.read_timeout)
+
+    def can_retry(self, method, attempt):
+        return method.upper() == 'GET' and attempt < self.retries
+
+    def backoff_delay(self, attempt):
+        """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def hedge_delay(self, method):
+        """Seconds to wait before hedging this request, or None to not hedge"""
+        if not self.hedge or method.upper() != 'GET':
+            return None
+        if self.hedge_after is not None:
+            return self.hedge_after
+        if len(self.latency) < self.hedge_min_samples:
+            return None
+        return self.latency.quantile(self.hedge_quantile)
+
+
+class Deadline:
+    """
+    Total time budget for one check, shared by every strategy and request it makes.
+
+    Requests get at most the remaining budget as their timeouts, no retry, backoff
+    or rate-limit wait is started past it, and a strategy that is not expected to
+    finish in what is left is skipped. The budget caps each connect and each read,
+    not a whole response: neither HTTP client has a total-response timeout, so a
+    server trickling a body can still overrun it by up to one read timeout. Strategies that
+    were skipped or cut short are listed in `missed`; a check with any missed
+    strategy returns a partial (degraded) result.
+    """
+
+    def __init__(self, seconds, clock=time.monotonic):
+        """
+        Args:
+            seconds (float): Total budget from now
+            clock (callable): Time source, injectable for tests
+        """
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds
+        self.missed = []
+
+    def remaining(self):
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+    def allows(self, strategy, policy):
+        """
+        Whether a strategy can still be started: some budget must be left and, once
+        the policy has enough latency samples, at least its median latency.
+        Records the strategy as missed when it can't.
+        """
+        remaining = self.remaining()
+        if remaining > 0 and (len(policy.latency) < policy.hedge_min_samples
+                              or remaining >= policy.latency.quantile(0.5)):
+            return True
+        self.miss(strategy)
+        return False
+
+    def miss(self, strategy):
+        if strategy not in self.missed:
+            self.missed.append(strategy)
+
+    def timeout(self, policy):
+        """The policy's (connect, read) timeouts, capped at the remaining budget"""
+        # HTTP clients reject a zero timeout; a request this late fails straight away
+        remaining = max(self.remaining(), 0.001)
+        return (min(policy.connect_timeout, remaining), min(policy.read_timeout, remaining))
+
+
+def default_transport_policies():
+    """
+    Fresh per-strategy defaults, keyed by the result 'search_type' each strategy
+    reports. Every checker gets its own, so latency samples (and the hedge and
+    deadline thresholds drawn from them) never mix across checkers or API keys.
+    The Citation Lookup API is a POST, so it is never retried or hedged.
+    """
+    return {
+        'citation_lookup': TransportPolicy(read_timeout=30.0, retries=0),
+        'citation_parts': TransportPolicy(),
+        'enhanced_search': TransportPolicy(),
+    }
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""
+Shared pytest fixtures
+"""
+
+import pytest
+
+from fake_courtlistener import FakeCourtListener
+
+
+@pytest.fixture
+def fake():
+    """A local CourtListener stand-in serving the bundled well-known cases"""
+    with FakeCourtListener() as server:
+        yield server
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Fake CourtListener Server
+Local stand-in for the CourtListener API v4 used by the offline tests and benchmarks
+"""
+
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+# A handful of well-known cases, keyed by their official citation
+CASES = [
+    {
+        'caseName': 'Roe v. Wade',
+        'court': 'Supreme Court of the United States',
+        'dateFiled': '1973-01-22',
+        'citation': ['410 U.S. 113', '93 S. Ct. 705', '35 L. Ed. 2d 147'],
+        'absolute_url': '/opinion/108713/roe-v-wade/',
+        'citeCount': 5000,
+        'precedentialStatus': 'Published',
+    },
+    {
+        'caseName': 'Brown v. Board of Education',
+        'court': 'Supreme Court of the United States',
+        'dateFiled': '1954-05-17',
+        'citation': ['347 U.S. 483', '74 S. Ct. 686', '98 L. Ed. 873'],
+        'absolute_url': '/opinion/105221/brown-v-board-of-education/',
+        'citeCount': 4000,
+        'precedentialStatus': 'Published',
+    },
+    {
+        'caseName': 'Miranda v. Arizona',
+        'court': 'Supreme Court of the United States',
+        'dateFiled': '1966-06-13',
+        'citation': ['384 U.S. 436', '86 S. Ct. 1602', '16 L. Ed. 2d 694'],
+        'absolute_url': '/opinion/107252/miranda-v-arizona/',
+        'citeCount': 3500,
+        'precedentialStatus': 'Published',
+    },
+    {
+        'caseName': 'People v. Green',
+        'court': 'California Supreme Court',
+        'dateFiled': '1980-01-29',
+        'citation': ['27 Cal. 3d 1', '609 P.2d 468'],
+        'absolute_url': '/opinion/1187047/people-v-green/',
+        'citeCount': 900,
+        'precedentialStatus': 'Published',
+    },
+]
+
+CITATION_RE = re.compile(r'(\d+)\s+([A-Za-z][A-Za-z0-9. ]*?)\s+(\d+)(?!\w)')
+
+
+def squash(text):
+    """Lower-case and drop spaces/periods so '410 US 113' == '410 U.S. 113'"""
+    return re.sub(r'[\s.]+', '', text).lower()
+
+
+def _split_citation(citation):
+    parts = citation.split()
+    return {'volume': parts[0], 'reporter': ' '.join(parts[1:-1]), 'page': parts[-1]}
+
+
+def _cluster(case):
+    """Render a search-style case as a citation-lookup cluster"""
+    return {
+        'case_name': case['caseName'],
+        'date_filed': case['dateFiled'],
+        'citations': [_split_citation(c) for c in case['citation']],
+        'absolute_url': case['absolute_url'],
+        'citation_count': case['citeCount'],
+        'slug': case['absolute_url'].rstrip('/').split('/')[-1],
+        'precedential_status': case['precedentialStatus'],
+        'docket': {'court': case['court']},
+    }
+
+
+class FakeCourtListener:
+    """
+    Threaded HTTP/1.1 server speaking just enough of the CourtListener API.
+
+    Knobs:
+        delay: seconds to sleep before answering every request
+        path_delays: extra seconds to sleep per path prefix, e.g. a slower
+            citation-lookup endpoint
+        handshake_delay: seconds to sleep once per new TCP connection, standing
+            in for the TCP+TLS setup cost of the real service
+        script: list of (path_prefix, status, headers, body) tuples returned
+            (and consumed) before normal handling of a matching request
+        stalls: list of (path_prefix, seconds) tuples; the next matching request
+            sleeps that long before being answered normally
+    """
+
+    def __init__(self, cases=None, delay=0.0, handshake_delay=0.0, path_delays=None):
+        self.cases = list(cases if cases is not None else CASES)
+        self.delay = delay
+        self.path_delays = dict(path_delays or {})
+        self.handshake_delay = handshake_delay
+        self.script = []
+        self.stalls = []
+        self.hits = {}
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        fake = self
+
+        class Handler(_Handler):
+            server_state = fake
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def count(self, path_prefix=''):
+        """Number of requests received whose path starts with path_prefix"""
+        with self._lock:
+            return sum(n for path, n in self.hits.items() if path.startswith(path_prefix))
+
+    def _record(self, path):
+        with self._lock:
+            self.hits[path] = self.hits.get(path, 0) + 1
+            for i, (prefix, seconds) in enumerate(self.stalls):
+                if path.startswith(prefix):
+                    del self.stalls[i]
+                    break
+            else:
+                seconds = 0
+            for i, (prefix, status, headers, body) in enumerate(self.script):
+                if path.startswith(prefix):
+                    del self.script[i]
+                    return seconds, (status, headers, body)
+        return seconds, None
+
+    def _find(self, citation):
+        key = squash(citation)
+        for case in self.cases:
+            if any(squash(c) == key for c in case['citation']):
+                return case
+        return None
+
+    def citation_lookup(self, text):
+        results = []
+        for match in CITATION_RE.finditer(text):
+            citation = match.group(0)
+            case = self._find(citation)
+            results.append({
+                'citation': citation,
+                'normalized_citations': case['citation'][:1] if case else [],
+                'start_index': match.start(),
+                'end_index': match.end(),
+                'status': 200 if case else 404,
+                'error_message': '' if case else 'Citation not found.',
+                'clusters': [_cluster(case)] if case else [],
+            })
+        return results
+
+    def search(self, query):
+        fielded = re.match(r'^caseName:\((.*)\)$', query)
+        cited = re.match(r'^citation:"(.*)"$', query)
+        if cited:
+            case = self._find(cited.group(1))
+            results = [case] if case else []
+        else:
+            words = re.findall(r'\w+', (fielded.group(1) if fielded else query).lower())
+            words = [w for w in words if w not in ('v', 'vs')]
+            results = [
+                case for case in self.cases
+                if words and all(w in case['caseName'].lower() for w in words)
+            ]
+            if not fielded and not results:
+                # Broad search is looser: any word will do
+                results = [
+                    case for case in self.cases
+                    if any(w in case['caseName'].lower() for w in words)
+                ]
+        return {'count': len(results), 'results': results}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server_state = None
+
+    def setup(self):
+        super().setup()
+        fake = self.server_state
+        with fake._lock:
+            fake.connections += 1
+        if fake.handshake_delay:
+            time.sleep(fake.handshake_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload, headers=None):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, params):
+        fake = self.server_state
+        with fake._lock:
+            fake.in_flight += 1
+            fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+        try:
+            self._respond(params)
+        finally:
+            with fake._lock:
+                fake.in_flight -= 1
+
+    def _respond(self, params):
+        fake = self.server_state
+        path = urlparse(self.path).path
+        stall, scripted = fake._record(path)
+        stall += sum(seconds for prefix, seconds in fake.path_delays.items() if path.startswith(prefix))
+        if fake.delay or stall:
+            time.sleep(fake.delay + stall)
+        if scripted:
+            status, headers, body = scripted
+            return self._reply(status, body if body is not None else {'detail': 'scripted'}, headers)
+
+        if path.endswith('/citation-lookup/'):
+            return self._reply(200, fake.citation_lookup(params.get('text', [''])[0]))
+        if path.endswith('/search/'):
+            return self._reply(200, fake.search(params.get('q', [''])[0]))
+        return self._reply(404, {'detail': 'Not found.'})
+
+    def do_GET(self):
+        self._handle(parse_qs(urlparse(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode() if length else ''
+        self._handle(parse_qs(body))
+
+
+if __name__ == '__main__':
+    with FakeCourtListener() as fake:
+        print(f"Fake CourtListener listening on {fake.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -6,12 +6,16 @@ setup(
     description="A case law citation checker using the CourtListener API",
     author="Your Name",
     author_email="your.email@example.com",
-    py_modules=["citecheck"],
+    py_modules=["citecheck", "citecheck_async", "citecheck_cache", "citecheck_index", "citecheck_match", "citecheck_metrics", "citecheck_parse", "citecheck_reporters", "citecheck_transport"],
     install_requires=[
         "requests>=2.31.0",
         "python-dotenv>=1.0.0",
         "click>=8.1.0",
     ],
+    extras_require={
+        "async": ["httpx>=0.24.0"],
+        "fast": ["rapidfuzz>=3.0.0", "numpy>=1.21"],
+    },
     entry_points={
         "console_scripts": [
             "citecheck=citecheck:main",
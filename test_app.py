@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the Flask app, run against the fake CourtListener server
+"""
+
+import pytest
+
+import app as webapp
+from app import CheckerRegistry
+from citecheck import CitationChecker
+
+
+class _Checker:
+    def __init__(self, api_key):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def client(fake, monkeypatch):
+    registry = CheckerRegistry(lambda api_key: CitationChecker(api_key, base_url=fake.url))
+    monkeypatch.setattr(webapp, 'checkers', registry)
+    return webapp.app.test_client()
+
+
+def test_registry_reuses_checker_per_key():
+    registry = CheckerRegistry(_Checker)
+    first = registry.get('key-one')
+    assert registry.get('key-one') is first
+    assert registry.get('key-two') is not first
+    assert len(registry) == 2
+
+
+def test_registry_never_stores_keys_in_clear():
+    registry = CheckerRegistry(_Checker)
+    registry.get('super-secret-token')
+    assert all('super-secret-token' not in digest for digest in registry._checkers)
+
+
+def test_registry_evicts_least_recently_used():
+    registry = CheckerRegistry(_Checker, max_size=2)
+    first = registry.get('a')
+    registry.get('b')
+    registry.get('a')
+    registry.get('c')  # evicts 'b', the least recently used
+    assert registry.get('a') is first
+    assert len(registry) == 2
+
+
+def test_registry_evicts_idle_checkers():
+    registry = CheckerRegistry(_Checker, idle_seconds=0)
+    first = registry.get('a')
+    assert registry.get('a') is not first
+    assert first.closed
+
+
+def test_api_check(client):
+    response = client.post('/api/check', json={'citation': '410 U.S. 113'},
+                           headers={'X-API-Key': 'test-key'})
+    assert response.status_code == 200
+    assert response.get_json()['cases'][0]['name'] == 'Roe v. Wade'
+
+
+def test_api_check_requires_key(client):
+    response = client.post('/api/check', json={'citation': '410 U.S. 113'})
+    assert response.status_code == 401
+
+
+def test_api_check_batch(client, fake):
+    response = client.post('/api/check-batch',
+                           json={'citations': ['410 U.S. 113', '347 U.S. 483', '499 U.S. 999']},
+                           headers={'X-API-Key': 'test-key'})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['total'] == 3
+    assert [r['status'] for r in body['results']] == ['valid', 'valid', 'invalid']
+    assert body['results'][2]['input'] == '499 U.S. 999'
+    assert fake.count('/api/rest/v4/citation-lookup/') == 1
+
+
+def test_api_check_batch_requires_list(client):
+    response = client.post('/api/check-batch', json={'citations': '410 U.S. 113'},
+                           headers={'X-API-Key': 'test-key'})
+    assert response.status_code == 400
+
+
+def test_api_check_document(client):
+    response = client.post('/api/check-document',
+                           json={'text': 'See Roe v. Wade, 410 U.S. 113 (1973).'},
+                           headers={'X-API-Key': 'test-key'})
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['summary'] == {'total': 2, 'unique': 2, 'valid': 2, 'invalid': 0, 'uncertain': 0, 'error': 0}
+    assert body['annotations']['17-29']['text'] == '410 U.S. 113'
+
+
+def test_metrics(client, monkeypatch):
+    monkeypatch.setattr(webapp, 'metrics', webapp.CheckerMetrics())
+    webapp.metrics.upstream_seconds.observe(0.2, strategy='citation_lookup')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert 'citecheck_upstream_request_seconds_count{strategy="citation_lookup"} 1' in response.get_data(as_text=True)
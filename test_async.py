@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Offline tests for AsyncCitationChecker, run against the fake CourtListener server
+"""
+
+import asyncio
+import inspect
+
+from citecheck import CitationChecker
+from citecheck_async import AsyncCitationChecker
+
+INPUTS = [
+    '410 U.S. 113',       # citation lookup hit
+    '347 US 483',         # citation lookup hit, unnormalized reporter
+    '499 U.S. 999',       # lookup miss, parts search miss
+    'Roe v. Wade',        # fielded case-name search
+    'Miranda v. Texas',   # broad search, poor match -> uncertain
+    'Green',              # broad search fallback
+]
+
+
+def _check_all(fake, citations, **kwargs):
+    async def run():
+        async with AsyncCitationChecker('test-key', base_url=fake.url, **kwargs) as checker:
+            return await checker.check_many(citations)
+    return asyncio.run(run())
+
+
+def test_matches_sync_results(fake):
+    sync_checker = CitationChecker('test-key', base_url=fake.url)
+    expected = [sync_checker.check_citation(citation) for citation in INPUTS]
+    assert _check_all(fake, INPUTS) == expected
+
+
+def test_fallback_chain(fake):
+    roe, _, fake_cite, _, miranda, green = _check_all(fake, INPUTS)
+    assert roe['search_type'] == 'citation_lookup'
+    assert fake_cite['status'] == 'invalid'
+    assert miranda['status'] == 'uncertain'
+    assert green['cases'][0]['name'] == 'People v. Green'
+
+
+def test_concurrency_limit(fake):
+    fake.delay = 0.05
+
+    async def run():
+        async with AsyncCitationChecker('test-key', base_url=fake.url, max_concurrency=3) as checker:
+            return await asyncio.gather(*(checker.check_citation('410 U.S. 113') for _ in range(12)))
+
+    results = asyncio.run(run())
+    assert all(result['status'] == 'valid' for result in results)
+    assert fake.max_in_flight == 3
+
+
+def test_check_many_batches_citation_lookups(fake):
+    results = _check_all(fake, ['410 U.S. 113', '347 U.S. 483', '499 U.S. 999', 'Roe v. Wade'])
+    assert [result['status'] for result in results] == ['valid', 'valid', 'invalid', 'valid']
+    assert fake.count('/api/rest/v4/citation-lookup/') == 1
+
+
+def test_reporter_corrections_are_confirmed_upstream(fake):
+    corrected, typo, statute = _check_all(fake, ['609 PD2 468', '12 F.5d 34', '42 U.S.C. 1983'])
+    assert (corrected['status'], corrected['corrected_citation']) == ('valid', '609 P.2d 468')
+    assert (typo['status'], typo['suggestions'][0]) == ('invalid', '12 F.3d 34')
+    assert 'suggestions' not in statute
+
+
+def test_check_document(fake):
+    text = 'See Roe v. Wade, 410 U.S. 113 (1973), and 347 U.S. 483.'
+
+    async def run():
+        async with AsyncCitationChecker('test-key', base_url=fake.url) as checker:
+            return await checker.check_document(text)
+
+    expected = CitationChecker('test-key', base_url=fake.url).check_document(text)
+    assert asyncio.run(run()) == expected
+
+
+def test_every_upstream_entry_point_is_async():
+    # Inherited sync methods that reach the network would call coroutines without awaiting them
+    offline = {'cache_key', 'invalidate_cached', 'extract_citations', 'rate_limit_budget', 'close'}
+    for name in dir(CitationChecker):
+        if not name.startswith('_') and callable(getattr(CitationChecker, name)) and name not in offline:
+            assert inspect.iscoroutinefunction(getattr(AsyncCitationChecker, name)), name
+
+
+def test_pages_that_are_not_json_match_the_sync_checker(fake):
+    not_json = b'<html>Down for maintenance</html>'
+    for citation in ['410 U.S. 113', 'Roe v. Wade']:
+        fake.script[:] = [(path, 200, None, not_json) for path in ('/api/rest/v4/citation-lookup/',
+                                                                    '/api/rest/v4/search/')]
+        expected = CitationChecker('test-key', base_url=fake.url).check_citation(citation)
+        fake.script[:] = [(path, 200, None, not_json) for path in ('/api/rest/v4/citation-lookup/',
+                                                                    '/api/rest/v4/search/')]
+        assert _check_all(fake, [citation]) == [expected]
+        assert expected['status'] == 'error'
+
+
+def test_upstream_error_is_reported(fake):
+    fake.script.append(('/api/rest/v4/search/', 403, None, None))
+    [result] = _check_all(fake, ['Roe v. Wade'])
+    assert result['status'] == 'error'
+    assert result['search_type'] == 'enhanced_search'
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Offline tests for CitationChecker.check_many, run against the fake CourtListener server
+"""
+
+import pytest
+
+import citecheck
+from citecheck import CitationChecker
+
+LOOKUP = '/api/rest/v4/citation-lookup/'
+SEARCH = '/api/rest/v4/search/'
+
+
+@pytest.fixture
+def checker(fake):
+    return CitationChecker('test-key', base_url=fake.url)
+
+
+def test_packs_citations_into_one_lookup(fake, checker):
+    citations = ['410 U.S. 113', '347 US 483', '384 U.S. 436', '27 Cal. 3d 1']
+    results = checker.check_many(citations)
+
+    assert fake.count(LOOKUP) == 1
+    assert fake.count(SEARCH) == 0
+    assert [r['cases'][0]['name'] for r in results] == [
+        'Roe v. Wade', 'Brown v. Board of Education', 'Miranda v. Arizona', 'People v. Green'
+    ]
+    assert results[1]['cases'][0]['found_citation'] == '347 US 483'
+
+
+def test_matches_per_item_results(fake, checker):
+    citations = ['410 U.S. 113', '499 U.S. 999', 'Roe v. Wade', '347 U.S. 483']
+    expected = [checker.check_citation(c) for c in citations]
+    assert checker.check_many(citations) == expected
+
+
+def test_only_leftovers_use_search_fallbacks(fake, checker):
+    results = checker.check_many(['410 U.S. 113', '499 U.S. 999', 'Miranda v. Arizona'])
+
+    assert [r['status'] for r in results] == ['valid', 'invalid', 'valid']
+    assert fake.count(LOOKUP) == 1
+    # One citation-parts search for the miss, one case-name search for the name
+    assert fake.count(SEARCH) == 2
+
+
+def test_duplicate_inputs_checked_once(fake, checker):
+    results = checker.check_many(['410 U.S. 113', ' 410 U.S. 113 ', '410 U.S. 113'])
+    assert len(results) == 3
+    assert fake.count(LOOKUP) == 1
+
+
+def test_respects_per_request_citation_limit(fake, checker, monkeypatch):
+    monkeypatch.setattr(citecheck, 'CITATION_LOOKUP_MAX_CITATIONS', 2)
+    results = checker.check_many(['410 U.S. 113', '347 U.S. 483', '384 U.S. 436'])
+    assert all(r['status'] == 'valid' for r in results)
+    assert fake.count(LOOKUP) == 2
+
+
+def test_lookup_error_falls_back_per_item(fake, checker):
+    fake.script.append((LOOKUP, 503, None, None))
+    results = checker.check_many(['410 U.S. 113', '347 U.S. 483'])
+    assert [r['search_type'] for r in results] == ['citation_parts', 'citation_parts']
+
+
+def test_lookup_page_that_is_not_json_falls_back_per_item(fake, checker):
+    fake.script.append((LOOKUP, 200, None, b'<html>Down for maintenance</html>'))
+    results = checker.check_many(['410 U.S. 113', '347 U.S. 483'])
+    assert [(r['status'], r['search_type']) for r in results] == [('valid', 'citation_parts')] * 2
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the result caches, run against the fake CourtListener server
+"""
+
+import multiprocessing
+
+from click.testing import CliRunner
+
+import app as webapp
+from citecheck import CitationChecker, _open_disk_cache, main
+from citecheck_cache import DEFAULT_CACHE_TTL, ResultCache, SQLiteResultCache, TieredCache, cache_ttl
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats()['evictions'] == 1
+
+
+def test_ttl_expiry():
+    clock = Clock()
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.set('a', {'status': 'valid'})
+    clock.now = 9.9
+    assert cache.get('a') == {'status': 'valid'}
+    clock.now = 10
+    assert cache.get('a') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_cached_values_are_copies():
+    cache = ResultCache()
+    value = {'cases': []}
+    cache.set('a', value)
+    value['cases'].append('mutated')
+    cache.get('a')['cases'].append('mutated again')
+    assert cache.get('a') == {'cases': []}
+
+
+def test_checker_serves_repeats_from_cache(fake):
+    cache = ResultCache()
+    checker = CitationChecker('test-key', base_url=fake.url, cache=cache)
+
+    first = checker.check_citation('410 U.S. 113')
+    calls = fake.count()
+    assert checker.check_citation('410 US 113') == first
+    assert checker.check_citation(' 410  u.s. 113') == first
+    assert fake.count() == calls
+    assert cache.stats()['hits'] == 2
+
+    # The publication filter is part of the key
+    checker.check_citation('410 U.S. 113', include_unpublished=True)
+    assert fake.count() > calls
+
+
+def test_cache_shared_between_checkers(fake):
+    cache = ResultCache()
+    CitationChecker('key-one', base_url=fake.url, cache=cache).check_citation('Roe v. Wade')
+    calls = fake.count()
+    CitationChecker('key-two', base_url=fake.url, cache=cache).check_citation('roe v. wade')
+    assert fake.count() == calls
+
+
+def test_errors_are_not_cached(fake):
+    cache = ResultCache()
+    checker = CitationChecker('test-key', base_url=fake.url, cache=cache)
+    fake.script.append(('/api/rest/v4/search/', 403, None, None))
+    assert checker.check_citation('Roe v. Wade')['status'] == 'error'
+    assert checker.check_citation('Roe v. Wade')['status'] == 'valid'
+
+
+def test_invalidation(fake):
+    checker = CitationChecker('test-key', base_url=fake.url, cache=ResultCache())
+    checker.check_citation('347 U.S. 483')
+    checker.invalidate_cached('347 US 483')
+    calls = fake.count()
+    checker.check_citation('347 U.S. 483')
+    assert fake.count() > calls
+
+
+def test_check_many_uses_cache(fake):
+    checker = CitationChecker('test-key', base_url=fake.url, cache=ResultCache())
+    checker.check_many(['410 U.S. 113', '347 U.S. 483'])
+    calls = fake.count()
+    results = checker.check_many(['410 U.S. 113', '347 U.S. 483', 'Roe v. Wade'])
+    assert [r['status'] for r in results] == ['valid', 'valid', 'valid']
+    assert fake.count() == calls + 1
+
+
+def _write_entries(path, worker):
+    cache = SQLiteResultCache(path)
+    for i in range(50):
+        cache.set(('cite %d' % i, False), {'worker': worker, 'i': i})
+        cache.get(('cite %d' % ((i * 7) % 50), False))
+
+
+def test_sqlite_round_trip_and_expiry(tmp_path):
+    cache = SQLiteResultCache(str(tmp_path / 'cache.db'))
+    cache.set(('410 u.s. 113', False), {'status': 'valid', 'cases': [{'name': 'Roe v. Wade'}]})
+    cache.set(('gone', False), {'status': 'valid'}, ttl=-1)
+
+    assert cache.get(('410 u.s. 113', False))['cases'][0]['name'] == 'Roe v. Wade'
+    assert cache.get(('gone', False)) is None
+    assert cache.stats()['expired'] == 1
+    assert cache.prune() == 1
+    assert cache.vacuum() == 0
+    assert len(cache) == 1
+
+
+def test_sqlite_cache_shared_across_processes(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    SQLiteResultCache(path)
+    workers = [multiprocessing.Process(target=_write_entries, args=(path, n)) for n in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+        assert worker.exitcode == 0
+    assert len(SQLiteResultCache(path)) == 50
+
+
+def test_checker_results_survive_restart(fake, tmp_path):
+    path = str(tmp_path / 'cache.db')
+    CitationChecker('test-key', base_url=fake.url, cache=SQLiteResultCache(path)).check_citation('Roe v. Wade')
+    calls = fake.count()
+
+    restarted = CitationChecker('test-key', base_url=fake.url, cache=SQLiteResultCache(path))
+    assert restarted.check_citation('Roe v. Wade')['cases'][0]['name'] == 'Roe v. Wade'
+    assert fake.count() == calls
+
+
+def test_tiered_cache_backfills_memory(tmp_path):
+    memory, disk = ResultCache(), SQLiteResultCache(str(tmp_path / 'cache.db'))
+    disk.set('key', {'status': 'valid'})
+    tiered = TieredCache(memory, disk)
+    assert tiered.get('key') == {'status': 'valid'}
+    assert memory.get('key') == {'status': 'valid'}
+
+
+def test_cli_cache_prune(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    SQLiteResultCache(path).set('old', {'status': 'valid'}, ttl=-1)
+    result = CliRunner().invoke(main, ['cache', 'prune', '--cache-db', path, '--vacuum'])
+    assert result.exit_code == 0
+    assert 'Removed 1 expired entry; 0 remain' in result.output
+
+
+def test_negative_cache_short_circuits_fallbacks(fake):
+    clock = Clock()
+    cache, negative = ResultCache(), ResultCache(ttl=60, clock=clock)
+    checker = CitationChecker('test-key', base_url=fake.url, cache=cache, negative_cache=negative)
+
+    first = checker.check_citation('499 U.S. 999')
+    assert first['status'] == 'invalid'
+    calls = fake.count()
+    assert calls == 2  # citation lookup, then citation-parts search
+
+    assert checker.check_citation('499 US 999') == first
+    assert fake.count() == calls
+    assert len(negative) == 1 and len(cache) == 0
+
+    # Negative answers expire on their own, shorter schedule
+    clock.now = 61
+    checker.check_citation('499 U.S. 999')
+    assert fake.count() == calls * 2
+
+
+def test_negative_cache_namespace_in_shared_file(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    positive, negative = SQLiteResultCache(path), SQLiteResultCache(path, namespace='negative')
+    negative.set('key', {'status': 'invalid'})
+    assert positive.get('key') is None
+    negative.clear()
+    assert negative.get('key') is None
+
+
+def test_cli_and_app_share_cache_ttl(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.db')
+    assert _open_disk_cache(path).ttl == webapp.result_cache.ttl == DEFAULT_CACHE_TTL
+    assert _open_disk_cache(path, negative=True).ttl == webapp.negative_cache.ttl
+    monkeypatch.setenv('CITECHECK_CACHE_TTL', '60')
+    assert _open_disk_cache(path).ttl == cache_ttl() == 60
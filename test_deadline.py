@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Offline tests for end-to-end deadlines, run against a deliberately slow fake server
+"""
+
+import asyncio
+import time
+
+from click.testing import CliRunner
+
+import app as webapp
+from app import CheckerRegistry
+from citecheck import CitationChecker, main
+from citecheck_async import AsyncCitationChecker
+from citecheck_cache import ResultCache
+from citecheck_transport import Deadline, TransportPolicy
+
+LOOKUP = '/api/rest/v4/citation-lookup/'
+SEARCH = '/api/rest/v4/search/'
+
+
+def test_no_deadline_result_is_not_degraded(fake):
+    result = CitationChecker('test-key', base_url=fake.url).check_citation('410 U.S. 113', deadline=5)
+    assert result['status'] == 'valid'
+    assert 'degraded' not in result
+
+
+def test_stalled_lookup_skips_fallbacks(fake):
+    fake.stalls.append((LOOKUP, 3))
+    checker = CitationChecker('test-key', base_url=fake.url)
+
+    start = time.monotonic()
+    result = checker.check_citation('410 U.S. 113', deadline=0.3)
+    assert time.monotonic() - start < 1.0
+    assert result['status'] == 'error'
+    assert result['degraded'] is True
+    assert result['missed_strategies'] == ['citation_lookup', 'citation_parts']
+    assert fake.count(SEARCH) == 0
+
+
+def test_partial_invalid_result_when_fallback_is_cut_short(fake):
+    fake.stalls.append((SEARCH, 3))
+    cache = ResultCache()
+    checker = CitationChecker('test-key', base_url=fake.url, cache=cache)
+
+    result = checker.check_citation('499 U.S. 999', deadline=0.5)
+    assert result['status'] == 'invalid'
+    assert result['search_type'] == 'citation_lookup'
+    assert result['degraded'] is True
+    assert result['missed_strategies'] == ['citation_parts']
+    # Partial answers are never cached
+    assert len(cache) == 0
+
+
+def test_reporter_correction_shares_the_deadline(fake):
+    fake.stalls.append((SEARCH, 3))
+    checker = CitationChecker('test-key', base_url=fake.url)
+
+    start = time.monotonic()
+    result = checker.check_citation('999 PD2 1', deadline=0.5)
+    assert time.monotonic() - start < 1.0
+    assert result['status'] == 'invalid'
+    assert result['degraded'] is True
+    assert 'corrected_citation' not in result
+    assert fake.count(LOOKUP) == 1
+
+
+def test_async_deadline(fake):
+    fake.stalls.append((LOOKUP, 3))
+
+    async def run():
+        async with AsyncCitationChecker('test-key', base_url=fake.url) as checker:
+            return await checker.check_citation('410 U.S. 113', deadline=0.3)
+
+    start = time.monotonic()
+    result = asyncio.run(run())
+    assert time.monotonic() - start < 1.0
+    assert result['degraded'] is True
+    assert result['missed_strategies'] == ['citation_lookup', 'citation_parts']
+
+
+def test_strategy_skipped_when_median_latency_exceeds_budget():
+    policy = TransportPolicy(hedge_min_samples=3)
+    for seconds in (1.0, 1.2, 1.4):
+        policy.latency.record(seconds)
+    now = [0.0]
+    deadline = Deadline(2.0, clock=lambda: now[0])
+    assert deadline.allows('citation_parts', policy)
+    now[0] = 1.0
+    assert not deadline.allows('citation_parts', policy)
+    assert deadline.missed == ['citation_parts']
+    assert deadline.timeout(TransportPolicy(connect_timeout=3.05, read_timeout=20)) == (1.0, 1.0)
+
+
+def test_retries_stop_at_deadline(fake):
+    fake.script += [(SEARCH, 503, None, None)] * 5
+    checker = CitationChecker('test-key', base_url=fake.url, transport_policies={
+        'enhanced_search': TransportPolicy(retries=5, backoff=1.0, max_backoff=1.0)})
+
+    start = time.monotonic()
+    result = checker.check_citation('Roe v. Wade', deadline=0.5)
+    assert time.monotonic() - start < 1.0
+    assert result['status'] == 'error'
+    assert result['degraded'] is True
+
+
+def test_api_check_deadline(fake, monkeypatch):
+    monkeypatch.setattr(webapp, 'checkers', CheckerRegistry(lambda api_key: CitationChecker(api_key, base_url=fake.url)))
+    client = webapp.app.test_client()
+    fake.stalls.append((SEARCH, 3))
+
+    response = client.post('/api/check', json={'citation': 'Roe v. Wade', 'deadline': 0.3},
+                           headers={'X-API-Key': 'test-key'})
+    assert response.status_code == 200
+    assert response.get_json()['degraded'] is True
+
+    response = client.post('/api/check', json={'citation': 'Roe v. Wade', 'deadline': 'soon'},
+                           headers={'X-API-Key': 'test-key'})
+    assert response.status_code == 400
+
+
+def test_cli_deadline(fake, monkeypatch):
+    monkeypatch.setenv('COURTLISTENER_API_KEY', 'test-key')
+    monkeypatch.setattr('citecheck.COURTLISTENER_BASE_URL', fake.url)
+    fake.stalls.append((SEARCH, 3))
+
+    result = CliRunner().invoke(main, ['--deadline', '0.3', 'Roe v. Wade'])
+    assert 'Partial result' in result.output
+    assert CliRunner().invoke(main, ['--deadline', '1', '--document', 'x']).exit_code == 2
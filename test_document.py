@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Offline tests for document mode, run against the fake CourtListener server
+"""
+
+import pytest
+
+from citecheck import CitationChecker
+
+BRIEF = (
+    "In Roe v. Wade, 410 U.S. 113, 153 (1973), the Court held otherwise. "
+    "See also People v. Green, 27 Cal. 3d 1, 609 P.2d 468 (1980). "
+    "Section 5 The Court 12 is not a citation. "
+    "Again, 410 US 113 controls; but see Smith v. Jones, 999 F.3d 999 (9th Cir. 2021)."
+)
+
+
+@pytest.fixture
+def checker(fake):
+    return CitationChecker('test-key', base_url=fake.url)
+
+
+def test_extracts_citations_and_case_names(checker):
+    found = checker.extract_citations(BRIEF)
+    assert [(item['kind'], item['text']) for item in found] == [
+        ('case_name', 'Roe v. Wade'),
+        ('citation', '410 U.S. 113'),
+        ('case_name', 'People v. Green'),
+        ('citation', '27 Cal. 3d 1'),
+        ('citation', '609 P.2d 468'),
+        ('citation', '410 US 113'),
+        ('case_name', 'Smith v. Jones'),
+        ('citation', '999 F.3d 999'),
+    ]
+    for item in found:
+        assert BRIEF[item['start']:item['end']] == item['text']
+
+
+def test_extracts_pinpoint_and_year(checker):
+    roe = checker.extract_citations(BRIEF)[1]
+    assert (roe['volume'], roe['reporter'], roe['page']) == ('410', 'U.S.', '113')
+    assert (roe['pinpoint'], roe['year']) == ('153', '1973')
+
+
+def test_check_document_verifies_each_reference_once(fake, checker):
+    result = checker.check_document(BRIEF)
+
+    assert result['summary']['total'] == 8
+    assert result['summary']['unique'] == 7
+    assert result['summary']['invalid'] == 2  # Smith v. Jones and 999 F.3d 999
+    # The repeated 410 U.S. 113 shares one result
+    repeated = [a for a in result['annotations'].values() if a['key'] == '410 U.S. 113']
+    assert len(repeated) == 2
+    assert all(a['status'] == 'valid' for a in repeated)
+    # All citation-shaped references go up in a single Citation Lookup call
+    assert fake.count('/api/rest/v4/citation-lookup/') == 1
+
+
+def test_annotations_keyed_by_span(checker):
+    result = checker.check_document(BRIEF)
+    for span, annotation in result['annotations'].items():
+        start, end = map(int, span.split('-'))
+        assert BRIEF[start:end] == annotation['text']
+
+
+def test_statutes_are_not_checked_as_cases(fake, checker):
+    text = ("Plaintiff sues under 42 U.S.C. 1983 and 28 U.S.C. 1331, and relies on 29 C.F.R. 1630 "
+            "and Roe v. Wade, 410 U.S. 113 (1973).")
+    assert [item['text'] for item in checker.extract_citations(text)] == ['Roe v. Wade', '410 U.S. 113']
+
+    result = checker.check_document(text)
+    assert result['summary'] == {'total': 2, 'unique': 2, 'valid': 2, 'invalid': 0, 'uncertain': 0, 'error': 0}
+    assert fake.count('/api/rest/v4/search/') == 1
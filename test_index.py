@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the bulk-data citation index
+"""
+
+import bz2
+import csv
+
+import pytest
+from click.testing import CliRunner
+
+from citecheck import CitationChecker, main
+from citecheck_index import CitationFilter, OfflineIndex, build_filter, build_index
+from fake_courtlistener import FakeCourtListener
+
+CITATIONS = [
+    ('1', '410', 'U.S.', '113', '108713'), ('2', '93', 'S. Ct.', '705', '108713'),
+    ('3', '27', 'Cal. 3d', '1', '1187047'), ('4', '609', 'P.2d', '468', '1187047'),
+    ('5', '12', 'F.3d', '34', '555'),
+]
+CLUSTERS = [
+    ('108713', 'Roe v. Wade', '1973-01-22', 'Published', '5000', 'roe-v-wade', '10'),
+    ('1187047', 'People v. Green', '1980-01-29', 'Published', '900', 'people-v-green', '11'),
+    ('555', 'Doe v. Roe', '2001-05-05', 'Unpublished', '1', 'doe-v-roe', '12'),
+    ('999', 'Never Cited v. Anyone', '1999-01-01', 'Published', '0', 'never-cited', '13'),
+]
+
+
+def _write(path, header, rows, opener=open):
+    with opener(path, 'wt', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def exports(tmp_path):
+    return {
+        'citations_csv': _write(tmp_path / 'citations.csv.bz2', ['id', 'volume', 'reporter', 'page', 'cluster_id'],
+                                CITATIONS, opener=bz2.open),
+        'clusters_csv': _write(tmp_path / 'clusters.csv', ['id', 'case_name', 'date_filed', 'precedential_status',
+                                                           'citation_count', 'slug', 'docket_id'], CLUSTERS),
+        'dockets_csv': _write(tmp_path / 'dockets.csv', ['id', 'court_id'], [('10', 'scotus'), ('11', 'cal')]),
+    }
+
+
+@pytest.fixture
+def index_path(tmp_path, exports):
+    path = str(tmp_path / 'cl.idx')
+    stats = build_index(output=path, **exports)
+    assert (stats['citations'], stats['clusters']) == (5, 3)
+    return path
+
+
+def test_lookup(index_path):
+    with OfflineIndex(index_path) as index:
+        assert len(index) == 5
+        [roe] = index.lookup('410', 'us', '113')
+        assert roe['case_name'] == 'Roe v. Wade' and roe['court'] == 'scotus'
+        assert roe['citations'] == ['410 U.S. 113', '93 S. Ct. 705']
+        assert index.lookup('93', 'S.Ct.', '705') == [roe]
+        assert index.lookup('410', 'U.S.', '114') == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / 'not-an-index'
+    path.write_bytes(b'x' * 64)
+    with pytest.raises(ValueError):
+        OfflineIndex(str(path))
+
+
+def test_checker_skips_http(index_path):
+    with FakeCourtListener() as fake, OfflineIndex(index_path) as index:
+        checker = CitationChecker('test-key', base_url=fake.url, offline_index=index)
+        result = checker.check_citation('27 Cal.3d 1')
+        assert result['status'] == 'valid' and result['search_type'] == 'offline_index'
+        case = result['cases'][0]
+        assert (case['name'], case['citation'], case['normalized_citation']) == \
+            ('People v. Green', '27 Cal. 3d 1', ['27 Cal. 3d 1'])
+        assert checker.check_many(['410 U.S. 113'])[0]['cases'][0]['name'] == 'Roe v. Wade'
+        assert fake.count() == 0
+
+        # Unpublished-only and unknown citations still go upstream
+        assert checker.check_citation('12 F.3d 34', include_unpublished=True)['search_type'] == 'offline_index'
+        checker.check_citation('12 F.3d 34')
+        checker.check_citation('384 U.S. 436')
+        assert fake.count() > 0
+        checker.close()
+
+
+def test_cli_build(tmp_path, exports):
+    output = str(tmp_path / 'cli.idx')
+    result = CliRunner().invoke(main, ['index', 'build', '--citations', exports['citations_csv'],
+                                       '--clusters', exports['clusters_csv'], '-o', output])
+    assert result.exit_code == 0, result.output
+    assert 'Indexed 5 citation(s) of 3 case(s)' in result.output
+    with OfflineIndex(output) as index:
+        assert index.lookup('410', 'U.S.', '113')[0]['court'] == 'Unknown'
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_search_names(monkeypatch, index_path, use_numpy):
+    import citecheck_index
+    if not use_numpy:
+        monkeypatch.setattr(citecheck_index, 'np', None)
+    elif citecheck_index.np is None:
+        pytest.skip('numpy not installed')
+    with OfflineIndex(index_path) as index:
+        assert [c['case_name'] for c in index.search_names('roe v. wade')][0] == 'Roe v. Wade'
+        assert index.search_names('People v Gren')[0]['case_name'] == 'People v. Green'
+        assert index.search_names('Qqqq') == []
+
+
+def test_checker_case_names(index_path):
+    with FakeCourtListener() as fake, OfflineIndex(index_path) as index:
+        checker = CitationChecker('test-key', base_url=fake.url, offline_index=index)
+        result = checker.check_citation('People v Green')
+        assert result['search_type'] == 'offline_index' and result['cases'][0]['citation'] == '27 Cal. 3d 1'
+        assert fake.count() == 0
+
+        # Nothing in the index clears the similarity bar - ask the Search API
+        assert checker.check_citation('Miranda v. Arizona')['search_type'] == 'enhanced_search'
+        assert fake.count() > 0
+        checker.close()
+
+
+def test_citation_filter(tmp_path, exports):
+    path = str(tmp_path / 'citations.bloom')
+    stats = build_filter(exports['citations_csv'], path, false_positive_rate=0.01)
+    assert (stats['citations'], stats['reporters']) == (5, 5)
+    with CitationFilter(path) as citation_filter:
+        assert citation_filter.might_exist('410', 'US', '113')
+        assert citation_filter.might_exist('27', 'Cal.3d', '1')
+        assert not citation_filter.might_exist('410', 'U.S.', '999')
+        # Reporters without data, or unknown spellings, are never ruled out
+        assert citation_filter.might_exist('1', 'N.W.2d', '1')
+        assert citation_filter.might_exist('1', 'Made Up Rptr.', '1')
+
+
+def test_filter_false_positive_rate(tmp_path):
+    rows = [(i, i // 1000 + 1, 'F.3d', i % 1000 + 1, i) for i in range(20000)]
+    citations_csv = _write(tmp_path / 'many.csv', ['id', 'volume', 'reporter', 'page', 'cluster_id'], rows)
+    path = str(tmp_path / 'many.bloom')
+    build_filter(citations_csv, path, false_positive_rate=0.01)
+    with CitationFilter(path) as citation_filter:
+        assert all(citation_filter.might_exist(str(v), 'F.3d', str(p)) for _, v, _, p, _ in rows)
+        passed = sum(citation_filter.might_exist(str(v), 'F.3d', '5000') for v in range(1, 20001))
+        assert passed < 20000 * 0.02
+
+
+def test_checker_rules_out_unknown_citations(tmp_path, exports):
+    path = str(tmp_path / 'citations.bloom')
+    build_filter(exports['citations_csv'], path)
+    with FakeCourtListener() as fake, CitationFilter(path) as citation_filter:
+        checker = CitationChecker('test-key', base_url=fake.url, citation_filter=citation_filter)
+        result = checker.check_citation('410 U.S. 999')
+        assert (result['status'], result['search_type']) == ('invalid', 'citation_filter')
+        assert checker.check_many(['93 S. Ct. 1'])[0]['search_type'] == 'citation_filter'
+        assert fake.count() == 0
+
+        assert checker.check_citation('410 U.S. 113')['status'] == 'valid'
+        assert fake.count() > 0
+        checker.close()
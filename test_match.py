@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Offline tests for case-name matching
+"""
+
+import pytest
+
+from citecheck import CitationChecker
+from citecheck_match import Matcher, RapidFuzzMatcher, _lcs_length, default_matcher, prepare
+
+MATCHERS = [Matcher()]
+try:
+    import rapidfuzz  # noqa: F401
+    MATCHERS.append(RapidFuzzMatcher())
+except ImportError:
+    pass
+
+
+def test_prepare_normalizes_once():
+    name = prepare('Brown  v. Board of Education,')
+    assert name.text == 'brown v board of education'
+    assert name.parties == (frozenset({'brown'}), frozenset({'board', 'of', 'education'}))
+    assert prepare('Brown  v. Board of Education,') is name
+
+
+@pytest.mark.parametrize('a, b, expected', [
+    ('', 'abc', 0), ('abc', 'abc', 3), ('kitten', 'sitting', 4), ('roe v wade', 'row v wade', 9),
+])
+def test_lcs_length(a, b, expected):
+    assert _lcs_length(a, b) == expected == _lcs_length(b, a)
+
+
+@pytest.mark.parametrize('matcher', MATCHERS, ids=lambda m: m.name)
+@pytest.mark.parametrize('input_text, case_name, uncertain', [
+    ('Roe v. Wade', 'Roe v. Wade', False),
+    ('Brown v Board', 'Brown v. Board of Education', False),
+    ('Brown v. Education, Board of', 'Brown v. Board of Education', False),
+    ('Marbury v. Madisen', 'Marbury v. Madison', False),
+    ('Miranda v. Texas', 'Miranda v. Arizona', True),
+    ('Nixon v. United States', 'United States v. Nixon', True),
+    ('Made Up v. Nonexistent', 'Mapp v. Ohio', True),
+])
+def test_threshold(matcher, input_text, case_name, uncertain):
+    assert (matcher.similarity(input_text, case_name) < 0.8) == uncertain
+
+
+def test_backends_agree():
+    if len(MATCHERS) < 2:
+        pytest.skip('rapidfuzz not installed')
+    python, fast = MATCHERS
+    for pair in [('Smith v. Jones', 'Smith v. Johnson'), ('Gideon', 'Gideon v. Wainwright')]:
+        assert python.similarity(*pair) == pytest.approx(fast.similarity(*pair))
+
+
+def test_checker_best_match():
+    checker = CitationChecker(api_key='test', matcher=Matcher())
+    cases = [{'name': 'Miranda v. Arizona'}, {'name': 'Roe v. Wade'}, {'name': 'Roe v. Wade'}]
+    case, similarity = checker._find_best_match('roe v wade', cases)
+    assert case is cases[1] and similarity == 1.0
+    assert checker._find_best_match('Roe v. Wade', []) == (None, 0.0)
+    assert isinstance(CitationChecker(api_key='test').matcher, type(default_matcher()))
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+def test_shortlist(monkeypatch, use_numpy):
+    import citecheck_match
+    if not use_numpy:
+        monkeypatch.setattr(citecheck_match, 'np', None)
+    elif citecheck_match.np is None:
+        pytest.skip('numpy not installed')
+    names = ['Roe v. Wade', 'Miranda v. Arizona', 'Marbury v. Madison', 'Mapp v. Ohio', 'Terry v. Ohio']
+    lists = citecheck_match.shortlist(['Miranda v Arizona', 'Mapp v. Ohio', 'zzz'], names, k=2)
+    assert lists[0][0] == 1
+    assert lists[1] == [3, 4]
+    assert len(lists[2]) == 2
+
+
+def test_best_matches_batch():
+    names = [f'Smith v. Jones {i}' for i in range(30)] + ['Brown v. Board of Education']
+    matches = Matcher().best_matches(['Brown v Board', 'Smith v. Jones 7', 'Brown v Board'], names, shortlist_size=4)
+    assert matches[0] == matches[2] and matches[0][0] == 30 and matches[0][1] >= 0.8
+    assert matches[1] == (7, 1.0)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Offline tests for checker metrics and their Prometheus exposition
+"""
+
+import asyncio
+
+import pytest
+
+from citecheck import CitationChecker
+from citecheck_async import AsyncCitationChecker
+from citecheck_cache import ResultCache
+from citecheck_metrics import CheckerMetrics, MetricsRegistry
+
+
+def test_exposition_format():
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', 'Requests', ['strategy'])
+    latency = registry.histogram('latency_seconds', 'Latency', ['strategy'], buckets=(0.1, 1.0))
+    requests.inc(strategy='lookup')
+    requests.inc(2, strategy='say "hi"')
+    latency.observe(0.05, strategy='lookup')
+    latency.observe(0.5, strategy='lookup')
+    latency.observe(3.0, strategy='lookup')
+
+    lines = registry.render().splitlines()
+    assert lines[:4] == [
+        '# HELP requests_total Requests', '# TYPE requests_total counter',
+        'requests_total{strategy="lookup"} 1', 'requests_total{strategy="say \\"hi\\""} 2',
+    ]
+    assert lines[6:] == [
+        'latency_seconds_bucket{strategy="lookup",le="0.1"} 1',
+        'latency_seconds_bucket{strategy="lookup",le="1.0"} 2',
+        'latency_seconds_bucket{strategy="lookup",le="+Inf"} 3',
+        'latency_seconds_sum{strategy="lookup"} 3.55',
+        'latency_seconds_count{strategy="lookup"} 3',
+    ]
+
+
+def test_labels_must_match():
+    counter = MetricsRegistry().counter('hits_total', 'Hits', ['cache'])
+    with pytest.raises(ValueError):
+        counter.inc(strategy='lookup')
+
+
+def test_checker_records_strategies_and_fallbacks(fake):
+    metrics = CheckerMetrics()
+    checker = CitationChecker('test-key', base_url=fake.url, cache=ResultCache(), metrics=metrics)
+    checker.check_citation('410 U.S. 113')
+    checker.check_citation('499 U.S. 999')
+    checker.check_citation('410 U.S. 113')
+    checker.close()
+
+    assert metrics.upstream_seconds.count(strategy='citation_lookup') == 2
+    assert metrics.upstream_requests.value(strategy='citation_lookup', status=200) == 2
+    assert metrics.strategy_results.value(strategy='citation_lookup', status='valid') == 1
+    assert metrics.strategy_results.value(strategy='citation_parts', status='invalid') == 1
+    assert metrics.fallbacks.value(strategy='citation_parts') == 1
+    assert metrics.cache_hits.value(cache='result') == 1
+    assert metrics.cache_misses.value() == 2
+
+
+def test_async_checker_records_strategies(fake):
+    metrics = CheckerMetrics()
+
+    async def check():
+        async with AsyncCitationChecker('test-key', base_url=fake.url, metrics=metrics) as checker:
+            return await checker.check_many(['410 U.S. 113', 'Roe v. Wade', '999 U.S. 999'])
+
+    asyncio.run(check())
+    assert metrics.upstream_seconds.count(strategy='citation_lookup') == 1
+    assert metrics.strategy_results.value(strategy='enhanced_search', status='valid') == 1
+    assert metrics.local_answers.value(source='impossible') == 1
+    assert metrics.upstream_calls_saved.value() == 2
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the single-pass input tokenizer
+"""
+
+import pytest
+
+from citecheck import CitationChecker
+from citecheck_parse import parse_input
+
+
+@pytest.mark.parametrize('text, kind, volume, reporter, page', [
+    ('410 U.S. 113', 'citation', '410', 'U.S.', '113'),
+    ('410 us 113', 'citation', '410', 'us', '113'),
+    ('123 F.3d 456', 'citation', '123', 'F.3d', '456'),
+    ('27 Cal. 3d 1', 'citation', '27', 'Cal. 3d', '1'),
+    ('88 F. Supp. 2d 731', 'citation', '88', 'F. Supp. 2d', '731'),
+    ('12 N.Y.S.2d 44', 'citation', '12', 'N.Y.S.2d', '44'),
+    ('Roe v. Wade', 'case_name', None, None, None),
+    ('Roe v. Wade, 410 U.S. 113', 'full', '410', 'U.S.', '113'),
+    ('Palsgraf', 'text', None, None, None),
+])
+def test_kinds_and_parts(text, kind, volume, reporter, page):
+    parsed = parse_input(text)
+    assert (parsed.kind, parsed.volume, parsed.reporter, parsed.page) == (kind, volume, reporter, page)
+
+
+def test_pinpoint_year_and_parties():
+    parsed = parse_input('Varghese v. China Southern Airlines Co., 925 F.3d 1339, 1342 (11th Cir. 2019)')
+    assert parsed.parties == ('Varghese', 'China Southern Airlines Co.')
+    assert (parsed.pinpoint, parsed.year) == ('1342', '2019')
+    assert not parsed.looks_like_citation
+
+
+def test_parallel_citation_is_not_a_pinpoint():
+    parsed = parse_input('27 Cal. 3d 1, 609 P.2d 468')
+    assert parsed.pinpoint is None
+    assert parsed.span == (0, 12)
+
+
+def test_versus_is_never_a_reporter():
+    assert parse_input('5 Roe v. Wade 10').kind == 'case_name'
+
+
+def test_checker_predicates_use_tokenizer():
+    checker = CitationChecker('test-key')
+    assert checker._looks_like_citation_format('410 U.S. 113')
+    assert not checker._looks_like_citation_format('Roe v. Wade, 410 U.S. 113')
+    assert checker._looks_like_case_name('Roe v. Wade, 410 U.S. 113')
+    assert checker._parse_citation_parts('See 27 Cal. 3d 1')['reporter'] == 'Cal. 3d'
+    assert checker.cache_key('410  US 113') == checker.cache_key('410 U.S. 113')
+    assert checker.cache_key('410 US 113 (1973)') != checker.cache_key('410 U.S. 113')
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the per-key rate-limit scheduler, run against the fake CourtListener server
+"""
+
+import asyncio
+import time
+
+from citecheck import CitationChecker
+from citecheck_async import AsyncCitationChecker
+from citecheck_transport import RateLimiter, TokenBucket, retry_after_seconds
+
+SEARCH = '/api/rest/v4/search/'
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_queues_beyond_burst():
+    clock = Clock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    assert bucket.budget()['queued'] == 2
+    clock.now += 1.0
+    assert bucket.budget()['queued'] == 0
+
+
+def test_bucket_honors_retry_after_and_headers():
+    clock = Clock()
+    bucket = TokenBucket(rate=10, capacity=10, clock=clock)
+    assert bucket.observe(429, {'Retry-After': '3'}) == 3.0
+    assert bucket.reserve() == 3.0
+
+    bucket.observe(200, {'X-RateLimit-Limit': '100', 'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '30'})
+    assert bucket.reserve() == 30.0
+    assert bucket.budget()['upstream_limit'] == 100
+
+
+def test_retry_after_http_date():
+    assert retry_after_seconds({'Retry-After': 'Wed, 21 Oct 2015 07:28:10 GMT'},
+                               now=1445412480.0) == 10.0
+    assert retry_after_seconds({}) is None
+
+
+def test_keys_have_separate_buckets():
+    limiter = RateLimiter(rate=1, capacity=1, clock=Clock())
+    assert limiter.bucket('key-one').reserve() == 0.0
+    assert limiter.bucket('key-two').reserve() == 0.0
+    assert limiter.bucket('key-one').reserve() == 1.0
+
+
+def test_429_is_queued_not_failed(fake):
+    fake.script.append((SEARCH, 429, {'Retry-After': '1'}, None))
+    limiter = RateLimiter()
+    checker = CitationChecker('test-key', base_url=fake.url, rate_limiter=limiter)
+
+    start = time.monotonic()
+    result = checker.check_citation('Roe v. Wade')
+    assert result['status'] == 'valid'
+    assert time.monotonic() - start >= 1.0
+    assert checker.rate_limit_budget()['throttled'] == 1
+
+
+def test_long_retry_after_is_reported(fake):
+    fake.script.append(('/api/rest/v4/citation-lookup/', 429, {'Retry-After': '3600'}, None))
+    checker = CitationChecker('test-key', base_url=fake.url, max_rate_limit_wait=5)
+    result = checker._check_with_citation_api('410 U.S. 113')
+    assert result['status'] == 'error'
+    assert 'status 429' in result['message']
+
+
+def test_requests_paced_at_rate(fake):
+    checker = CitationChecker('test-key', base_url=fake.url,
+                              rate_limiter=RateLimiter(rate=20, capacity=1))
+    start = time.monotonic()
+    checker.check_many(['Roe v. Wade', 'Brown v. Board of Education', 'Miranda v. Arizona'])
+    # Three searches, one token up front, two more at 20/s
+    assert time.monotonic() - start >= 0.1
+
+
+def test_async_429_is_queued(fake):
+    fake.script.append((SEARCH, 429, {'Retry-After': '1'}, None))
+
+    async def run():
+        async with AsyncCitationChecker('test-key', base_url=fake.url, rate_limiter=RateLimiter()) as checker:
+            return await checker.check_citation('Roe v. Wade')
+
+    assert asyncio.run(run())['status'] == 'valid'
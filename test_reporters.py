@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the bundled reporter table
+"""
+
+import pytest
+from click.testing import CliRunner
+
+from citecheck import CitationChecker, main
+from citecheck_reporters import (PREFERENCE_ORDER, REPORTERS, UNRANKED, BKTree, correct_reporter, impossibility,
+                                 levenshtein, lookup, normalize_reporter, osa_distance, reporter_rank,
+                                 reporter_suggestions)
+from fake_courtlistener import FakeCourtListener
+
+
+@pytest.mark.parametrize('spelling, canonical', [
+    ('us', 'U.S.'),
+    ('U. S.', 'U.S.'),
+    ('sct', 'S. Ct.'),
+    ('L.Ed.2d', 'L. Ed. 2d'),
+    ('F.Supp.2d', 'F. Supp. 2d'),
+    ('N.E.2nd', 'N.E.2d'),
+    ('So.3d', 'So. 3d'),
+    ('a3d', 'A.3d'),
+    ('NYS2d', 'N.Y.S.2d'),
+    ('Cal.App.4th', 'Cal. App. 4th'),
+    ('Fed. Appx.', "F. App'x"),
+    ('Made Up Rptr.', 'Made Up Rptr.'),
+])
+def test_normalize_variants(spelling, canonical):
+    assert normalize_reporter(spelling) == canonical
+
+
+@pytest.mark.parametrize('spelling, canonical', [
+    ('Ohio App.2d', 'Ohio App. 2d'),
+    ('Conn.Supp.', 'Conn. Supp.'),
+    ('Wn. App. 2d', 'Wash. App. 2d'),
+    ('ALR 3d', 'A.L.R.3d'),
+    ('Del.Ch.', 'Del. Ch.'),
+    ('N.J.Eq.', 'N.J. Eq.'),
+    ('Fed. Cas.', 'F. Cas.'),
+])
+def test_state_and_specialty_reporters(spelling, canonical):
+    assert normalize_reporter(spelling) == canonical
+
+
+@pytest.mark.parametrize('reporter', ['Md. Ch.', 'S.C. Eq.', 'Made Up Rptr.'])
+def test_unknown_reporters_defer_to_upstream(reporter):
+    assert lookup(reporter) is None
+    assert normalize_reporter(reporter) == reporter
+    assert reporter_rank(reporter) == UNRANKED
+    assert impossibility(99999, reporter, 0, 1066, current_year=2026) is None
+
+
+def test_metadata():
+    reporter = lookup('F. Supp. 2d')
+    assert (reporter.series, reporter.edition) == ('F. Supp.', 2)
+    assert reporter.volume_in_range(999) and not reporter.volume_in_range(1000)
+    assert lookup('F.4th').volume_in_range(5000)
+
+
+def test_table_is_frozen():
+    with pytest.raises(TypeError):
+        REPORTERS['xyz'] = None
+
+
+def test_preference_order():
+    order = PREFERENCE_ORDER.index
+    assert order('U.S.') < order('Cal. 3d') < order('F.3d') < order('F. Supp. 2d') < order('S. Ct.')
+    assert order('S. Ct.') < order('L. Ed. 2d') < order('P.2d') < order('Cal. Rptr.')
+
+
+def test_primary_citation_prefers_official_reports():
+    checker = CitationChecker('test-key')
+    citations = [
+        {'volume': '90', 'reporter': 'N.E.2d', 'page': '1'},
+        {'volume': '300', 'reporter': 'N.Y.', 'page': '12'},
+    ]
+    assert checker._get_primary_citation(citations) == '300 N.Y. 12'
+    assert checker._get_primary_citation_from_search_result_list(['93 S. Ct. 705', '410 U. S. 113']) == '410 U. S. 113'
+
+
+def test_reporter_rank():
+    assert reporter_rank('U. S.') == 0
+    assert reporter_rank('F.3d') < reporter_rank('S. Ct.')
+    assert reporter_rank('Made Up Rptr.') == UNRANKED
+
+
+def test_batched_primary_citations():
+    checker = CitationChecker('test-key')
+    results = [
+        {'citation': ['93 S. Ct. 705', '410 U.S. 113']},
+        {'citation': ['27 Cal. 3d 1', '609 P.2d 468']},
+        {'citation': []},
+        {'citation': ['1 Made Up 2', '3 Other Rptr. 4']},
+    ]
+    assert checker._primary_citations(results) == [
+        '410 U.S. 113', '27 Cal. 3d 1', 'No citation available', '1 Made Up 2']
+    parts = {'volume': '609', 'reporter': 'P.2d', 'page': '468'}
+    assert checker._primary_citations(results[1:3], parts) == ['609 P.2d 468', '609 P.2d 468']
+
+
+@pytest.mark.parametrize('volume, reporter, page, year, reason', [
+    ('999', 'US', '999', None, 'has not reached volume 999'),
+    ('5000', 'F.3d', '1', None, 'ended at volume'),
+    ('0', 'U.S.', '1', None, 'volumes start at 1'),
+    ('410', 'U.S.', '0', None, 'pages start at 1'),
+    ('12', 'F.3d', '34', '1950', 'began in'),
+    ('410', 'U.S.', '113', '2031', 'in the future'),
+])
+def test_impossible_citations(volume, reporter, page, year, reason):
+    assert reason in impossibility(volume, reporter, page, year, current_year=2026)
+
+
+@pytest.mark.parametrize('volume, reporter, page, year', [
+    ('410', 'U.S.', '113', '1973'),
+    ('1', 'F.3d', '1', '1993'),
+    ('100', 'F.4th', '1', None),
+    ('5000', 'Made Up Rptr.', '1', None),
+    # Early volumes of official state reports, before their first West-era volume
+    ('13', 'Mass.', '356', '1816'),
+    ('3', 'Ill.', '100', '1840'),
+    ('1', 'Ky.', '1', '1785'),
+    ('1', 'Miss.', '1', '1818'),
+    ('1', 'Ind.', '1', '1817'),
+    # Series whose dates aren't checked are never ruled out by year
+    ('1', 'Va.', '1', '1789'),
+    ('1', 'Ala.', '1', '1820'),
+])
+def test_possible_citations(volume, reporter, page, year):
+    assert impossibility(volume, reporter, page, year, current_year=2026) is None
+
+
+def test_checker_rejects_impossible_citations_locally():
+    with FakeCourtListener() as fake:
+        checker = CitationChecker('test-key', base_url=fake.url)
+        result = checker.check_citation('999 US 999')
+        assert (result['status'], result['search_type']) == ('invalid', 'impossible')
+        assert 'has not reached volume 999' in result['note']
+        assert checker.check_many(['5000 F.3d 1'])[0]['search_type'] == 'impossible'
+        assert fake.count() == 0
+        assert checker.local_stats.stats() == {
+            'answers': {'impossible': 2}, 'total': 2, 'upstream_calls_saved': 4}
+        checker.close()
+
+
+def test_cli_explains_impossible_citations(monkeypatch):
+    monkeypatch.setenv('COURTLISTENER_API_KEY', 'test-key')
+    result = CliRunner().invoke(main, ['999 US 999'])
+    assert '❌' in result.output
+    assert 'Note: 999 U.S. 999 cannot exist: United States Reports has not reached volume 999' in result.output
+
+
+def test_checker_sends_early_state_citations_upstream():
+    with FakeCourtListener() as fake:
+        checker = CitationChecker('test-key', base_url=fake.url)
+        for citation in ['13 Mass. 356 (1816)', '3 Ill. 100 (1840)']:
+            assert checker.check_citation(citation)['search_type'] != 'impossible'
+        assert fake.count('/api/rest/v4/citation-lookup/') == 2
+        assert checker.check_citation('3 Ill. 100 (1790)')['search_type'] == 'impossible'
+        checker.close()
+
+
+def test_bk_tree_search_matches_linear_scan():
+    tree = BKTree(REPORTERS)
+    for word in ['pd2', 'fsup2d', 'calapp4tth', 'x', 'massapp']:
+        for radius in range(4):
+            expected = sorted((levenshtein(word, key), key) for key in REPORTERS if levenshtein(word, key) <= radius)
+            assert sorted(tree.search(word, radius)) == expected
+
+
+def test_osa_counts_transpositions_once():
+    assert levenshtein('pd2', 'p2d') == 2
+    assert osa_distance('pd2', 'p2d') == 1
+    assert osa_distance('calapp', 'calapp') == 0
+
+
+@pytest.mark.parametrize('typo, corrected', [
+    ('PD2', 'P.2d'),
+    ('F.3dd', 'F.3d'),
+    ('Calif. 3d', 'Cal. 3d'),
+    ('Cal.App.4tth', 'Cal. App. 4th'),
+])
+def test_correct_reporter(typo, corrected):
+    assert correct_reporter(typo) == corrected
+
+
+@pytest.mark.parametrize('spelling', ['F.3d', 'F.3rd', 'S.Ct', 'Wn.2d', 'F.5d', 'Texas', 'X'])
+def test_no_correction(spelling):
+    assert correct_reporter(spelling) is None
+
+
+def test_ambiguous_typo_suggestions():
+    assert reporter_suggestions('F.5d')[:2] == ('F.3d', 'F.2d')
+    assert reporter_suggestions('F.3d') == ()
+
+
+def test_checker_corrects_reporter_typos():
+    with FakeCourtListener() as fake:
+        checker = CitationChecker('test-key', base_url=fake.url)
+        result = checker.check_citation('609 PD2 468')
+        assert result['status'] == 'valid'
+        assert result['corrected_citation'] == '609 P.2d 468'
+        # Both spellings share one lookup request and nothing else is searched
+        assert fake.count('/api/rest/v4/citation-lookup/') == 1
+        assert fake.count('/api/rest/v4/search/') == 0
+
+        checker = CitationChecker('test-key', base_url=fake.url)
+        batch = checker.check_many(['609 PD2 468', '410 U.S. 113'])
+        assert [r['status'] for r in batch] == ['valid', 'valid']
+        assert batch[0]['corrected_citation'] == '609 P.2d 468'
+        assert fake.count('/api/rest/v4/citation-lookup/') == 2
+
+        # Ambiguous typos are still checked upstream as written; the suggestions ride along
+        typo = checker.check_citation('12 F.5d 34, 36 (1999)')
+        assert (typo['status'], typo['search_type']) == ('invalid', 'citation_lookup')
+        assert typo['suggestions'][0] == '12 F.3d 34, 36 (1999)'
+        assert checker.local_stats.stats()['total'] == 0
+        checker.close()
+
+
+def _case(name, *citations):
+    return {'caseName': name, 'court': 'State Court', 'dateFiled': '1970-01-01', 'citation': list(citations),
+            'absolute_url': f'/opinion/1/{name.lower().replace(" ", "-")}/', 'citeCount': 10,
+            'precedentialStatus': 'Published'}
+
+
+@pytest.mark.parametrize('citation', [
+    '50 Ohio App. 2d 1', '100 Conn. Supp. 5', '5 Wash. App. 2d 10', '40 Mo. App. 7', '20 Tenn. App. 3',
+    '12 A.L.R. 5', '3 Kan. App. 10', '30 Tex. App. 4', '9 Colo. App. 8', '15 La. App. 6', '2 Haw. App. 11',
+    '10 Md. Ch. 3',
+])
+def test_real_reporters_are_checked_as_written(citation):
+    # Each has a near-miss neighbour CourtListener also knows, so a wrong correction would come back valid
+    with FakeCourtListener(cases=[_case('Smith v. Jones', citation), _case('Other v. Case', '50 Ohio App. 3d 1',
+                                                                             '100 Conn. App. 5', '10 Mich. 3')]) as fake:
+        checker = CitationChecker('test-key', base_url=fake.url)
+        result = checker.check_citation(citation)
+        assert result['status'] == 'valid'
+        assert result['cases'][0]['name'] == 'Smith v. Jones'
+        assert 'corrected_citation' not in result and 'suggestions' not in result
+        assert checker.check_many([citation]) == [result]
+        checker.close()
+
+
+def test_unconfirmed_unknown_reporter_keeps_its_own_result():
+    with FakeCourtListener(cases=[_case('Other v. Case', '10 Mich. 3')]) as fake:
+        checker = CitationChecker('test-key', base_url=fake.url)
+        result = checker.check_citation('10 Md. Ch. 4')
+        assert (result['status'], result['search_type']) == ('invalid', 'citation_lookup')
+        assert result['suggestions'] == ['10 Mich. 4']
+        checker.close()
+
+
+@pytest.mark.parametrize('citation', ['42 U.S.C. 1983', '28 U.S.C.A. 1331', '86 Stat. 816', '29 C.F.R. 1910',
+                                      '12 Cal. Civ. Code 1714'])
+def test_statutes_get_no_reporter_suggestions(citation):
+    with FakeCourtListener() as fake:
+        checker = CitationChecker('test-key', base_url=fake.url)
+        result = checker.check_citation(citation)
+        assert 'suggestions' not in result and 'corrected_citation' not in result
+        assert result['search_type'] != 'reporter_typo'
+        document = checker.check_document(f'Claims under {citation} fail; see Roe v. Wade, 410 U.S. 113.')
+        assert not any('suggestions' in r or 'corrected_citation' in r for r in document['results'].values())
+        checker.close()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Offline tests for the pooled HTTP session, run against the fake CourtListener server
+"""
+
+from citecheck import CitationChecker, create_session
+from fake_courtlistener import FakeCourtListener
+
+
+def test_lookups_reuse_one_connection():
+    with FakeCourtListener() as fake:
+        checker = CitationChecker('test-key', base_url=fake.url)
+        for citation in ['410 U.S. 113', '347 US 483', '499 U.S. 999', 'Roe v. Wade']:
+            checker.check_citation(citation)
+        checker.close()
+
+        assert fake.count() >= 5
+        assert fake.connections == 1
+
+
+def test_shared_session_across_checkers():
+    session = create_session(pool_size=2)
+    with FakeCourtListener() as fake:
+        first = CitationChecker('key-one', session=session, base_url=fake.url)
+        second = CitationChecker('key-two', session=session, base_url=fake.url)
+
+        assert first.check_citation('410 U.S. 113')['status'] == 'valid'
+        assert second.check_citation('347 U.S. 483')['status'] == 'valid'
+        assert fake.connections == 1
+
+        # Closing a checker must not tear down a session it does not own
+        first.close()
+        assert second.check_citation('384 U.S. 436')['status'] == 'valid'
+    session.close()
+
+
+def test_keep_alive_disabled():
+    with FakeCourtListener() as fake:
+        checker = CitationChecker('test-key', base_url=fake.url, keep_alive=False)
+        checker.check_citation('410 U.S. 113')
+        checker.check_citation('347 U.S. 483')
+        assert fake.connections == 2
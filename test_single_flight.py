@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Offline tests for request coalescing, run against the fake CourtListener server
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import app as webapp
+from app import CheckerRegistry
+from citecheck import CitationChecker
+from citecheck_async import AsyncCitationChecker
+from citecheck_cache import AsyncSingleFlight, SingleFlight
+from citecheck_metrics import CheckerMetrics
+from fake_courtlistener import FakeCourtListener
+
+
+@pytest.fixture
+def fake():
+    with FakeCourtListener(delay=0.2) as server:
+        yield server
+
+
+def test_concurrent_identical_checks_share_one_lookup(fake):
+    flight = SingleFlight()
+    checkers = [CitationChecker(f'key-{n}', base_url=fake.url, single_flight=flight) for n in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda c: c.check_citation('410 U.S. 113'), checkers))
+
+    assert all(result == results[0] for result in results)
+    assert results[0]['status'] == 'valid'
+    assert fake.count() == 1
+    assert flight.stats() == {'calls': 1, 'coalesced': 7, 'in_flight': 0}
+
+
+def test_followers_get_independent_copies(fake):
+    flight = SingleFlight()
+    checker = CitationChecker('test-key', base_url=fake.url, single_flight=flight)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first, second = pool.map(checker.check_citation, ['Roe v. Wade', 'roe v. wade'])
+    first['cases'].clear()
+    assert second['cases']
+
+
+def test_leader_exception_propagates_to_followers():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def boom():
+        release.wait()
+        raise RuntimeError('upstream exploded')
+
+    def call():
+        try:
+            flight.do('key', boom)
+        except RuntimeError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(call) for _ in range(3)]
+        while flight.stats()['coalesced'] < 2:
+            time.sleep(0.01)
+        release.set()
+        assert [f.result() for f in futures] == ['upstream exploded'] * 3
+
+
+def test_shared_error_is_retried_by_follower(fake):
+    fake.script.append(('/api/rest/v4/search/', 401, None, {'detail': 'Invalid token.'}))
+    flight = SingleFlight()
+    checker = CitationChecker('test-key', base_url=fake.url, single_flight=flight)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results = list(pool.map(checker.check_citation, ['Roe v. Wade', 'Roe v. Wade']))
+    assert sorted(r['status'] for r in results) == ['error', 'valid']
+
+
+def test_async_concurrent_identical_checks_share_one_lookup(fake):
+    flight = AsyncSingleFlight()
+
+    async def run():
+        async with AsyncCitationChecker('test-key', base_url=fake.url, single_flight=flight) as checker:
+            return await asyncio.gather(*(checker.check_citation('347 U.S. 483') for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert all(result['status'] == 'valid' for result in results)
+    assert fake.count() == 1
+    assert flight.stats()['coalesced'] == 9
+
+
+def test_async_cancelled_leader_does_not_cancel_followers():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def lookup():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'status': 'valid'}
+
+    async def run():
+        leader = asyncio.ensure_future(flight.do('key', lookup))
+        await asyncio.sleep(0)
+        followers = [asyncio.ensure_future(flight.do('key', lookup)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        assert leader.cancelled()
+        return results
+
+    assert asyncio.run(run()) == [({'status': 'valid'}, True)] * 2
+    assert len(calls) == 1
+    assert flight.stats()['in_flight'] == 0
+
+
+def test_async_flight_cancelled_once_every_caller_is():
+    flight = AsyncSingleFlight()
+    finished = []
+
+    async def lookup():
+        await asyncio.sleep(0.05)
+        finished.append(1)
+
+    async def run():
+        callers = [asyncio.ensure_future(flight.do('key', lookup)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.sleep(0.1)
+        return flight.stats()['in_flight']
+
+    assert asyncio.run(run()) == 0
+    assert finished == []
+
+
+def test_app_reports_coalesced_checks(fake, monkeypatch):
+    flight, metrics = SingleFlight(), CheckerMetrics()
+    monkeypatch.setattr(webapp, 'single_flight', flight)
+    monkeypatch.setattr(webapp, 'metrics', metrics)
+    monkeypatch.setattr(webapp, 'checkers', CheckerRegistry(
+        lambda api_key: CitationChecker(api_key, base_url=fake.url, single_flight=flight, metrics=metrics)))
+    start = threading.Barrier(2)
+
+    def post(api_key):
+        start.wait()
+        return webapp.app.test_client().post('/api/check', json={'citation': '410 U.S. 113'},
+                                             headers={'X-API-Key': api_key})
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        responses = list(pool.map(post, ['key-1', 'key-2']))
+
+    assert [response.get_json()['status'] for response in responses] == ['valid', 'valid']
+    assert fake.count() == 1
+    client = webapp.app.test_client()
+    assert client.get('/api/stats').get_json()['single_flight'] == {'calls': 1, 'coalesced': 1, 'in_flight': 0}
+    assert 'citecheck_coalesced_total 1' in client.get('/metrics').get_data(as_text=True)
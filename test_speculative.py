@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Offline tests for speculative mode and parallel case-name search
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from citecheck import CitationChecker
+from citecheck_async import AsyncCitationChecker
+from fake_courtlistener import FakeCourtListener
+
+LOOKUP = '/api/rest/v4/citation-lookup/'
+SEARCH = '/api/rest/v4/search/'
+
+
+@pytest.fixture
+def fake():
+    with FakeCourtListener(path_delays={LOOKUP: 0.3, SEARCH: 0.3}) as server:
+        yield server
+
+
+def _check(fake, text, speculative):
+    checker = CitationChecker('test-key', base_url=fake.url, speculative=speculative)
+    start = time.monotonic()
+    result = checker.check_citation(text)
+    checker.close()
+    return result, time.monotonic() - start
+
+
+def test_miss_costs_one_round_trip(fake):
+    serial, serial_time = _check(fake, '499 U.S. 999', speculative=False)
+    speculative, speculative_time = _check(fake, '499 U.S. 999', speculative=True)
+    assert speculative == serial
+    assert serial_time > 0.6
+    assert speculative_time < 0.5
+
+
+def test_valid_lookup_keeps_precedence(fake):
+    result, _ = _check(fake, '410 U.S. 113', speculative=True)
+    assert result['status'] == 'valid'
+    assert result['search_type'] == 'citation_lookup'
+
+
+def test_valid_search_beats_invalid_lookup(fake):
+    fake.script.append((LOOKUP, 200, None, []))
+    result, _ = _check(fake, '410 U.S. 113', speculative=True)
+    assert result['status'] == 'valid'
+    assert result['search_type'] == 'citation_parts'
+
+
+def test_lookup_error_uses_speculative_search(fake):
+    fake.script.append((LOOKUP, 403, None, None))
+    result, _ = _check(fake, '410 U.S. 113', speculative=True)
+    assert result['search_type'] == 'citation_parts'
+    assert fake.count(SEARCH) == 1
+
+
+def test_async_speculative_matches_serial(fake):
+    async def run(speculative):
+        async with AsyncCitationChecker('test-key', base_url=fake.url, speculative=speculative) as checker:
+            return await asyncio.gather(checker.check_citation('499 U.S. 999'), checker.check_citation('410 U.S. 113'))
+
+    start = time.monotonic()
+    speculative = asyncio.run(run(True))
+    assert time.monotonic() - start < 0.5
+    assert speculative == asyncio.run(run(False))
+
+
+def test_parallel_case_search_miss_costs_one_round_trip(fake):
+    checker = CitationChecker('test-key', base_url=fake.url, parallel_case_search=True)
+    start = time.monotonic()
+    result = checker.check_citation('Wade v. Nobody')
+    assert time.monotonic() - start < 0.5
+    # The fielded query finds nothing, so the broad match on "Wade" is used
+    assert result['cases'][0]['name'] == 'Roe v. Wade'
+    assert fake.count(SEARCH) == 2
+    checker.close()
+
+
+def test_parallel_case_search_prefers_fielded(fake):
+    fake.cases.append(dict(fake.cases[0], caseName='Wade v. Roe Holdings'))
+    serial = CitationChecker('test-key', base_url=fake.url).check_citation('Roe v. Wade')
+    parallel = CitationChecker('test-key', base_url=fake.url, parallel_case_search=True).check_citation('Roe v. Wade')
+    assert parallel == serial
+
+
+def test_async_parallel_case_search(fake):
+    async def run():
+        async with AsyncCitationChecker('test-key', base_url=fake.url, parallel_case_search=True) as checker:
+            return await checker.check_citation('Wade v. Nobody')
+
+    start = time.monotonic()
+    assert asyncio.run(run())['cases'][0]['name'] == 'Roe v. Wade'
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Offline tests for timeouts, retries and hedging, run against a deliberately slow fake server
+"""
+
+import asyncio
+import time
+
+from citecheck import CitationChecker
+from citecheck_async import AsyncCitationChecker
+from citecheck_transport import LatencyTracker, TransportPolicy
+
+LOOKUP = '/api/rest/v4/citation-lookup/'
+SEARCH = '/api/rest/v4/search/'
+
+
+def _checker(fake, **policies):
+    return CitationChecker('test-key', base_url=fake.url, transport_policies=policies)
+
+
+def test_read_timeout_bounds_stalled_lookup(fake):
+    fake.stalls.append((LOOKUP, 3))
+    checker = _checker(fake, citation_lookup=TransportPolicy(read_timeout=0.2))
+
+    start = time.monotonic()
+    result = checker._check_with_citation_api('410 U.S. 113')
+    assert time.monotonic() - start < 1.5
+    assert result['status'] == 'error'
+    assert 'timed out' in result['message']
+
+
+def test_stalled_search_is_retried(fake):
+    fake.stalls.append((SEARCH, 3))
+    checker = _checker(fake, enhanced_search=TransportPolicy(read_timeout=0.2, retries=1, backoff=0.01))
+
+    start = time.monotonic()
+    assert checker.check_citation('Roe v. Wade')['status'] == 'valid'
+    assert time.monotonic() - start < 1.5
+    assert fake.count(SEARCH) == 2
+
+
+def test_5xx_retried_with_backoff(fake):
+    fake.script += [(SEARCH, 503, None, None), (SEARCH, 502, None, None)]
+    checker = _checker(fake, enhanced_search=TransportPolicy(retries=2, backoff=0.01))
+    assert checker.check_citation('Roe v. Wade')['status'] == 'valid'
+    assert fake.count(SEARCH) == 3
+
+
+def test_retries_are_bounded(fake):
+    fake.script += [(SEARCH, 503, None, None)] * 3
+    checker = _checker(fake, enhanced_search=TransportPolicy(retries=1, backoff=0.01))
+    assert checker.check_citation('Roe v. Wade')['status'] == 'error'
+    assert fake.count(SEARCH) == 2
+
+
+def test_lookup_post_is_not_retried(fake):
+    fake.script.append((LOOKUP, 503, None, None))
+    checker = _checker(fake, citation_lookup=TransportPolicy(retries=3, backoff=0.01))
+    assert checker._check_with_citation_api('410 U.S. 113')['status'] == 'error'
+    assert fake.count(LOOKUP) == 1
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = TransportPolicy(backoff=1.0, max_backoff=2.0)
+    delays = [policy.backoff_delay(5) for _ in range(200)]
+    assert max(delays) <= 2.0
+    assert len(set(delays)) > 100
+
+
+def test_hedged_request_beats_stall(fake):
+    fake.stalls.append((SEARCH, 2))
+    checker = _checker(fake, enhanced_search=TransportPolicy(hedge=True, hedge_after=0.1))
+
+    start = time.monotonic()
+    assert checker.check_citation('Roe v. Wade')['status'] == 'valid'
+    assert time.monotonic() - start < 1.0
+    assert fake.count(SEARCH) == 2
+    checker.close()
+
+
+def test_hedge_waits_for_latency_samples():
+    policy = TransportPolicy(hedge=True, hedge_min_samples=5)
+    assert policy.hedge_delay('GET') is None
+    for seconds in (0.01, 0.02, 0.03, 0.04, 0.5):
+        policy.latency.record(seconds)
+    assert policy.hedge_delay('GET') == 0.5
+    assert policy.hedge_delay('POST') is None
+
+
+def test_checkers_keep_separate_latency_samples(fake):
+    first, second = _checker(fake), _checker(fake)
+    first.check_citation('Roe v. Wade')
+    assert len(first._transport_policy('enhanced_search').latency) > 0
+    assert len(second._transport_policy('enhanced_search').latency) == 0
+    assert second._transport_policy('unknown') is second._transport_policy('unknown')
+    first.close()
+    second.close()
+
+
+def test_latency_quantile():
+    tracker = LatencyTracker(window=100)
+    for ms in range(100):
+        tracker.record(ms / 1000)
+    assert tracker.quantile(0.95) == 0.095
+
+
+def test_async_timeout_retry_and_hedge(fake):
+    fake.stalls += [(SEARCH, 3), (LOOKUP, 3)]
+
+    async def run():
+        policies = {
+            'citation_lookup': TransportPolicy(read_timeout=0.2, retries=0),
+            'enhanced_search': TransportPolicy(hedge=True, hedge_after=0.1),
+        }
+        async with AsyncCitationChecker('test-key', base_url=fake.url, transport_policies=policies) as checker:
+            return await checker.check_many(['Roe v. Wade', '410 U.S. 113'])
+
+    start = time.monotonic()
+    hedged, timed_out = asyncio.run(run())
+    assert time.monotonic() - start < 1.5
+    assert hedged['status'] == 'valid'
+    # The lookup timed out, so the chain fell back to the citation-parts search
+    assert timed_out['search_type'] == 'citation_parts'